@@ -0,0 +1,45 @@
+"""
+Consulta do registo de auditoria (linha de comandos): quem alterou um aluno ou um grupo,
+quando, com que operação e o que mudou.
+
+Cada entrada é escrita como uma linha JSON, por ordem cronológica; com --limit são escritas
+apenas as mais recentes.
+
+Exemplos:
+    python audit.py --student 2021001
+    python audit.py --group 3f2b... --limit 20
+    python audit.py --student 2021001 --course redes-2025-26 > aluno.jsonl
+"""
+import argparse
+import json
+import sys
+from controllers.course_controller import CourseController
+from models.audit_log import AuditLog
+from models.data_manager import DATA_FILE
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da consulta da auditoria por linha de comandos."""
+    parser = argparse.ArgumentParser(description="Escreve as alterações que envolveram um aluno e/ou um grupo, uma por linha (JSON).")
+    parser.add_argument("--student", default=None, help="Número do aluno.")
+    parser.add_argument("--group", default=None, help="ID do grupo.")
+    parser.add_argument("--limit", type=int, default=None, help="Número máximo de alterações (as mais recentes).")
+    parser.add_argument("--data-file", default=None, help="Ficheiro de dados (predefinição: data.json).")
+    parser.add_argument("--course", default=None, help="Identificador do curso (em vez de --data-file).")
+    args = parser.parse_args(argv)
+
+    try:
+        data_file = CourseController().data_file(args.course) if args.course else (args.data_file or DATA_FILE)
+        # Só lê o registo: não é preciso carregar os dados
+        entries = AuditLog(data_file + ".audit").query(args.student, args.group, args.limit)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    for entry in entries:
+        sys.stdout.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
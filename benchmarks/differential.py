@@ -0,0 +1,927 @@
+"""
+Teste diferencial aleatório do MainController.
+
+Aplica uma longa sequência aleatória de operações (criar, editar e remover alunos e grupos,
+adicionar, remover e transferir membros, listas de espera, pesquisas e consultas paginadas)
+ao MainController, com os seus índices, caches e diário, e a uma implementação de referência
+que percorre todos os registos a cada operação, como o controlador original. Compara os
+resultados, os erros (tipo e mensagem) e, periodicamente, o estado completo dos dados.
+No fim, o controlador é reaberto a partir do ficheiro (cache de arranque e diário) e a
+comparação é repetida.
+
+Mede também o tempo de cada lado, por tipo de operação. As alterações do lado otimizado
+incluem a gravação em disco; as da referência são só em memória.
+
+Com a mesma semente, a sequência de operações é a mesma: uma diferença encontrada no
+passo N pode ser reproduzida com --seed S --operations N.
+
+Exemplo:
+    python benchmarks/differential.py --operations 20000 --students 5000 --groups 80 --seed 7
+"""
+import argparse
+import itertools
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.main_controller import MainController
+from models.fuzzy_index import normalize_text, tokenize, trigrams
+from models.group import Group
+from models.query import Page
+from models.query_planner import parse_filter_date
+from models.sort_index import collation_key, number_key
+from models.statistics import FILL_RATE_BUCKETS, email_domain, fill_bucket
+from models.student import Student
+from models.timestamps import format_date
+from models.validation import check_student_contact, check_student_name, check_student_number
+
+FIRST_NAMES = ["Ana", "João", "Inês", "Álvaro", "Alvaro", "Marta", "Tiago", "Zé", "Conceição", "Rui", "Sofia", "Bruno"]
+LAST_NAMES = ["Silva", "Sousa", "Gonçalves", "Pereira", "Costa", "Fernandes", "Araújo", "Lopes", "Brandão"]
+
+# Pesos de cada operação na sequência aleatória
+OPERATION_WEIGHTS: Dict[str, int] = {
+    "create_student": 10,
+    "update_student": 5,
+    "delete_student": 3,
+    "create_group": 3,
+    "update_group": 3,
+    "delete_group": 1,
+    "add_student_to_group": 12,
+    "remove_student_from_group": 6,
+    "transfer_student": 8,
+    "join_waitlist": 4,
+    "leave_waitlist": 2,
+    "search_students": 5,
+    "search_students_fuzzy": 3,
+    "search_groups": 2,
+    "query_students": 6,
+    "query_groups": 3,
+    "get_sorted_students": 1,
+    "get_students_without_group": 1,
+    "statistics": 1,
+}
+
+# Entrada de uma lista de espera da referência: (-prioridade, ordem do pedido, número do aluno)
+RefWaitEntry = Tuple[int, int, str]
+# Página de uma consulta, comparável entre os dois lados: (ids, total, há mais)
+PageSummary = Tuple[List[str], int, bool]
+
+
+class Mismatch(Exception):
+    """Lançada quando os dois lados divergem."""
+
+
+def _capacities(max_capacity: str, min_capacity: str, current_size: int = 0) -> Tuple[int, int]:
+    """Valida as capacidades de um grupo, com as mesmas regras e mensagens do controlador."""
+    try:
+        max_cap = int(max_capacity)
+        if max_cap <= 0:
+            raise ValueError("Capacidade máxima deve ser maior que zero.")
+        min_cap = int(min_capacity)
+        if min_cap <= 0:
+            raise ValueError("Capacidade mínima deve ser maior que zero.")
+        if min_cap > max_cap:
+            raise ValueError("Capacidade mínima não pode ser maior que a máxima.")
+        if max_cap < current_size:
+            raise ValueError(f"Capacidade máxima não pode ser menor que o número atual de membros ({current_size}).")
+    except ValueError as e:
+        if "Capacidade" in str(e):
+            raise e
+        raise ValueError("Capacidades devem ser números inteiros.")
+    return max_cap, min_cap
+
+
+class ReferenceController:
+    """
+    Implementação de referência das regras do MainController, sem estruturas derivadas:
+    cada validação de unicidade, pesquisa, filtro e ordenação percorre todos os registos.
+
+    Os IDs dos grupos e as datas de criação são os atribuídos pelo controlador otimizado
+    (passados pelo teste), para que os resultados sejam comparáveis.
+
+    Atributos:
+        students (Dict[str, Student]): Alunos por número.
+        groups (Dict[str, Group]): Grupos por ID.
+        waitlists (Dict[str, List[RefWaitEntry]]): Listas de espera por grupo (sem ordem; a próxima
+            entrada é a menor).
+    """
+    def __init__(self) -> None:
+        self.students: Dict[str, Student] = {}
+        self.groups: Dict[str, Group] = {}
+        self.waitlists: Dict[str, List[RefWaitEntry]] = {}
+        self._requests = itertools.count()
+
+    # --- Alunos ---
+    def create_student(self, student_number: str, name: str, email: str, creation_date: Optional[str] = None,
+                       created_at: Optional[int] = None) -> Student:
+        check_student_number(student_number)
+        if student_number in self.students:
+            raise ValueError("Número de estudante já registado.")
+        check_student_contact(name, email)
+        for s in self.students.values():
+            if s.email.lower() == email.lower():
+                raise ValueError("Email já registado no sistema.")
+        check_student_name(name)
+        student = Student(student_number, name, email, creation_date)
+        if created_at is not None:
+            student.created_at = created_at
+        self.students[student_number] = student
+        return student
+
+    def update_student(self, student_number: str, name: str, email: str) -> Student:
+        if student_number not in self.students:
+            raise ValueError("Aluno não encontrado.")
+        check_student_contact(name, email)
+        for s in self.students.values():
+            if s.email.lower() == email.lower() and s.student_number != student_number:
+                raise ValueError("Email já registado no sistema.")
+        check_student_name(name)
+        student = self.students[student_number]
+        student.name = name
+        student.email = email
+        return student
+
+    def delete_student(self, student_number: str) -> None:
+        if student_number not in self.students:
+            raise ValueError("Aluno não encontrado.")
+        student = self.students[student_number]
+        group = self.groups.get(student.group_id) if student.group_id else None
+        if group and student_number in group.student_ids:
+            group.student_ids.remove(student_number)
+        for waitlist in self.waitlists.values():
+            waitlist[:] = [entry for entry in waitlist if entry[2] != student_number]
+        del self.students[student_number]
+        self._promote_waiting([student.group_id])
+
+    # --- Grupos ---
+    def create_group(self, name: str, max_capacity: str, min_capacity: str, group_id: str, created_at: int) -> Group:
+        if not re.match(r'^[a-zA-Z0-9 ]+$', name):
+            raise ValueError("O nome do grupo deve conter apenas caracteres alfanuméricos e espaços.")
+        for g in self.groups.values():
+            if g.name.lower() == name.lower():
+                raise ValueError("Nome de grupo já existe.")
+        max_cap, min_cap = _capacities(max_capacity, min_capacity)
+        group = Group(group_id, name, max_cap, min_cap)
+        group.created_at = created_at
+        self.groups[group_id] = group
+        return group
+
+    def update_group(self, group_id: str, name: str, max_capacity: str, min_capacity: str) -> Group:
+        if group_id not in self.groups:
+            raise ValueError("Grupo não encontrado.")
+        group = self.groups[group_id]
+        if not re.match(r'^[a-zA-Z0-9 ]+$', name):
+            raise ValueError("O nome do grupo deve conter apenas caracteres alfanuméricos e espaços.")
+        for g in self.groups.values():
+            if g.name.lower() == name.lower() and g.group_id != group_id:
+                raise ValueError("Nome de grupo já existe.")
+        group.max_capacity, group.min_capacity = _capacities(max_capacity, min_capacity, len(group.student_ids))
+        group.name = name
+        self._promote_waiting([group_id])
+        return group
+
+    def delete_group(self, group_id: str) -> None:
+        if group_id not in self.groups:
+            raise ValueError("Grupo não encontrado.")
+        for s in self.students.values():
+            if s.group_id == group_id:
+                s.group_id = None
+        del self.groups[group_id]
+        self.waitlists.pop(group_id, None)
+
+    # --- Membros ---
+    def add_student_to_group(self, student_number: str, group_id: str) -> None:
+        student = self.students.get(student_number)
+        group = self.groups.get(group_id)
+        if not student:
+            raise ValueError("Aluno não encontrado.")
+        if not group:
+            raise ValueError("Grupo não encontrado.")
+        if student.group_id:
+            raise ValueError(f"Aluno já pertence ao grupo {student.group_id}.")
+        if len(group.student_ids) >= group.max_capacity:
+            raise ValueError("Grupo cheio.")
+        group.student_ids.append(student_number)
+        student.group_id = group_id
+        self._leave(group_id, student_number)
+
+    def remove_student_from_group(self, student_number: str, group_id: str) -> None:
+        student = self.students.get(student_number)
+        group = self.groups.get(group_id)
+        if not student or not group:
+            raise ValueError("Aluno ou Grupo não encontrado.")
+        if student_number not in group.student_ids:
+            raise ValueError("Aluno não pertence a este grupo.")
+        size = len(group.student_ids)
+        if size - 1 < group.min_capacity and size > 0:
+            raise ValueError(f"Não é permitido remover aluno. O grupo ficaria com menos de {group.min_capacity} elementos.")
+        group.student_ids.remove(student_number)
+        student.group_id = None
+        self._promote_waiting([group_id])
+
+    def transfer_student(self, student_number: str, new_group_id: str) -> None:
+        student = self.students.get(student_number)
+        new_group = self.groups.get(new_group_id)
+        if not student:
+            raise ValueError("Aluno não encontrado.")
+        if not new_group:
+            raise ValueError("Grupo de destino não encontrado.")
+        if student.group_id == new_group_id:
+            raise ValueError("O aluno já pertence a este grupo.")
+        if len(new_group.student_ids) >= new_group.max_capacity:
+            raise ValueError("Grupo de destino cheio.")
+        old_group_id = student.group_id
+        current = self.groups.get(old_group_id) if old_group_id else None
+        if current is not None:
+            if len(current.student_ids) - 1 < current.min_capacity:
+                raise ValueError(f"Não é possível remover do grupo atual ({current.name}). Ficaria com menos de {current.min_capacity} elementos.")
+            current.student_ids.remove(student_number)
+        new_group.student_ids.append(student_number)
+        self._leave(new_group_id, student_number)
+        student.group_id = new_group_id
+        self._promote_waiting([old_group_id])
+
+    # --- Listas de espera ---
+    def _waiting_group(self, student_number: str) -> Optional[str]:
+        for group_id, waitlist in self.waitlists.items():
+            if any(entry[2] == student_number for entry in waitlist):
+                return group_id
+        return None
+
+    def _leave(self, group_id: str, student_number: str) -> None:
+        waitlist = self.waitlists.get(group_id)
+        if waitlist:
+            waitlist[:] = [entry for entry in waitlist if entry[2] != student_number]
+
+    def join_waitlist(self, student_number: str, group_id: str, priority: str = "0") -> None:
+        student = self.students.get(student_number)
+        group = self.groups.get(group_id)
+        if not student:
+            raise ValueError("Aluno não encontrado.")
+        if not group:
+            raise ValueError("Grupo não encontrado.")
+        if student.group_id == group_id:
+            raise ValueError("O aluno já pertence a este grupo.")
+        if len(group.student_ids) < group.max_capacity:
+            raise ValueError("O grupo tem vagas; adicione o aluno diretamente.")
+        waiting = self._waiting_group(student_number)
+        if waiting:
+            raise ValueError(f"O aluno já está na lista de espera do grupo {self.groups[waiting].name}.")
+        try:
+            priority_value = int(priority)
+        except (TypeError, ValueError):
+            raise ValueError("Prioridade deve ser um número inteiro.")
+        self.waitlists.setdefault(group_id, []).append((-priority_value, next(self._requests), student_number))
+
+    def leave_waitlist(self, student_number: str) -> None:
+        group_id = self._waiting_group(student_number)
+        if group_id is None:
+            raise ValueError("O aluno não está em nenhuma lista de espera.")
+        self._leave(group_id, student_number)
+
+    def get_waitlist(self, group_id: str) -> List[str]:
+        return [entry[2] for entry in sorted(self.waitlists.get(group_id, []))]
+
+    def _promote_waiting(self, group_ids: List[Optional[str]]) -> None:
+        pending = deque(g for g in group_ids if g)
+        while pending:
+            group = self.groups.get(pending.popleft())
+            if group is None:
+                continue
+            waitlist = self.waitlists.get(group.group_id, [])
+            deferred = []
+            while len(group.student_ids) < group.max_capacity and waitlist:
+                entry = min(waitlist)
+                waitlist.remove(entry)
+                student = self.students.get(entry[2])
+                if student is None or student.group_id == group.group_id:
+                    continue
+                old = self.groups.get(student.group_id) if student.group_id else None
+                if old is not None and len(old.student_ids) - 1 < old.min_capacity:
+                    deferred.append(entry)
+                    continue
+                if old is not None:
+                    old.student_ids.remove(student.student_number)
+                    pending.append(old.group_id)
+                group.student_ids.append(student.student_number)
+                student.group_id = group.group_id
+            waitlist.extend(deferred)
+
+    # --- Pesquisas e consultas ---
+    def _student_matches(self, student: Student, query: str) -> bool:
+        return (query in normalize_text(student.name) or query in str(student.student_number)
+                or query in normalize_text(student.email))
+
+    def search_students(self, query: str) -> List[str]:
+        normalized = normalize_text(query)
+        return [s.student_number for s in self.students.values() if self._student_matches(s, normalized)]
+
+    def search_groups(self, query: str) -> List[str]:
+        normalized = normalize_text(query)
+        return [g.group_id for g in self.groups.values() if normalized in normalize_text(g.name)]
+
+    def search_students_fuzzy(self, query: str, limit: int = 50, threshold: float = 0.45) -> List[Tuple[str, float]]:
+        """Pesquisa aproximada comparando a consulta com todas as palavras de todos os alunos."""
+        words = tokenize(query)
+        if not words:
+            return []
+        ranked = []
+        for number, student in self.students.items():
+            tokens = dict.fromkeys(tokenize(student.name) + tokenize(student.email.split("@", 1)[0]) + [number])
+            total = 0.0
+            for word in words:
+                grams = trigrams(word)
+                best = 0.0
+                for token in tokens:
+                    token_grams = trigrams(token)
+                    score = 2.0 * len(grams & token_grams) / (len(grams) + len(token_grams))
+                    if score >= threshold and score > best:
+                        best = score
+                total += best
+            if total and total / len(words) >= threshold:
+                ranked.append((number, total / len(words)))
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def students_without_group(self) -> List[str]:
+        return [s.student_number for s in self.students.values() if not s.group_id]
+
+    def _student_key(self, column: str) -> Callable[[Student], Any]:
+        groups = self.groups
+        keys: Dict[str, Callable[[Student], Any]] = {
+            "number": lambda s: number_key(s.student_number),
+            "name": lambda s: collation_key(s.name),
+            "email": lambda s: s.email.casefold(),
+            "group": lambda s: collation_key(groups[s.group_id].name) if s.group_id in groups else ("", ""),
+            "creationDate": lambda s: s.created_at,
+        }
+        if column not in keys:
+            raise ValueError(f"Coluna de ordenação desconhecida: {column}.")
+        return keys[column]
+
+    def _group_key(self, column: str) -> Callable[[Group], Any]:
+        keys: Dict[str, Callable[[Group], Any]] = {
+            "name": lambda g: collation_key(g.name),
+            "capacity": lambda g: g.max_capacity,
+            "count": lambda g: len(g.student_ids),
+        }
+        if column not in keys:
+            raise ValueError(f"Coluna de ordenação desconhecida: {column}.")
+        return keys[column]
+
+    def sorted_students(self, column: str, descending: bool = False) -> List[str]:
+        key = self._student_key(column)
+        rows = sorted(self.students.values(), key=lambda s: (key(s), s.student_number), reverse=descending)
+        return [s.student_number for s in rows]
+
+    @staticmethod
+    def _date_range(date_from: Optional[int], date_to: Optional[int]) -> Tuple[int, int]:
+        low = date_from if date_from is not None else -2 ** 63
+        high = date_to if date_to is not None else 2 ** 63
+        if low > high:
+            raise ValueError("A data inicial é posterior à data final.")
+        return low, high
+
+    @staticmethod
+    def _page(rows: List[Any], row_id: Callable[[Any], str], key: Callable[[Any], Any], descending: bool,
+              offset: int, limit: Optional[int]) -> PageSummary:
+        if offset < 0:
+            raise ValueError("O offset não pode ser negativo.")
+        if limit is not None and limit <= 0:
+            raise ValueError("O limite deve ser maior que zero.")
+        ordered = sorted(rows, key=lambda r: (key(r), row_id(r)), reverse=descending)
+        end = offset + limit if limit is not None else None
+        return [row_id(r) for r in ordered[offset:end]], len(rows), end is not None and len(ordered) > end
+
+    def query_students(self, filters: Dict[str, Any], sort: str = "number", descending: bool = False,
+                       offset: int = 0, limit: Optional[int] = None) -> PageSummary:
+        tests: List[Callable[[Student], bool]] = []
+        date_from = date_to = None
+        for name, value in filters.items():
+            if value is None or value == "":
+                continue
+            if name == "text":
+                query = normalize_text(str(value).strip())
+                if query:
+                    tests.append(lambda s, q=query: self._student_matches(s, q))
+            elif name == "group_id":
+                tests.append(lambda s, g=value: s.group_id == g)
+            elif name == "without_group":
+                tests.append((lambda s: not s.group_id) if value else (lambda s: bool(s.group_id)))
+            elif name == "domain":
+                domain = str(value).strip().lower().lstrip("@")
+                tests.append(lambda s, d=domain: email_domain(s.email) == d)
+            elif name == "created_from":
+                date_from = parse_filter_date(value)
+            elif name == "created_to":
+                date_to = parse_filter_date(value, end_of_day=True)
+            else:
+                raise ValueError(f"Filtro desconhecido: {name}.")
+        if date_from is not None or date_to is not None:
+            low, high = self._date_range(date_from, date_to)
+            tests.append(lambda s: low <= s.created_at <= high)
+        key = self._student_key(sort)
+        rows = [s for s in self.students.values() if all(test(s) for test in tests)]
+        return self._page(rows, lambda s: s.student_number, key, descending, offset, limit)
+
+    def query_groups(self, filters: Dict[str, Any], sort: str = "name", descending: bool = False,
+                     offset: int = 0, limit: Optional[int] = None) -> PageSummary:
+        tests: List[Callable[[Group], bool]] = []
+        date_from = date_to = None
+        min_members, max_members = 0, None
+        for name, value in filters.items():
+            if value is None or value == "":
+                continue
+            if name == "text":
+                query = normalize_text(str(value).strip())
+                if query:
+                    tests.append(lambda g, q=query: q in normalize_text(g.name))
+            elif name in ("has_vacancy", "full"):
+                full = (name == "full") == bool(value)
+                tests.append(lambda g, f=full: (len(g.student_ids) >= g.max_capacity) == f)
+            elif name == "under_min":
+                tests.append(lambda g, u=bool(value): (len(g.student_ids) < g.min_capacity) == u)
+            elif name in ("min_members", "max_members"):
+                try:
+                    count = int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"O filtro {name} deve ser um número inteiro.")
+                if name == "min_members":
+                    min_members = count
+                else:
+                    max_members = count
+            elif name == "created_from":
+                date_from = parse_filter_date(value)
+            elif name == "created_to":
+                date_to = parse_filter_date(value, end_of_day=True)
+            else:
+                raise ValueError(f"Filtro desconhecido: {name}.")
+        if min_members > 0 or max_members is not None:
+            high_members = max_members if max_members is not None else float('inf')
+            tests.append(lambda g: min_members <= len(g.student_ids) <= high_members)
+        if date_from is not None or date_to is not None:
+            low, high = self._date_range(date_from, date_to)
+            tests.append(lambda g: low <= g.created_at <= high)
+        key = self._group_key(sort)
+        rows = [g for g in self.groups.values() if all(test(g) for test in tests)]
+        return self._page(rows, lambda g: g.group_id, key, descending, offset, limit)
+
+    def statistics(self) -> Dict[str, Any]:
+        """Mesmo formato de RosterStatistics.summary, contado a partir de todos os registos."""
+        sizes = Counter(len(g.student_ids) for g in self.groups.values())
+        histogram = [0] * (FILL_RATE_BUCKETS + 1)
+        for g in self.groups.values():
+            histogram[fill_bucket(len(g.student_ids), g.max_capacity)] += 1
+        return {
+            "students": len(self.students),
+            "groups": len(self.groups),
+            "unassigned": sum(1 for s in self.students.values() if not s.group_id),
+            "full_groups": sum(1 for g in self.groups.values() if len(g.student_ids) >= g.max_capacity),
+            "under_min_groups": sum(1 for g in self.groups.values() if len(g.student_ids) < g.min_capacity),
+            "fill_histogram": histogram,
+            "size_distribution": dict(sizes),
+            "domains": dict(Counter(email_domain(s.email) for s in self.students.values())),
+        }
+
+
+def describe(value: Any) -> Any:
+    """Resumo comparável de um resultado (os dois lados usam objetos diferentes)."""
+    if isinstance(value, Student):
+        return ("aluno", value.student_number, value.name, value.email, value.group_id)
+    if isinstance(value, Group):
+        return ("grupo", value.group_id, value.name, value.max_capacity, value.min_capacity, tuple(value.student_ids))
+    if isinstance(value, Page):
+        ids = [item.student_number if isinstance(item, Student) else item.group_id for item in value.items]
+        return ids, value.total, value.has_more
+    return value
+
+
+def attempt(call: Callable[[], Any]) -> Tuple[Any, Any]:
+    """Executa uma chamada; devolve (valor ou None, resultado comparável ou erro)."""
+    try:
+        value = call()
+        return value, ("ok", describe(value))
+    except Exception as e:
+        return None, ("erro", type(e).__name__, str(e))
+
+
+class DifferentialRun:
+    """
+    Uma sequência aleatória de operações aplicada aos dois lados.
+
+    Atributos:
+        optimized (MainController): Controlador com estruturas derivadas, gravado em disco.
+        reference (ReferenceController): Implementação de referência.
+        step (int): Número da operação em curso.
+        timings (Dict[str, List[float]]): Por operação: [chamadas, segundos otimizado, segundos referência].
+    """
+    def __init__(self, data_file: str, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.optimized: MainController = MainController(data_file)
+        self.reference: ReferenceController = ReferenceController()
+        self.step: int = 0
+        self.timings: Dict[str, List[float]] = {}
+        self.number_pool: List[str] = []
+
+    # --- Execução e comparação ---
+    def compare(self, operation: str, args: tuple, optimized: Callable[[], Any],
+                reference: Callable[[Any], Any]) -> Any:
+        """
+        Executa a operação nos dois lados e compara os resultados (ou os erros).
+        A referência recebe o valor devolvido pelo lado otimizado (ex.: o grupo criado, de onde
+        vêm o ID e a data de criação).
+
+        Retorna:
+            Any: O valor devolvido pelo lado otimizado (None se lançou uma exceção).
+
+        Lança:
+            Mismatch: Se os resultados forem diferentes.
+        """
+        start = time.perf_counter()
+        value, optimized_result = attempt(optimized)
+        middle = time.perf_counter()
+        _, reference_result = attempt(lambda: reference(value))
+        end = time.perf_counter()
+        timing = self.timings.setdefault(operation, [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += middle - start
+        timing[2] += end - middle
+        if optimized_result != reference_result:
+            raise Mismatch(f"passo {self.step}: {operation}{args!r}\n"
+                           f"  otimizado:  {optimized_result!r}\n  referência: {reference_result!r}")
+        return value
+
+    def check(self, what: str, optimized: Any, reference: Any) -> None:
+        """Compara um valor calculado pelos dois lados fora de uma operação (ex.: estado completo)."""
+        if optimized != reference:
+            raise Mismatch(f"passo {self.step}: {what} difere\n  otimizado:  {optimized!r}\n  referência: {reference!r}")
+
+    # --- Geração de argumentos ---
+    def pick_number(self) -> str:
+        """Número de um aluno (às vezes de um aluno que não existe)."""
+        return self.rng.choice(self.number_pool)
+
+    def pick_group(self) -> str:
+        """ID de um grupo (às vezes de um grupo que não existe)."""
+        groups = self.reference.groups
+        if not groups or self.rng.random() < 0.05:
+            return str(uuid.UUID(int=self.rng.getrandbits(128)))
+        return self.rng.choice(list(groups))
+
+    def valid_name(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def pick_name(self) -> str:
+        """Nome de um aluno (por vezes curto demais ou com dígitos)."""
+        roll = self.rng.random()
+        if roll < 0.03:
+            return "Jo"
+        if roll < 0.06:
+            return f"Ana {self.rng.randint(1, 9)}"
+        return self.valid_name()
+
+    def pick_email(self, student_number: str) -> str:
+        roll = self.rng.random()
+        students = self.reference.students
+        if roll < 0.05 and students:
+            # Email de outro aluno, com outras maiúsculas
+            return students[self.rng.choice(list(students))].email.upper()
+        if roll < 0.08:
+            return f"a{student_number}@gmail.com"
+        domain = "istec.pt" if roll < 0.2 else "my.istec.pt"
+        return f"a{student_number}.{self.rng.randint(0, 3)}@{domain}"
+
+    def pick_group_name(self) -> str:
+        roll = self.rng.random()
+        if roll < 0.04:
+            return "Grupo-Inválido"
+        groups = self.reference.groups
+        if roll < 0.1 and groups:
+            return groups[self.rng.choice(list(groups))].name.lower()
+        return f"Grupo {self.rng.choice(['Alfa', 'Beta', 'Gama', 'Delta', 'Sigma'])} {self.rng.randint(1, 400)}"
+
+    def pick_capacities(self) -> Tuple[str, str]:
+        roll = self.rng.random()
+        if roll < 0.03:
+            return "x", "2"
+        if roll < 0.06:
+            return "0", "1"
+        if roll < 0.1:
+            return "2", "5"
+        return str(self.rng.randint(2, 8)), str(self.rng.randint(1, 3))
+
+    def pick_text(self) -> str:
+        """Texto de pesquisa: parte de um nome, email ou número, com ou sem acentos e maiúsculas."""
+        students = self.reference.students
+        roll = self.rng.random()
+        if roll < 0.05 or not students:
+            return ""
+        student = students[self.rng.choice(list(students))]
+        source = self.rng.choice([student.name, student.email, student.student_number])
+        start = self.rng.randrange(len(source))
+        text = source[start:start + self.rng.randint(2, 5)]
+        if roll < 0.3:
+            text = text.upper()
+        elif roll < 0.4:
+            text = normalize_text(text)
+        return text
+
+    def pick_dates(self) -> Dict[str, str]:
+        """Intervalo de datas de criação (por vezes aberto, invertido ou inválido)."""
+        roll = self.rng.random()
+        if roll < 0.03:
+            return {"created_from": "31/02/2025"}
+        day = 24 * 3600
+        base = int(time.time()) - self.rng.randint(0, 700) * day
+        dates = {"created_from": format_date(base), "created_to": format_date(base + self.rng.randint(-30, 400) * day)}
+        if roll < 0.3:
+            dates.pop(self.rng.choice(list(dates)))
+        return dates
+
+    # --- Operações ---
+    def op_create_student(self) -> None:
+        number = self.pick_number() if self.rng.random() < 0.9 else f"x{self.rng.randint(1, 99)}"
+        name, email = self.pick_name(), self.pick_email(number)
+        self.compare("create_student", (number, name, email),
+                     lambda: self.optimized.create_student(number, name, email),
+                     lambda created: self.reference.create_student(number, name, email,
+                                                                   created_at=created.created_at if created else None))
+
+    def op_update_student(self) -> None:
+        number = self.pick_number()
+        name, email = self.pick_name(), self.pick_email(number)
+        self.compare("update_student", (number, name, email),
+                     lambda: self.optimized.update_student(number, name, email),
+                     lambda _: self.reference.update_student(number, name, email))
+
+    def op_delete_student(self) -> None:
+        number = self.pick_number()
+        self.compare("delete_student", (number,), lambda: self.optimized.delete_student(number),
+                     lambda _: self.reference.delete_student(number))
+
+    def op_create_group(self) -> None:
+        name = self.pick_group_name()
+        max_capacity, min_capacity = self.pick_capacities()
+        self.compare("create_group", (name, max_capacity, min_capacity),
+                     lambda: self.optimized.create_group(name, max_capacity, min_capacity),
+                     lambda created: self.reference.create_group(
+                         name, max_capacity, min_capacity,
+                         created.group_id if created else str(uuid.uuid4()), created.created_at if created else 0))
+
+    def op_update_group(self) -> None:
+        group_id = self.pick_group()
+        group = self.reference.groups.get(group_id)
+        name = group.name if group is not None and self.rng.random() < 0.5 else self.pick_group_name()
+        max_capacity, min_capacity = self.pick_capacities()
+        self.compare("update_group", (group_id, name, max_capacity, min_capacity),
+                     lambda: self.optimized.update_group(group_id, name, max_capacity, min_capacity),
+                     lambda _: self.reference.update_group(group_id, name, max_capacity, min_capacity))
+
+    def op_delete_group(self) -> None:
+        group_id = self.pick_group()
+        self.compare("delete_group", (group_id,), lambda: self.optimized.delete_group(group_id),
+                     lambda _: self.reference.delete_group(group_id))
+
+    def op_add_student_to_group(self) -> None:
+        number, group_id = self.pick_number(), self.pick_group()
+        self.compare("add_student_to_group", (number, group_id),
+                     lambda: self.optimized.add_student_to_group(number, group_id),
+                     lambda _: self.reference.add_student_to_group(number, group_id))
+
+    def op_remove_student_from_group(self) -> None:
+        number = self.pick_number()
+        student = self.reference.students.get(number)
+        group_id = student.group_id if student is not None and student.group_id and self.rng.random() < 0.8 else self.pick_group()
+        self.compare("remove_student_from_group", (number, group_id),
+                     lambda: self.optimized.remove_student_from_group(number, group_id),
+                     lambda _: self.reference.remove_student_from_group(number, group_id))
+
+    def op_transfer_student(self) -> None:
+        number, group_id = self.pick_number(), self.pick_group()
+        self.compare("transfer_student", (number, group_id),
+                     lambda: self.optimized.transfer_student(number, group_id),
+                     lambda _: self.reference.transfer_student(number, group_id))
+
+    def op_join_waitlist(self) -> None:
+        number = self.pick_number()
+        full = [g.group_id for g in self.reference.groups.values() if len(g.student_ids) >= g.max_capacity]
+        group_id = self.rng.choice(full) if full and self.rng.random() < 0.8 else self.pick_group()
+        priority = str(self.rng.randint(-1, 3)) if self.rng.random() < 0.95 else "alta"
+        self.compare("join_waitlist", (number, group_id, priority),
+                     lambda: self.optimized.join_waitlist(number, group_id, priority),
+                     lambda _: self.reference.join_waitlist(number, group_id, priority))
+
+    def op_leave_waitlist(self) -> None:
+        number = self.pick_number()
+        self.compare("leave_waitlist", (number,), lambda: self.optimized.leave_waitlist(number),
+                     lambda _: self.reference.leave_waitlist(number))
+
+    def op_search_students(self) -> None:
+        text = self.pick_text()
+        self.compare("search_students", (text,),
+                     lambda: [s.student_number for s in self.optimized.search_students(text)],
+                     lambda _: self.reference.search_students(text))
+
+    def op_search_students_fuzzy(self) -> None:
+        students = self.reference.students
+        if not students:
+            return
+        word = students[self.rng.choice(list(students))].name
+        # Uma letra trocada
+        position = self.rng.randrange(len(word))
+        text = word[:position] + self.rng.choice("aeiourst") + word[position + 1:]
+        limit = self.rng.randint(1, 50)
+        self.compare("search_students_fuzzy", (text, limit),
+                     lambda: [s.student_number for s in self.optimized.search_students_fuzzy(text, limit)],
+                     lambda _: [number for number, _ in self.reference.search_students_fuzzy(text, limit)])
+
+    def op_search_groups(self) -> None:
+        text = self.rng.choice(["", "grupo", "ALFA", "a 1", "sigma 3", "ét"])
+        self.compare("search_groups", (text,),
+                     lambda: [g.group_id for g in self.optimized.search_groups(text)],
+                     lambda _: self.reference.search_groups(text))
+
+    def pick_paging(self, columns: List[str]) -> Tuple[str, bool, int, Optional[int]]:
+        """Coluna, sentido, offset e limite de uma consulta (por vezes inválidos)."""
+        sort = self.rng.choice(columns) if self.rng.random() < 0.97 else "idade"
+        offset = self.rng.choice([0, 0, 0, 3, 20]) if self.rng.random() < 0.98 else -1
+        limit = self.rng.choice([None, 1, 5, 25, 100]) if self.rng.random() < 0.98 else 0
+        return sort, self.rng.random() < 0.5, offset, limit
+
+    def compare_pages(self, operation: str, filters: Dict[str, Any], paging: Tuple[str, bool, int, Optional[int]],
+                      optimized_query: Callable[..., Page], reference_query: Callable[..., PageSummary]) -> None:
+        """Compara a primeira página e, seguindo os cursores do lado otimizado, até duas páginas seguintes."""
+        sort, descending, offset, limit = paging
+        page = self.compare(operation, (filters, sort, descending, offset, limit),
+                            lambda: optimized_query(filters, sort, descending, offset, limit),
+                            lambda _: reference_query(filters, sort, descending, offset, limit))
+        for _ in range(2):
+            if page is None or page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+            offset += limit
+            page = self.compare(operation + " (cursor)", (filters, sort, descending, offset, limit),
+                                lambda: optimized_query(filters, sort, descending, 0, limit, cursor),
+                                lambda _: reference_query(filters, sort, descending, offset, limit))
+
+    def op_query_students(self) -> None:
+        filters: Dict[str, Any] = {}
+        roll = self.rng.random()
+        if roll < 0.5:
+            filters["text"] = self.pick_text()
+        if self.rng.random() < 0.3:
+            filters["without_group"] = self.rng.random() < 0.5
+        if self.rng.random() < 0.2:
+            filters["group_id"] = self.pick_group()
+        if self.rng.random() < 0.3:
+            filters["domain"] = self.rng.choice(["my.istec.pt", "@ISTEC.pt", "gmail.com"])
+        if self.rng.random() < 0.3:
+            filters.update(self.pick_dates())
+        if self.rng.random() < 0.01:
+            filters["idade"] = 20
+        paging = self.pick_paging(["number", "name", "email", "group", "creationDate"])
+        self.compare_pages("query_students", filters, paging, self.optimized.query_students, self.reference.query_students)
+
+    def op_query_groups(self) -> None:
+        filters: Dict[str, Any] = {}
+        if self.rng.random() < 0.3:
+            filters["text"] = self.rng.choice(["grupo", "ALFA", "a 1", "delta"])
+        if self.rng.random() < 0.3:
+            filters[self.rng.choice(["has_vacancy", "full"])] = self.rng.random() < 0.5
+        if self.rng.random() < 0.3:
+            filters["under_min"] = self.rng.random() < 0.5
+        if self.rng.random() < 0.3:
+            filters["min_members"] = self.rng.choice([0, 1, 2, "dois"])
+        if self.rng.random() < 0.3:
+            filters["max_members"] = self.rng.randint(0, 6)
+        if self.rng.random() < 0.2:
+            filters.update(self.pick_dates())
+        paging = self.pick_paging(["name", "capacity", "count"])
+        self.compare_pages("query_groups", filters, paging, self.optimized.query_groups, self.reference.query_groups)
+
+    def op_get_sorted_students(self) -> None:
+        column = self.rng.choice(["number", "name", "email", "group", "creationDate"])
+        descending = self.rng.random() < 0.5
+        self.compare("get_sorted_students", (column, descending),
+                     lambda: [s.student_number for s in self.optimized.get_sorted_students(column, descending)],
+                     lambda _: self.reference.sorted_students(column, descending))
+
+    def op_get_students_without_group(self) -> None:
+        # A ordem não é especificada (o índice devolve-os pela ordem em que ficaram sem grupo)
+        self.compare("get_students_without_group", (),
+                     lambda: [s.student_number for s in self.optimized.get_students_without_group()],
+                     lambda _: self.reference.students_without_group())
+
+    def op_statistics(self) -> None:
+        self.compare("statistics", (), self.optimized.statistics.summary, lambda _: self.reference.statistics())
+
+    # --- Estado completo ---
+    def check_state(self, controller: MainController) -> None:
+        """Compara todos os registos, as listas de espera e as estatísticas (e a coerência das referências)."""
+        reference = self.reference
+        self.check("alunos", {n: describe(s) for n, s in controller.data_manager.students.items()},
+                   {n: describe(s) for n, s in reference.students.items()})
+        self.check("grupos", {g: describe(group) for g, group in controller.data_manager.groups.items()},
+                   {g: describe(group) for g, group in reference.groups.items()})
+        self.check("datas de criação",
+                   {row_id: row.created_at for rows in (controller.data_manager.students, controller.data_manager.groups)
+                    for row_id, row in rows.items()},
+                   {row_id: row.created_at for rows in (reference.students, reference.groups) for row_id, row in rows.items()})
+        self.check("listas de espera",
+                   {g: [s.student_number for s in controller.get_waitlist(g)] for g in controller.data_manager.groups},
+                   {g: reference.get_waitlist(g) for g in reference.groups})
+        self.check("estatísticas", controller.statistics.summary(), reference.statistics())
+        self.check("coerência das referências", controller.check_consistency().summary(), [])
+        for column in ("number", "name", "email", "group", "creationDate"):
+            self.check(f"ordenação de alunos por {column}",
+                       [s.student_number for s in controller.get_sorted_students(column)], reference.sorted_students(column))
+        for column in ("name", "capacity", "count"):
+            self.check(f"ordenação de grupos por {column}",
+                       [g.group_id for g in controller.get_sorted_groups(column)],
+                       reference.query_groups({}, column)[0])
+
+    # --- Sequência ---
+    def populate(self, students: int, groups: int) -> None:
+        """Cria os alunos iniciais (numa importação) e os grupos, nos dois lados."""
+        rng = self.rng
+        self.number_pool = [str(100000 + i) for i in range(students * 5 // 4 + 10)]
+        rows = []
+        for line, number in enumerate(rng.sample(self.number_pool, students), start=1):
+            created = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.choice([2024, 2025])}"
+            rows.append((line, number, self.valid_name(), f"a{number}@my.istec.pt", created))
+        start = time.perf_counter()
+        rejected = self.optimized.import_students(rows)
+        middle = time.perf_counter()
+        for _, number, name, email, created in rows:
+            self.reference.create_student(number, name, email, created)
+        end = time.perf_counter()
+        self.check("importação", rejected, [])
+        self.timings["import_students"] = [1, middle - start, end - middle]
+        for _ in range(groups):
+            self.op_create_group()
+
+    def run(self, operations: int, check_every: int) -> None:
+        names = list(OPERATION_WEIGHTS)
+        weights = list(OPERATION_WEIGHTS.values())
+        for self.step in range(1, operations + 1):
+            operation = self.rng.choices(names, weights)[0]
+            getattr(self, f"op_{operation}")()
+            if check_every and self.step % check_every == 0:
+                self.check_state(self.optimized)
+
+    def reopen(self) -> float:
+        """Grava a cache, reabre o controlador a partir do ficheiro e compara o estado restaurado."""
+        self.optimized.save_cache()
+        start = time.perf_counter()
+        reopened = MainController(self.optimized.data_manager.data_file)
+        elapsed = time.perf_counter() - start
+        self.check_state(reopened)
+        self.optimized = reopened
+        return elapsed
+
+
+def print_timings(timings: Dict[str, List[float]]) -> None:
+    """Tabela de tempos por operação: média por chamada de cada lado e aceleração."""
+    print(f"{'operação':<32}{'chamadas':>9}{'otimizado (ms)':>16}{'referência (ms)':>17}{'aceleração':>12}")
+    for operation, (calls, optimized, reference) in sorted(timings.items()):
+        ratio = f"{reference / optimized:.1f}x" if optimized else "-"
+        print(f"{operation:<32}{calls:>9}{optimized / calls * 1000:>16.3f}{reference / calls * 1000:>17.3f}{ratio:>12}")
+    print("\nNas alterações, o lado otimizado inclui a gravação em disco; a referência só altera a memória.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=2000, help="Alunos criados antes da sequência.")
+    parser.add_argument("--groups", type=int, default=60, help="Grupos criados antes da sequência.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check-every", type=int, default=500,
+                        help="Comparar o estado completo a cada N operações (0 = só no fim).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        harness = DifferentialRun(os.path.join(directory, "data.json"), args.seed)
+        try:
+            harness.populate(args.students, args.groups)
+            harness.run(args.operations, args.check_every)
+            harness.check_state(harness.optimized)
+            reopen_time = harness.reopen()
+        except Mismatch as e:
+            print(f"DIFERENÇA (semente {args.seed}) no {e}")
+            return 1
+        print(f"{args.operations} operações sem diferenças (semente {args.seed}); "
+              f"reabertura a partir do ficheiro em {reopen_time:.2f}s, também sem diferenças.\n")
+        print_timings(harness.timings)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Compara o pico de memória (RSS) ao carregar um data.json grande:
+leitura em streaming (DataManager.load_data) versus json.load do documento completo.
+Cada modo corre num processo novo, para que os picos não se misturem.
+
+Exemplo:
+    python benchmarks/load_memory.py --students 1000000 --groups 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.data_manager import DataManager
+from models.group import Group
+from models.student import Student
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo atual, em MB (Linux/macOS)."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux indica KB; macOS indica bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_full(path: str) -> int:
+    """Carregamento anterior: json.load do documento completo e só depois os objetos."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    students = {s["student_number"]: Student.from_dict(s) for s in data.get("students", [])}
+    groups = {g["group_id"]: Group.from_dict(g) for g in data.get("groups", [])}
+    return len(students) + len(groups)
+
+
+def load_stream(path: str) -> int:
+    """Carregamento atual, elemento a elemento."""
+    data_manager = DataManager(path)
+    return len(data_manager.students) + len(data_manager.groups)
+
+
+def run_child(mode: str, path: str) -> None:
+    """Executado no processo filho: carrega o ficheiro e imprime o resultado em JSON."""
+    start = time.perf_counter()
+    records = load_stream(path) if mode == "stream" else load_full(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"records": records, "seconds": elapsed, "peak_mb": peak_rss_mb()}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--groups", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--child", choices=("stream", "full"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.path)
+        return
+
+    from storage_formats import build_roster
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "data.json")
+    source = DataManager(path)
+    build_roster(source, args.students, args.groups, args.seed)
+    source.compact()
+    del source
+    print(f"{args.students} alunos, {args.groups} grupos: {os.path.getsize(path) / 1e6:.0f}MB\n")
+    print(f"{'modo':<10}{'pico RSS (MB)':>15}{'tempo (s)':>12}")
+
+    for mode in ("full", "stream"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, "--path", path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<10}{result['peak_mb']:>15.0f}{result['seconds']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Mede a atribuição por preferências (aceitação diferida com capacidades) numa turma grande:
+cálculo da atribuição e aplicação como uma única alteração no controlador.
+
+Exemplo:
+    python benchmarks/matching.py --students 100000 --groups 5000
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.main_controller import MainController
+from models.group import Group
+from models.matching import match_students
+from models.student import Student
+
+
+def build_preferences(controller: MainController, students: int, groups: int, preferences: int, seed: int) -> None:
+    """Gera alunos sem grupo com preferências enviesadas (alguns grupos são muito mais procurados)."""
+    rng = random.Random(seed)
+    data_manager = controller.data_manager
+    group_ids = []
+    for i in range(groups):
+        group = Group(str(uuid.UUID(int=rng.getrandbits(128))), f"Grupo {i}", rng.randint(18, 26), rng.randint(2, 5))
+        data_manager.groups[group.group_id] = group
+        group_ids.append(group.group_id)
+    # Popularidade tipo Zipf: os primeiros grupos recebem a maior parte das primeiras escolhas
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(groups)))
+    for i in range(students):
+        number = str(100000 + i)
+        student = Student(number, f"Aluno {i}", f"a{number}@my.istec.pt")
+        chosen = []
+        while len(chosen) < preferences:
+            group_id = rng.choices(group_ids, cum_weights=cum_weights)[0]
+            if group_id not in chosen:
+                chosen.append(group_id)
+        student.preferences = chosen
+        data_manager.students[number] = student
+    for index in controller._indexes:
+        index.rebuild(data_manager.students, data_manager.groups)
+    # Grava o estado inicial, para que a atribuição seja gravada no diário (como numa turma real)
+    data_manager.compact()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--groups", type=int, default=5000)
+    parser.add_argument("--preferences", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    controller = MainController(os.path.join(tempfile.mkdtemp(), "data.json"))
+    build_preferences(controller, args.students, args.groups, args.preferences, args.seed)
+    print(f"{args.students} alunos, {args.groups} grupos, {args.preferences} preferências por aluno\n")
+
+    start = time.perf_counter()
+    result = match_students(controller.data_manager.students, controller.data_manager.groups, seed=args.seed)
+    print(f"cálculo da atribuição: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    applied = controller.assign_by_preferences(seed=args.seed)
+    print(f"atribuição aplicada (uma alteração, gravada): {time.perf_counter() - start:.2f}s")
+    assert applied.assignments == result.assignments
+
+    print()
+    print("\n".join(result.describe()))
+
+
+if __name__ == "__main__":
+    main()
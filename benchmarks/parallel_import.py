@@ -0,0 +1,80 @@
+"""
+Mede a importação de uma lista grande de alunos (CSV) com diferentes números de processos:
+a fase paralela (leitura, normalização e validação), a junção (import_students: unicidade e
+escolha das mensagens, sob o bloqueio dos dados) e o total, que é o que o utilizador espera.
+Cada número de processos é medido numa simulação (dry_run), para partir sempre dos mesmos dados;
+no fim, a importação é feita a sério, com criação e gravação dos alunos.
+
+Exemplo:
+    python benchmarks/parallel_import.py --students 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.import_controller import ImportController
+from controllers.main_controller import MainController
+
+
+def write_roster(path: str, students: int, seed: int) -> None:
+    """Escreve um CSV de alunos fictícios, com cerca de 1% de linhas inválidas e 1% de repetidas."""
+    rng = random.Random(seed)
+    names = ['Ana', 'Rui', 'Inês', 'João', 'Marta', 'Tiago']
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write("student_number,name,email,creation_date\r\n")
+        for i in range(students):
+            number = str(100000 + i)
+            name = f"{rng.choice(names)}  {rng.choice(names)}sson"
+            email = f"a{number}@my.istec.pt"
+            roll = rng.random()
+            if roll < 0.01:
+                email = f"a{number}@gmail.com"
+            elif roll < 0.02:
+                number = str(100000 + rng.randrange(i + 1))
+            f.write(f"{number},{name},{email},{rng.randint(1, 28):02d}/09/2025\r\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Números de processos a comparar (predefinição: 1, 2, 4, ... até ao número de CPUs).")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = args.workers or sorted({min(2 ** i, cpus) for i in range(cpus.bit_length() + 1)})
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "alunos.csv")
+    write_roster(path, args.students, args.seed)
+    print(f"{args.students} linhas, {os.path.getsize(path) / 1e6:.1f}MB, {cpus} CPUs\n")
+    print(f"{'processos':<12}{'validação (s)':>15}{'junção (s)':>12}{'total (s)':>12}{'aceleração':>12}")
+
+    importer = ImportController(MainController(os.path.join(directory, "data.json")))
+    controller = importer.controller
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        rows, errors, issues, _ = importer.validate_file(path, workers=workers)
+        middle = time.perf_counter()
+        controller.import_students(rows, dry_run=True, issues=issues)
+        end = time.perf_counter()
+        total = end - start
+        baseline = baseline or total
+        print(f"{workers:<12}{middle - start:>15.2f}{end - middle:>12.2f}{total:>12.2f}{baseline / total:>12.2f}")
+
+    start = time.perf_counter()
+    report = importer.import_file(path, workers=counts[-1])
+    elapsed = time.perf_counter() - start
+    print(f"\nimportação completa com {report.workers} processos (inclui criação e gravação): {elapsed:.2f}s "
+          f"({report.imported} alunos criados, {len(report.errors)} linhas rejeitadas)")
+
+
+if __name__ == "__main__":
+    main()
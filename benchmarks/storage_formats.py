@@ -0,0 +1,76 @@
+"""
+Compara os formatos do ficheiro de dados (tamanho, gravação e carregamento) para uma turma grande.
+
+Exemplo:
+    python benchmarks/storage_formats.py --students 200000 --groups 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.data_manager import DataManager
+from models.group import Group
+from models.storage_format import STORAGE_FORMATS
+from models.student import Student
+
+
+def build_roster(data_manager: DataManager, students: int, groups: int, seed: int) -> None:
+    """Gera alunos e grupos fictícios, com cerca de 90% dos alunos num grupo."""
+    rng = random.Random(seed)
+    group_list = []
+    for i in range(groups):
+        group = Group(str(uuid.UUID(int=rng.getrandbits(128))), f"Grupo {i}", 12, 2)
+        data_manager.groups[group.group_id] = group
+        group_list.append(group)
+    for i in range(students):
+        number = str(100000 + i)
+        student = Student(number, f"Aluno {rng.choice(['Ana', 'Rui', 'Inês', 'João'])} {i}", f"a{number}@my.istec.pt")
+        group = rng.choice(group_list)
+        if rng.random() < 0.9 and group.has_vacancy():
+            group.add_student(number)
+            student.group_id = group.group_id
+        data_manager.students[number] = student
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--groups", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    source = DataManager(os.path.join(directory, "source.json"))
+    build_roster(source, args.students, args.groups, args.seed)
+    print(f"{len(source.students)} alunos, {len(source.groups)} grupos\n")
+    print(f"{'formato':<10}{'tamanho':>12}{'relativo':>10}{'gravar (s)':>12}{'carregar (s)':>14}")
+
+    baseline = None
+    for fmt in STORAGE_FORMATS:
+        path = os.path.join(directory, f"data_{fmt}.json")
+        target = DataManager(path, storage_format=fmt)
+        target.students, target.groups = source.students, source.groups
+
+        start = time.perf_counter()
+        target.compact()
+        save_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = DataManager(path)
+        load_time = time.perf_counter() - start
+        assert loaded.storage_format == fmt
+        assert len(loaded.students) == len(source.students) and len(loaded.groups) == len(source.groups)
+
+        size = os.path.getsize(path)
+        baseline = baseline or size
+        print(f"{fmt:<10}{size / 1e6:>10.1f}MB{size / baseline:>10.2f}{save_time:>12.2f}{load_time:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
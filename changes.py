@@ -0,0 +1,43 @@
+"""
+Leitura do feed de alterações a partir de um cursor (linha de comandos), para sistemas
+externos que sincronizam de forma incremental (ex.: LMS, folha de avaliação).
+
+Cada alteração é escrita como uma linha JSON; o consumidor guarda o "seq" da última
+linha processada e usa-o como --since na chamada seguinte.
+
+Exemplos:
+    python changes.py
+    python changes.py --since 1520 --limit 500
+    python changes.py --since 1520 --course redes-2025-26 > alteracoes.jsonl
+"""
+import argparse
+import json
+import sys
+from controllers.course_controller import CourseController
+from models.change_feed import ChangeFeed
+from models.data_manager import DATA_FILE
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da leitura do feed por linha de comandos."""
+    parser = argparse.ArgumentParser(description="Escreve as alterações posteriores a um cursor, uma por linha (JSON).")
+    parser.add_argument("--since", type=int, default=0, help="Último número de sequência já processado (predefinição: 0, tudo).")
+    parser.add_argument("--limit", type=int, default=None, help="Número máximo de alterações a escrever.")
+    parser.add_argument("--data-file", default=None, help="Ficheiro de dados (predefinição: data.json).")
+    parser.add_argument("--course", default=None, help="Identificador do curso (em vez de --data-file).")
+    args = parser.parse_args(argv)
+
+    try:
+        data_file = CourseController().data_file(args.course) if args.course else (args.data_file or DATA_FILE)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    # Só lê o feed: não é preciso carregar os dados
+    for entry in ChangeFeed(data_file + ".feed").read(args.since, args.limit):
+        sys.stdout.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
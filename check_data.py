@@ -0,0 +1,54 @@
+"""
+Verificação (e reparação) das referências entre alunos e grupos, pela linha de comandos.
+
+Deteta grupos e alunos inexistentes, membros repetidos, alunos em vários grupos,
+alunos que não constam da lista do seu grupo e grupos acima da capacidade máxima.
+
+Exemplos:
+    python check_data.py
+    python check_data.py --repair
+    python check_data.py --course redes-2025-26 --limit 100
+"""
+import argparse
+import sys
+from controllers.main_controller import MainController
+from controllers.course_controller import CourseController
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da verificação por linha de comandos."""
+    parser = argparse.ArgumentParser(description="Verifica as referências entre alunos e grupos.")
+    parser.add_argument("--repair", action="store_true", help="Reparar automaticamente as inconsistências encontradas.")
+    parser.add_argument("--limit", type=int, default=20, help="Número máximo de inconsistências listadas (predefinição: 20).")
+    parser.add_argument("--data-file", default=None, help="Ficheiro de dados a usar (predefinição: data.json).")
+    parser.add_argument("--course", default=None, help="Identificador do curso a verificar (em vez de --data-file).")
+    args = parser.parse_args(argv)
+
+    try:
+        data_file = CourseController().data_file(args.course) if args.course else args.data_file
+        controller = MainController(data_file)
+        report = controller.repair_consistency() if args.repair else controller.check_consistency()
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    if report.ok:
+        print("Não foram encontradas inconsistências.")
+        return 0
+    for line in report.summary():
+        print(line)
+    for issue in report.issues[:args.limit]:
+        print(f"  {issue}")
+    if len(report.issues) > args.limit:
+        print(f"  ... e mais {len(report.issues) - args.limit}.")
+
+    remaining = controller.consistency
+    if args.repair:
+        print(f"Reparação concluída; inconsistências por resolver: {len(remaining.issues)}.")
+    elif report.repairable:
+        print("Use --repair para reparar automaticamente.")
+    return 0 if remaining.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from controllers.main_controller import MainController
+from models.data_manager import BASE_DIR, DATA_FILE
+from models.fuzzy_index import normalize_text
+
+# Pasta onde ficam os ficheiros de dados de cada curso (um ficheiro por curso)
+COURSES_DIR = os.path.join(BASE_DIR, "courses")
+COURSES_INDEX = "index.json"
+
+# O curso predefinido usa o data.json original, para manter os dados existentes
+DEFAULT_COURSE_ID = "geral"
+DEFAULT_COURSE_NAME = "Geral"
+
+# Tempo (segundos) sem utilização após o qual um curso inativo é descarregado da memória
+COURSE_IDLE_SECONDS = 600
+
+
+def course_slug(name: str) -> str:
+    """Identificador de ficheiro para um nome de curso (ex.: "Redes 2025/26" -> "redes-2025-26")."""
+    return re.sub(r"[^a-z0-9]+", "-", normalize_text(name)).strip("-")
+
+
+class CourseController:
+    """
+    Gestão de vários conjuntos de dados independentes (um por curso ou semestre).
+    Cada curso é guardado no seu próprio ficheiro, pelo que abrir, gravar ou sincronizar
+    um curso só custa o tamanho desse curso. Os cursos são carregados apenas quando
+    são abertos e os que ficam muito tempo sem uso são descarregados da memória.
+
+    Atributos:
+        directory (str): Pasta com os ficheiros dos cursos e o índice de nomes.
+        default_data_file (str): Ficheiro de dados do curso predefinido.
+        idle_seconds (float): Tempo sem uso após o qual um curso é descarregado.
+        active_id (str): Identificador do curso ativo.
+    """
+    def __init__(self, directory: Optional[str] = None, default_data_file: Optional[str] = None,
+                 idle_seconds: float = COURSE_IDLE_SECONDS) -> None:
+        """
+        Inicializa o gestor de cursos (nenhum curso é carregado até ser aberto).
+
+        Args:
+            directory (Optional[str], optional): Pasta dos cursos. Predefinição: COURSES_DIR.
+            default_data_file (Optional[str], optional): Ficheiro do curso predefinido. Predefinição: DATA_FILE.
+            idle_seconds (float, optional): Tempo sem uso até descarregar. Predefinição: COURSE_IDLE_SECONDS.
+        """
+        self.directory: str = directory or COURSES_DIR
+        self.default_data_file: str = default_data_file or DATA_FILE
+        self.idle_seconds: float = idle_seconds
+        self.active_id: str = DEFAULT_COURSE_ID
+        self._names: Dict[str, str] = {}
+        self._loaded: Dict[str, MainController] = {}
+        self._last_used: Dict[str, float] = {}
+        self._load_index()
+
+    # --- Índice de cursos ---
+    def _index_file(self) -> str:
+        return os.path.join(self.directory, COURSES_INDEX)
+
+    def _load_index(self) -> None:
+        """Lê os nomes dos cursos (e acrescenta ficheiros de cursos sem entrada no índice)."""
+        names = {DEFAULT_COURSE_ID: DEFAULT_COURSE_NAME}
+        try:
+            with open(self._index_file(), 'r', encoding='utf-8') as f:
+                for entry in json.load(f).get("courses", []):
+                    names[entry["id"]] = entry["name"]
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, IOError) as e:
+            print(f"Erro ao carregar lista de cursos: {e}")
+
+        if os.path.isdir(self.directory):
+            for file_name in sorted(os.listdir(self.directory)):
+                course_id, ext = os.path.splitext(file_name)
+                if ext == ".json" and file_name != COURSES_INDEX and course_id not in names:
+                    names[course_id] = course_id
+        self._names = names
+
+    def _save_index(self) -> None:
+        """Grava o índice de nomes de forma atómica."""
+        data = {"courses": [{"id": cid, "name": name} for cid, name in self._names.items() if cid != DEFAULT_COURSE_ID]}
+        tmp_file = self._index_file() + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_file, self._index_file())
+        except IOError as e:
+            print(f"Erro ao guardar lista de cursos: {e}")
+
+    def list_courses(self) -> List[Tuple[str, str]]:
+        """
+        Lista os cursos existentes (incluindo os criados por outras instâncias).
+
+        Retorna:
+            List[Tuple[str, str]]: Pares (identificador, nome), com o curso predefinido primeiro.
+        """
+        self._load_index()
+        return list(self._names.items())
+
+    def course_name(self, course_id: str) -> str:
+        """Nome de apresentação de um curso."""
+        return self._names.get(course_id, course_id)
+
+    def data_file(self, course_id: str) -> str:
+        """
+        Caminho do ficheiro de dados de um curso.
+
+        Lança:
+            ValueError: Se o curso não existir.
+        """
+        if course_id not in self._names:
+            self._load_index()
+            if course_id not in self._names:
+                raise ValueError("Curso não encontrado.")
+        if course_id == DEFAULT_COURSE_ID:
+            return self.default_data_file
+        return os.path.join(self.directory, course_id + ".json")
+
+    def create_course(self, name: str) -> str:
+        """
+        Cria um curso novo (vazio), com o seu próprio ficheiro de dados.
+
+        Args:
+            name (str): Nome do curso (ex.: "Programação 2025/26").
+
+        Retorna:
+            str: Identificador do curso criado.
+
+        Lança:
+            ValueError: Se o nome for inválido ou já existir.
+        """
+        name = name.strip()
+        if len(name) < 3:
+            raise ValueError("O nome do curso deve ter pelo menos 3 caracteres.")
+        course_id = course_slug(name)
+        if not course_id:
+            raise ValueError("O nome do curso deve conter letras ou números.")
+
+        self._load_index()
+        if course_id in self._names:
+            raise ValueError("Já existe um curso com esse nome.")
+        self._names[course_id] = name
+        self._save_index()
+        return course_id
+
+    # --- Carregamento ---
+    def is_loaded(self, course_id: str) -> bool:
+        """Indica se o curso está carregado em memória."""
+        return course_id in self._loaded
+
+    def get_controller(self, course_id: str, load: bool = True) -> MainController:
+        """
+        Controlador de um curso, carregando o seu ficheiro apenas na primeira utilização.
+        Com load=False, um curso ainda não carregado fica por carregar (ver MainController.load).
+
+        Lança:
+            ValueError: Se o curso não existir.
+        """
+        controller = self._loaded.get(course_id)
+        if controller is None:
+            controller = MainController(self.data_file(course_id), load=load)
+            self._loaded[course_id] = controller
+        self._last_used[course_id] = time.monotonic()
+        return controller
+
+    def open(self, course_id: str, load: bool = True) -> MainController:
+        """
+        Torna um curso ativo (carregando-o se necessário).
+
+        Args:
+            course_id (str): Identificador do curso.
+            load (bool, optional): Se False, não carrega um curso ainda por carregar. Predefinição: True.
+
+        Retorna:
+            MainController: O controlador do curso.
+        """
+        controller = self.get_controller(course_id, load)
+        if course_id != self.active_id and self.active_id in self._loaded:
+            # As vistas usam o controlador ativo diretamente (sem passar por get_controller):
+            # o curso que deixa de estar ativo foi usado até agora, não quando foi aberto
+            self._last_used[self.active_id] = time.monotonic()
+        self.active_id = course_id
+        return controller
+
+    @property
+    def active(self) -> MainController:
+        """Controlador do curso ativo."""
+        return self.get_controller(self.active_id)
+
+    def unload(self, course_id: str) -> None:
+        """
+        Descarrega um curso da memória. Os dados já estão gravados (cada alteração é
+        guardada de imediato), pelo que basta escrever o que falta do registo de auditoria,
+        guardar a cache de arranque e esquecer o controlador.
+
+        Lança:
+            ValueError: Se o curso for o ativo.
+        """
+        if course_id == self.active_id:
+            raise ValueError("Não é possível descarregar o curso ativo.")
+        controller = self._loaded.pop(course_id, None)
+        if controller is not None:
+            controller.audit.flush()
+            controller.save_cache()
+        self._last_used.pop(course_id, None)
+
+    def unload_idle(self, now: Optional[float] = None) -> List[str]:
+        """
+        Descarrega os cursos inativos que não são usados há mais de 'idle_seconds'.
+
+        Retorna:
+            List[str]: Identificadores dos cursos descarregados.
+        """
+        now = time.monotonic() if now is None else now
+        idle = [cid for cid in self._loaded
+                if cid != self.active_id and now - self._last_used.get(cid, now) >= self.idle_seconds]
+        for course_id in idle:
+            self.unload(course_id)
+        return idle
+
+    def loaded_controllers(self) -> List[MainController]:
+        """Controladores dos cursos atualmente em memória."""
+        return list(self._loaded.values())
@@ -0,0 +1,262 @@
+import csv
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from controllers.main_controller import MainController
+
+# Tipos de exportação disponíveis (chave -> descrição apresentada na interface)
+EXPORT_KINDS: Dict[str, str] = {
+    "students": "Alunos (com grupo)",
+    "groups": "Grupos e membros",
+    "ungrouped": "Alunos sem grupo",
+}
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+STUDENT_FIELDS: List[str] = ["student_number", "name", "email", "group_id", "group_name", "creation_date"]
+GROUP_MEMBER_FIELDS: List[str] = ["group_id", "group_name", "max_capacity", "min_capacity", "student_number", "name", "email"]
+REPORT_FIELDS: List[str] = ["student_number", "name", "email", "creation_date"]
+
+# Callback de progresso das operações demoradas: (feito, total), com total 0 se desconhecido.
+# Pode lançar uma exceção para interromper a operação (ex.: cancelamento na interface).
+ProgressCallback = Callable[[int, int], None]
+# Linhas escritas entre duas chamadas ao callback de progresso
+PROGRESS_INTERVAL = 1000
+
+
+def _file_mode(path: str) -> int:
+    """Permissões do ficheiro de destino: as do ficheiro existente, ou as predefinidas (umask)."""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def with_progress(rows: Iterable[Any], progress: Optional[ProgressCallback], total: int) -> Iterator[Any]:
+    """Repete as linhas, comunicando o progresso a cada PROGRESS_INTERVAL linhas."""
+    if progress is None:
+        yield from rows
+        return
+    progress(0, total)
+    for count, row in enumerate(rows, start=1):
+        yield row
+        if count % PROGRESS_INTERVAL == 0:
+            progress(count, total)
+
+
+class ExportController:
+    """
+    Motor de exportação de listas de alunos e grupos.
+    Todas as linhas são produzidas por geradores e escritas uma a uma, pelo que a memória
+    usada não depende do número de registos exportados.
+
+    Atributos:
+        controller (MainController): Controlador principal com os dados.
+    """
+    def __init__(self, controller: 'MainController') -> None:
+        """
+        Inicializa o motor de exportação.
+
+        Args:
+            controller (MainController): Controlador principal.
+        """
+        self.controller: 'MainController' = controller
+
+    # --- Geradores de linhas ---
+    def iter_students(self) -> Iterator[Dict[str, Any]]:
+        """Gera uma linha por aluno, com o nome do grupo a que pertence."""
+        groups = self.controller.data_manager.groups
+        for s in self.controller.data_manager.students.values():
+            group = groups.get(s.group_id) if s.group_id else None
+            yield {
+                "student_number": s.student_number,
+                "name": s.name,
+                "email": s.email,
+                "group_id": s.group_id or "",
+                "group_name": group.name if group else "",
+                "creation_date": s.creation_date,
+            }
+
+    def iter_ungrouped_students(self) -> Iterator[Dict[str, Any]]:
+        """Gera uma linha por aluno sem grupo."""
+        for s in self.controller.data_manager.students.values():
+            if not s.group_id:
+                yield {
+                    "student_number": s.student_number,
+                    "name": s.name,
+                    "email": s.email,
+                    "group_id": "",
+                    "group_name": "",
+                    "creation_date": s.creation_date,
+                }
+
+    def iter_groups(self) -> Iterator[Dict[str, Any]]:
+        """Gera um registo por grupo com a lista dos seus membros."""
+        students = self.controller.data_manager.students
+        for g in self.controller.data_manager.groups.values():
+            members = []
+            for s_num in g.student_ids:
+                student = students.get(s_num)
+                if student:
+                    members.append({"student_number": student.student_number, "name": student.name, "email": student.email})
+            yield {
+                "group_id": g.group_id,
+                "group_name": g.name,
+                "max_capacity": g.max_capacity,
+                "min_capacity": g.min_capacity,
+                "creation_date": g.creation_date,
+                "members": members,
+            }
+
+    def iter_group_member_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Gera uma linha por par (grupo, membro), adequada a CSV.
+        Grupos vazios produzem uma linha sem dados de aluno para não se perderem.
+        """
+        for group in self.iter_groups():
+            base = {k: group[k] for k in ("group_id", "group_name", "max_capacity", "min_capacity")}
+            if not group["members"]:
+                yield dict(base, student_number="", name="", email="")
+            for member in group["members"]:
+                yield dict(base, **member)
+
+    # --- Escritores ---
+    def write_csv(self, rows: Iterable[Dict[str, Any]], path: str, fields: List[str]) -> int:
+        """
+        Escreve linhas num ficheiro CSV (UTF-8 com BOM, compatível com o Excel).
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): Linhas a escrever.
+            path (str): Ficheiro de destino.
+            fields (List[str]): Colunas (ordem do cabeçalho).
+
+        Retorna:
+            int: Número de linhas escritas.
+        """
+        count = 0
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def write_jsonl(self, rows: Iterable[Dict[str, Any]], path: str) -> int:
+        """
+        Escreve um objeto JSON por linha.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): Registos a escrever.
+            path (str): Ficheiro de destino.
+
+        Retorna:
+            int: Número de registos escritos.
+        """
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        return count
+
+    def export(self, kind: str, path: str, fmt: Optional[str] = None, progress: Optional[ProgressCallback] = None) -> int:
+        """
+        Exporta um tipo de lista para ficheiro.
+        Se a escrita for interrompida (erro ou exceção lançada pelo callback de progresso),
+        o ficheiro de destino fica como estava.
+
+        Args:
+            kind (str): "students", "groups" ou "ungrouped".
+            path (str): Ficheiro de destino.
+            fmt (Optional[str], optional): "csv" ou "jsonl". Predefinição: deduzido da extensão.
+            progress (Optional[ProgressCallback], optional): Chamado a cada PROGRESS_INTERVAL linhas.
+
+        Retorna:
+            int: Número de linhas/registos escritos.
+
+        Lança:
+            ValueError: Se o tipo ou o formato forem inválidos, ou se a escrita falhar.
+        """
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Tipo de exportação desconhecido: {kind}.")
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError("Formato de exportação deve ser CSV ou JSONL.")
+
+        # Escreve num ficheiro temporário na mesma pasta, que só substitui o destino no fim:
+        # uma exportação interrompida não deixa um ficheiro incompleto nem apaga um ficheiro existente
+        try:
+            with tempfile.NamedTemporaryFile(delete=False, dir=os.path.dirname(os.path.abspath(path)),
+                                             prefix=os.path.basename(path) + ".", suffix=".tmp") as tmp:
+                tmp_path = tmp.name
+            # O temporário é criado só com permissões do dono; o ficheiro final fica com as habituais
+            os.chmod(tmp_path, _file_mode(path))
+        except IOError as e:
+            raise ValueError(f"Erro ao exportar: {e}")
+
+        statistics = self.controller.statistics
+        grouped = statistics.student_count - statistics.unassigned_count
+        try:
+            if fmt == "jsonl":
+                sources: Dict[str, Callable[[], Iterator[Dict[str, Any]]]] = {
+                    "students": self.iter_students,
+                    "groups": self.iter_groups,
+                    "ungrouped": self.iter_ungrouped_students,
+                }
+                totals = {"students": statistics.student_count, "groups": statistics.group_count,
+                          "ungrouped": statistics.unassigned_count}
+                count = self.write_jsonl(with_progress(sources[kind](), progress, totals[kind]), tmp_path)
+            elif kind == "groups":
+                count = self.write_csv(with_progress(self.iter_group_member_rows(), progress, grouped), tmp_path, GROUP_MEMBER_FIELDS)
+            else:
+                rows = self.iter_students() if kind == "students" else self.iter_ungrouped_students()
+                total = statistics.student_count if kind == "students" else statistics.unassigned_count
+                count = self.write_csv(with_progress(rows, progress, total), tmp_path, STUDENT_FIELDS)
+            os.replace(tmp_path, path)
+            return count
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if isinstance(e, IOError):
+                raise ValueError(f"Erro ao exportar: {e}")
+            raise
+
+    def export_group_reports(self, directory: str, progress: Optional[ProgressCallback] = None) -> int:
+        """
+        Cria um relatório CSV por grupo (um ficheiro por grupo) numa pasta.
+
+        Args:
+            directory (str): Pasta de destino (criada se não existir).
+            progress (Optional[ProgressCallback], optional): Chamado depois de cada relatório.
+
+        Retorna:
+            int: Número de relatórios criados.
+
+        Lança:
+            ValueError: Se a escrita falhar.
+        """
+        students = self.controller.data_manager.students
+        total = len(self.controller.data_manager.groups)
+        count = 0
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for g in self.controller.data_manager.groups.values():
+                # Nomes de grupo são alfanuméricos; o ID evita colisões entre nomes parecidos
+                file_name = f"{g.name.strip().replace(' ', '_')}_{g.group_id[:8]}.csv"
+                members = (students[s_num] for s_num in g.student_ids if s_num in students)
+                rows = ({"student_number": s.student_number, "name": s.name, "email": s.email, "creation_date": s.creation_date} for s in members)
+                self.write_csv(rows, os.path.join(directory, file_name), REPORT_FIELDS)
+                count += 1
+                if progress is not None:
+                    progress(count, total)
+        except IOError as e:
+            raise ValueError(f"Erro ao exportar: {e}")
+        return count
@@ -0,0 +1,290 @@
+import csv
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from controllers.export_controller import ProgressCallback
+from models.timestamps import format_date, parse_date
+from models.validation import ImportRow, RowError, RowIssues, normalize_student_row, student_row_issues
+
+if TYPE_CHECKING:
+    from controllers.main_controller import MainController
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Colunas lidas de cada aluno (as restantes, ex.: group_id de uma exportação, são ignoradas)
+REQUIRED_FIELDS: List[str] = ["student_number", "name", "email"]
+OPTIONAL_FIELDS: List[str] = ["creation_date"]
+
+# Ficheiros abaixo deste tamanho são validados no próprio processo (arrancar processos custa mais)
+MIN_PARALLEL_BYTES = 4 * 1024 * 1024
+# Blocos por processo: blocos mais pequenos equilibram melhor a carga entre processos (e o progresso é mais fino)
+CHUNKS_PER_WORKER = 4
+
+# Intervalo de bytes de um bloco: (início, fim)
+ByteRange = Tuple[int, int]
+# Resultado da validação de um bloco: (linhas do bloco, alunos lidos, linhas rejeitadas, erros
+# por reportar de cada linha), com as linhas numeradas a partir do início do bloco
+ChunkResult = Tuple[int, List[ImportRow], List[RowError], Dict[int, RowIssues]]
+
+
+class ImportReport:
+    """
+    Resultado de uma importação de alunos.
+
+    Atributos:
+        rows (int): Número de alunos lidos do ficheiro.
+        imported (int): Número de alunos criados (ou que seriam criados, numa simulação).
+        errors (List[RowError]): Linhas rejeitadas, como (linha, mensagem), pela ordem do ficheiro.
+        workers (int): Número de processos usados na validação.
+    """
+    def __init__(self, rows: int, imported: int, errors: List[RowError], workers: int) -> None:
+        self.rows: int = rows
+        self.imported: int = imported
+        self.errors: List[RowError] = errors
+        self.workers: int = workers
+
+
+def _read_fields(fmt: str, line: str, columns: Optional[Dict[str, int]]) -> Optional[List[str]]:
+    """Valores (número, nome, email, data) de uma linha de dados, ou None se a linha estiver vazia."""
+    if fmt == "jsonl":
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError("JSON inválido.")
+        if not isinstance(record, dict):
+            raise ValueError("Cada linha deve ser um objeto JSON.")
+        values = [record.get(field) for field in REQUIRED_FIELDS + OPTIONAL_FIELDS]
+        return ["" if value is None else str(value) for value in values]
+
+    # Só as linhas com aspas precisam do leitor de CSV; as restantes dividem-se nas vírgulas
+    row = next(csv.reader([line]), None) if '"' in line else line.split(",")
+    if not row or row == [""]:
+        return None
+    if len(row) < len(columns):
+        raise ValueError("Faltam colunas nesta linha.")
+    return [row[columns[field]] if field in columns else "" for field in REQUIRED_FIELDS + OPTIONAL_FIELDS]
+
+
+def validate_chunk(path: str, fmt: str, byte_range: ByteRange, columns: Optional[Dict[str, int]]) -> ChunkResult:
+    """
+    Lê, normaliza e valida um bloco do ficheiro de importação.
+    É uma função do módulo (e não um método) para poder correr noutro processo.
+
+    Args:
+        path (str): Ficheiro de importação.
+        fmt (str): "csv" ou "jsonl".
+        byte_range (ByteRange): Bytes do bloco (começa e acaba em inícios de linha).
+        columns (Optional[Dict[str, int]]): Posição de cada coluna no CSV (None em JSONL).
+
+    Retorna:
+        ChunkResult: Linhas lidas, alunos lidos, linhas rejeitadas (formato ilegível, número ou data
+            inválidos) e os erros dos campos e do nome de cada aluno, que só são reportados se a linha
+            passar as verificações de unicidade que os precedem (ver MainController.import_students);
+            tudo numerado a partir do início do bloco.
+    """
+    start, end = byte_range
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.decode('utf-8', errors='replace').split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    rows: List[ImportRow] = []
+    errors: List[RowError] = []
+    issues: Dict[int, RowIssues] = {}
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            fields = _read_fields(fmt, line.rstrip("\r"), columns)
+            if fields is None:
+                continue
+            student_number, name, email = normalize_student_row(*fields[:3])
+            creation_date = fields[3].strip() or None
+            if creation_date is not None:
+                timestamp = parse_date(creation_date)
+                if timestamp is None:
+                    raise ValueError(f"Data de criação inválida: {creation_date} (use dd/mm/aaaa).")
+                creation_date = format_date(timestamp)
+            row_issues = student_row_issues(name, email)
+            if row_issues is not None:
+                issues[line_number] = row_issues
+            rows.append((line_number, student_number, name, email, creation_date))
+        except (ValueError, csv.Error) as e:
+            errors.append((line_number, str(e)))
+    return len(lines), rows, errors, issues
+
+
+class ImportController:
+    """
+    Importação de listas de alunos (CSV ou JSONL, uma linha por aluno) em grande escala.
+
+    A importação decorre em duas fases:
+    1. O ficheiro é dividido em blocos de linhas inteiras, lidos, normalizados e validados
+       em paralelo por um conjunto de processos (as regras de cada aluno não dependem dos
+       outros, ver models/validation.py);
+    2. Os resultados são juntos por ordem num único passo (import_students do controlador),
+       que verifica a unicidade dos números e dos emails, escolhe a mensagem de cada linha
+       rejeitada pela ordem de create_student e cria os alunos numa só alteração.
+
+    Atributos:
+        controller (MainController): Controlador principal com os dados.
+    """
+    def __init__(self, controller: 'MainController') -> None:
+        """
+        Inicializa o motor de importação.
+
+        Args:
+            controller (MainController): Controlador principal.
+        """
+        self.controller: 'MainController' = controller
+
+    def _read_header(self, path: str, fmt: str) -> Tuple[int, Optional[Dict[str, int]]]:
+        """
+        Lê o cabeçalho do CSV.
+
+        Retorna:
+            Tuple[int, Optional[Dict[str, int]]]: Byte onde começam os dados e posição de cada coluna
+                (em JSONL não há cabeçalho: (0, None)).
+
+        Lança:
+            ValueError: Se faltar uma coluna obrigatória.
+        """
+        if fmt == "jsonl":
+            return 0, None
+        with open(path, 'rb') as f:
+            header = f.readline()
+            data_start = f.tell()
+        names = next(csv.reader([header.decode('utf-8-sig').strip()]), [])
+        columns = {name.strip(): i for i, name in enumerate(names)}
+        for field in REQUIRED_FIELDS:
+            if field not in columns:
+                raise ValueError(f"O ficheiro não tem a coluna {field}.")
+        return data_start, columns
+
+    def split_chunks(self, path: str, data_start: int, count: int) -> List[ByteRange]:
+        """
+        Divide o ficheiro em cerca de 'count' blocos de tamanho semelhante,
+        acertando cada fronteira no início da linha seguinte.
+
+        Args:
+            path (str): Ficheiro de importação.
+            data_start (int): Byte onde começam os dados (depois do cabeçalho).
+            count (int): Número de blocos pretendido.
+
+        Retorna:
+            List[ByteRange]: Blocos, pela ordem do ficheiro.
+        """
+        size = os.path.getsize(path)
+        step = max((size - data_start) // max(count, 1), 1)
+        chunks: List[ByteRange] = []
+        with open(path, 'rb') as f:
+            start = data_start
+            while start < size:
+                if start + step >= size:
+                    end = size
+                else:
+                    f.seek(start + step)
+                    f.readline()
+                    end = f.tell()
+                chunks.append((start, end))
+                start = end
+        return chunks
+
+    def validate_file(self, path: str, fmt: Optional[str] = None, workers: Optional[int] = None,
+                      progress: Optional[ProgressCallback] = None) -> Tuple[List[ImportRow], List[RowError], Dict[int, RowIssues], int]:
+        """
+        Fase paralela: lê, normaliza e valida todas as linhas do ficheiro.
+
+        Args:
+            path (str): Ficheiro de importação.
+            fmt (Optional[str], optional): "csv" ou "jsonl". Predefinição: deduzido da extensão.
+            workers (Optional[int], optional): Número de processos. Predefinição: número de CPUs
+                (1 = sem processos adicionais; ficheiros pequenos são sempre validados no próprio processo).
+            progress (Optional[ProgressCallback], optional): Chamado depois de cada bloco validado; se lançar
+                uma exceção, os blocos ainda por validar são abandonados.
+
+        Retorna:
+            Tuple[List[ImportRow], List[RowError], Dict[int, RowIssues], int]: Alunos lidos, linhas
+                rejeitadas, erros por reportar de cada aluno (ver validate_chunk), numerados como no
+                ficheiro, e número de processos usados.
+
+        Lança:
+            ValueError: Se o formato for inválido ou o ficheiro não puder ser lido.
+        """
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError("Formato de importação deve ser CSV ou JSONL.")
+        if workers is not None and workers < 1:
+            raise ValueError("O número de processos deve ser positivo.")
+
+        try:
+            data_start, columns = self._read_header(path, fmt)
+            if workers is None:
+                workers = os.cpu_count() or 1
+            if os.path.getsize(path) - data_start < MIN_PARALLEL_BYTES:
+                workers = 1
+            chunks = self.split_chunks(path, data_start, workers * CHUNKS_PER_WORKER)
+            results: List[ChunkResult] = []
+            if workers == 1:
+                for chunk in chunks:
+                    results.append(validate_chunk(path, fmt, chunk, columns))
+                    if progress is not None:
+                        progress(len(results), len(chunks))
+            else:
+                # "spawn": a importação pode correr numa thread da interface, e copiar (fork) um
+                # processo com várias threads pode deixar os processos filhos bloqueados
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                try:
+                    futures = [pool.submit(validate_chunk, path, fmt, chunk, columns) for chunk in chunks]
+                    for future in futures:
+                        results.append(future.result())
+                        if progress is not None:
+                            progress(len(results), len(chunks))
+                finally:
+                    pool.shutdown(wait=True, cancel_futures=True)
+        except (IOError, OSError) as e:
+            raise ValueError(f"Erro ao importar: {e}")
+
+        # Os blocos numeram as linhas a partir do seu início: acerta-se a numeração pela ordem
+        # dos blocos (o cabeçalho do CSV é a linha 1)
+        rows: List[ImportRow] = []
+        errors: List[RowError] = []
+        issues: Dict[int, RowIssues] = {}
+        offset = 1 if columns is not None else 0
+        for line_count, chunk_rows, chunk_errors, chunk_issues in results:
+            rows.extend((line + offset, number, name, email, creation_date)
+                        for line, number, name, email, creation_date in chunk_rows)
+            errors.extend((line + offset, message) for line, message in chunk_errors)
+            issues.update((line + offset, row_issues) for line, row_issues in chunk_issues.items())
+            offset += line_count
+        return rows, errors, issues, workers
+
+    def import_file(self, path: str, fmt: Optional[str] = None, workers: Optional[int] = None,
+                    dry_run: bool = False, progress: Optional[ProgressCallback] = None) -> ImportReport:
+        """
+        Importa os alunos de um ficheiro CSV ou JSONL.
+        As linhas inválidas ou repetidas são rejeitadas e indicadas no relatório;
+        as restantes são criadas numa única alteração.
+
+        Args:
+            path (str): Ficheiro de importação (CSV com cabeçalho, ou um objeto JSON por linha).
+            fmt (Optional[str], optional): "csv" ou "jsonl". Predefinição: deduzido da extensão.
+            workers (Optional[int], optional): Número de processos na validação. Predefinição: número de CPUs.
+            dry_run (bool, optional): Apenas verificar o ficheiro, sem criar alunos. Predefinição: False.
+            progress (Optional[ProgressCallback], optional): Progresso da validação (ver validate_file);
+                a criação dos alunos, numa só alteração, já não é interrompida.
+
+        Retorna:
+            ImportReport: Relatório da importação.
+
+        Lança:
+            ValueError: Se o ficheiro não puder ser lido ou a gravação falhar.
+        """
+        rows, errors, issues, used_workers = self.validate_file(path, fmt, workers, progress)
+        rejected = self.controller.import_students(rows, dry_run, issues)
+        return ImportReport(len(rows) + len(errors), len(rows) - len(rejected), sorted(errors + rejected), used_workers)
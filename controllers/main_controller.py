@@ -1,10 +1,82 @@
+import functools
+import inspect
+import threading
 import uuid
 import re
-import unicodedata
-from typing import List, Optional
-from models.data_manager import DataManager
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+from models.data_manager import DataManager, DataConflictError, LoadCallback
 from models.student import Student
 from models.group import Group
+from models.statistics import RosterStatistics
+from models.sort_index import StudentSortIndex, GroupSortIndex
+from models.date_index import CreationDateIndex
+from models.fuzzy_index import FuzzyStudentIndex, normalize_text
+from models.change_log import Change, ChangeHistory
+from models.snapshots import Snapshot, SnapshotDiff, SnapshotStore
+from models.lookup_index import LookupIndex
+from models.index_cache import IndexCache, cache_path
+from models.matching import MAX_PREFERENCES, MatchingResult, match_students
+from models.change_feed import ChangeFeed
+from models.audit_log import AuditLog, summarize_args
+from models.consistency import ConsistencyMonitor, ConsistencyReport, check_consistency, repair_references
+from models.query import Page, decode_cursor, encode_cursor
+from models.query_planner import FilterTerm, parse_filter_date, plan_query
+from models.validation import (ImportRow, RowError, RowIssues, check_student_contact, check_student_name,
+                              check_student_number, student_row_issues)
+
+# Alterações que tocam pelo menos 1/BULK_REBUILD_RATIO dos registos (e pelo menos BULK_REBUILD_MIN)
+# reconstroem as estruturas derivadas em vez de as atualizarem registo a registo
+BULK_REBUILD_RATIO = 4
+BULK_REBUILD_MIN = 1000
+
+
+def mutation(method):
+    """
+    Decorador para operações que alteram dados.
+    Executa a operação sob o bloqueio do ficheiro, depois de integrar alterações
+    feitas por outras instâncias, para que as validações usem dados atualizados.
+
+    A operação regista (com _touch) os registos que vai alterar; no fim, a alteração
+    é confirmada de uma só vez (_commit). Se a operação falhar a meio, os registos
+    tocados voltam ao estado anterior. Chamadas aninhadas (na mesma thread) juntam-se à
+    operação em curso; as de outras threads esperam pelo bloqueio.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self: 'MainController', *args, **kwargs):
+        if self._pending_change is not None and self._pending_owner == threading.get_ident():
+            return method(self, *args, **kwargs)
+
+        with self.data_manager.lock:
+            self.sync_external_changes()
+            # Todos os argumentos por nome (posicionais, por palavra-chave e predefinidos), para o feed e a auditoria
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            change = self._pending_change = Change(method.__name__, arguments)
+            self._pending_owner = threading.get_ident()
+            try:
+                result = method(self, *args, **kwargs)
+                if change.touched:
+                    self._commit(change)
+                return result
+            except DataConflictError:
+                # A versão gravada por outra instância prevalece; descarta a alteração local
+                self._apply_external_changes()
+                self.notify_observers()
+                raise
+            except Exception:
+                if change.touched:
+                    self._rollback(change)
+                raise
+            finally:
+                self._pending_change = None
+                self._pending_owner = None
+    return wrapper
+
 
 class MainController:
     """
@@ -14,33 +86,400 @@ class MainController:
 
     Atributos:
         data_manager (DataManager): Instância do gestor de dados.
+        statistics (RosterStatistics): Estatísticas mantidas incrementalmente.
+        student_sort (StudentSortIndex): Ordenações em cache da tabela de alunos.
+        group_sort (GroupSortIndex): Ordenações em cache da tabela de grupos.
+        fuzzy_index (FuzzyStudentIndex): Índice de trigramas para pesquisa aproximada.
+        lookups (LookupIndex): Emails, nomes de grupo, alunos sem grupo e textos de pesquisa.
+        creation_dates (CreationDateIndex): Datas de criação por ordem cronológica (filtros por intervalo).
+        history (ChangeHistory): Histórico de alterações para anular/refazer.
+        snapshots (SnapshotStore): Versões persistentes e instantâneos dos dados.
+        index_cache (IndexCache): Cache em disco das estruturas derivadas, para arranques rápidos.
+        feed (ChangeFeed): Feed de alterações para sistemas externos ("data.json.feed").
+        audit (AuditLog): Registo de auditoria de todas as alterações ("data.json.audit").
+        loaded (bool): Indica se os dados já foram carregados (ver load).
+        integrity (ConsistencyMonitor): Verificação das referências entre alunos e grupos, feita ao
+            carregar (restaurada da cache se o ficheiro não mudou); ver também consistency.
     """
-    def __init__(self) -> None:
-        """Inicializa o MainController."""
-        self.data_manager: DataManager = DataManager()
+    def __init__(self, data_file: Optional[str] = None, load: bool = True) -> None:
+        """
+        Inicializa o MainController.
+
+        Args:
+            data_file (Optional[str], optional): Ficheiro de dados. Predefinição: DATA_FILE.
+            load (bool, optional): Se False, os dados só são carregados ao chamar load
+                (ex.: numa thread de trabalho). Predefinição: True.
+        """
+        # Os dados são lidos no fim (load), depois de registadas as estruturas derivadas,
+        # para que estas sejam construídas uma única vez (ou restauradas da cache)
+        self.data_manager: DataManager = DataManager(data_file, autoload=False)
+        self.loaded: bool = False
         self._observers = []
+        self.history: ChangeHistory = ChangeHistory()
+        self._pending_change: Optional[Change] = None
+        # Thread que executa a operação em curso (só essa se junta a _pending_change)
+        self._pending_owner: Optional[int] = None
+        self.feed: ChangeFeed = ChangeFeed(self.data_manager.data_file + ".feed")
+        self.audit: AuditLog = AuditLog(self.data_manager.data_file + ".audit")
+        # Estruturas derivadas atualizadas a cada alteração (ver _update_indexes)
+        self._indexes = []
+        # Estruturas cujo estado é guardado na cache de arranque (ver _build_indexes)
+        self._cached_indexes = []
+        self.index_cache: IndexCache = IndexCache(cache_path(self.data_manager.data_file))
+        self.statistics: RosterStatistics = RosterStatistics()
+        self.add_index(self.statistics, cached=True)
+        self.student_sort: StudentSortIndex = StudentSortIndex()
+        self.add_index(self.student_sort, cached=True)
+        self.group_sort: GroupSortIndex = GroupSortIndex()
+        self.add_index(self.group_sort, cached=True)
+        self.fuzzy_index: FuzzyStudentIndex = FuzzyStudentIndex()
+        self.add_index(self.fuzzy_index, cached=True)
+        self.lookups: LookupIndex = LookupIndex()
+        self.add_index(self.lookups, cached=True)
+        self.creation_dates: CreationDateIndex = CreationDateIndex()
+        self.add_index(self.creation_dates, cached=True)
+        self.integrity: ConsistencyMonitor = ConsistencyMonitor()
+        self.add_index(self.integrity, cached=True)
+        # Os instantâneos não vão para a cache: a sua versão persistente só é construída quando usada
+        self.snapshots: SnapshotStore = SnapshotStore(self.data_manager.data_file + ".snapshots")
+        self.add_index(self.snapshots)
+        if load:
+            self.load()
+
+    def load(self, on_chunk: Optional[LoadCallback] = None) -> None:
+        """
+        Carrega os dados e constrói as estruturas derivadas (ou restaura-as da cache).
+        Pode correr numa thread de trabalho: até terminar (loaded = True), a interface
+        não deve consultar nem alterar os dados, apenas mostrar os blocos recebidos.
+
+        Args:
+            on_chunk (Optional[LoadCallback], optional): Chamado após cada bloco de registos carregados.
+        """
+        self.data_manager.load_data(on_chunk)
+        self._build_indexes()
+        self.loaded = True
+
+    def _build_indexes(self) -> None:
+        """
+        Constrói as estruturas derivadas a partir dos dados carregados.
+        Se a cache de arranque corresponder aos dados (mesma impressão digital), as estruturas
+        em cache são restauradas em vez de reconstruídas; caso contrário são reconstruídas
+        e a cache é substituída.
+        """
+        students = self.data_manager.students
+        groups = self.data_manager.groups
+        restored = self.index_cache.load(self.data_manager.fingerprint(), self._cached_indexes)
+        for index in self._indexes:
+            if not (restored and index in self._cached_indexes):
+                index.rebuild(students, groups)
+        if not restored and not self.data_manager.is_dirty():
+            self.index_cache.save(self.data_manager.fingerprint(), self._cached_indexes)
+
+    def save_cache(self) -> None:
+        """
+        Grava a cache de arranque com o estado atual das estruturas derivadas.
+        Não faz nada se houver alterações por gravar (a cache tem de corresponder ao ficheiro).
+        """
+        if not self.loaded or self.data_manager.is_dirty():
+            return
+        self.index_cache.save(self.data_manager.fingerprint(), self._cached_indexes)
 
     def add_observer(self, observer):
         """Adiciona um observador (view) para ser notificado de mudanças."""
-        self._observers.append(observer)
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        """Deixa de notificar um observador (ex.: ao mudar de curso)."""
+        if observer in self._observers:
+            self._observers.remove(observer)
 
     def notify_observers(self):
-        """Notifica todos os observadores para atualizarem suas interfaces."""
+        """
+        Notifica todos os observadores para atualizarem suas interfaces.
+        As vistas só podem ser atualizadas na thread principal: numa operação em segundo plano
+        (ver views/task_runner.py), a notificação é feita pela interface quando a operação termina.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
         for observer in self._observers:
             if hasattr(observer, 'refresh_list'):
                 observer.refresh_list()
 
+    def add_index(self, index, cached: bool = False) -> None:
+        """
+        Regista uma estrutura derivada dos dados (estatísticas, índices, caches).
+        A estrutura é construída ao carregar os dados (ou de imediato, se já estiverem
+        carregados) e depois mantida registo a registo.
+
+        Args:
+            index: Objeto com os métodos rebuild, update_student e update_group.
+            cached (bool, optional): Se True, o estado da estrutura (o seu __dict__) é guardado
+                na cache de arranque; não pode referir objetos Student/Group. Predefinição: False.
+        """
+        # Antes de load, a construção fica para _build_indexes (não se constrói duas vezes)
+        if self.loaded:
+            index.rebuild(self.data_manager.students, self.data_manager.groups)
+        self._indexes.append(index)
+        if cached:
+            self._cached_indexes.append(index)
+
+    def _update_indexes(self, student_numbers: Iterable[str] = (), group_ids: Iterable[str] = ()) -> None:
+        """
+        Propaga às estruturas derivadas o estado atual dos registos alterados.
+        Quando a alteração toca uma boa parte dos registos (ex.: uma importação), as estruturas
+        da cache de arranque são reconstruídas de uma vez, em vez de atualizadas registo a registo.
+        """
+        students = self.data_manager.students
+        groups = self.data_manager.groups
+        student_numbers, group_ids = list(student_numbers), list(group_ids)
+        touched = len(student_numbers) + len(group_ids)
+        bulk = touched >= BULK_REBUILD_MIN and touched * BULK_REBUILD_RATIO >= len(students) + len(groups)
+        for index in self._indexes:
+            if bulk and index in self._cached_indexes:
+                index.rebuild(students, groups)
+                continue
+            for number in student_numbers:
+                index.update_student(number, students.get(number))
+            for group_id in group_ids:
+                index.update_group(group_id, groups.get(group_id))
+
+    def _touch(self, student_numbers: Iterable[str] = (), group_ids: Iterable[str] = ()) -> None:
+        """
+        Indica que a operação em curso vai alterar estes registos.
+        Deve ser chamado antes de os alterar, para guardar o seu estado anterior.
+        """
+        self._pending_change.capture(self.data_manager, student_numbers, group_ids)
+
+    def _commit(self, change: Change) -> None:
+        """
+        Conclui uma operação de alteração: atualiza as estruturas derivadas,
+        guarda os dados, publica-a no feed de alterações e no registo de auditoria,
+        regista-a no histórico e notifica as vistas.
+
+        Args:
+            change (Change): Alteração com os registos tocados pela operação.
+        """
+        change.seal(self.data_manager)
+        if not change.touched:
+            return
+        self._update_indexes(list(change.students), list(change.groups))
+        self.data_manager.mark_dirty(change.students, change.groups)
+        self.save_data()
+        self._publish(change)
+        # O histórico guarda milhares de alterações: os argumentos ficam só na forma resumida
+        change.args = summarize_args(change.args)
+        self.history.record(change)
+        self.notify_observers()
+
+    def _rollback(self, change: Change) -> None:
+        """Repõe o estado anterior dos registos tocados por uma operação que falhou."""
+        change.apply(self.data_manager, after=False)
+        self._update_indexes(list(change.students), list(change.groups))
+
     def save_data(self) -> None:
         """Guarda os dados persistentemente."""
         self.data_manager.save_data()
 
+    def _publish(self, change: Change, operation: Optional[str] = None, undo: bool = False) -> None:
+        """
+        Publica no feed de alterações e regista na auditoria uma alteração já gravada
+        (não publica se a gravação falhou).
+        """
+        if not self.data_manager.is_dirty():
+            self.feed.publish(change, operation, self.data_manager.version, undo)
+            self.audit.record(change, operation, undo)
+
+    # --- Feed de alterações ---
+    def read_changes(self, cursor: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """
+        Alterações publicadas depois de um cursor, para sincronização incremental de
+        sistemas externos (ver models/change_feed.py). Inclui as alterações feitas por
+        outras instâncias sobre o mesmo ficheiro.
+
+        Args:
+            cursor (int, optional): Último número de sequência já processado. Predefinição: 0.
+            limit (Optional[int], optional): Número máximo de entradas. Predefinição: sem limite.
+
+        Retorna:
+            List[dict]: Entradas por ordem de sequência; o novo cursor é o "seq" da última.
+        """
+        return self.feed.read(cursor, limit)
+
+    def last_change_seq(self) -> int:
+        """Número de sequência da última alteração publicada."""
+        return self.feed.last_seq()
+
+    # --- Auditoria ---
+    def audit_trail(self, student_number: Optional[str] = None, group_id: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[dict]:
+        """
+        Alterações que envolveram um aluno e/ou um grupo (quem as fez, quando e o antes e depois),
+        por ordem cronológica; ver models/audit_log.py.
+
+        Args:
+            student_number (Optional[str], optional): Número do aluno. Predefinição: qualquer.
+            group_id (Optional[str], optional): ID do grupo. Predefinição: qualquer.
+            limit (Optional[int], optional): Número máximo de entradas (as mais recentes). Predefinição: sem limite.
+
+        Retorna:
+            List[dict]: Entradas do registo de auditoria.
+        """
+        return self.audit.query(student_number, group_id, limit)
+
+    def _apply_external_changes(self) -> bool:
+        """Integra as alterações do ficheiro e atualiza as estruturas derivadas."""
+        changed_students, changed_groups = self.data_manager.reload_changes()
+        self._update_indexes(changed_students, changed_groups)
+        return bool(changed_students or changed_groups)
+
+    def sync_external_changes(self) -> bool:
+        """
+        Integra alterações gravadas por outras instâncias no mesmo ficheiro.
+        Só lê o ficheiro se a data de modificação/tamanho mudaram e só notifica as vistas
+        se algum registo foi efetivamente alterado.
+
+        Retorna:
+            bool: True se foram integradas alterações.
+        """
+        if not self.loaded or not self.data_manager.has_external_changes():
+            return False
+        if self._apply_external_changes():
+            self.notify_observers()
+            return True
+        return False
+
+    # --- Anular / Refazer ---
+    def can_undo(self) -> bool:
+        """Indica se há alguma alteração para anular."""
+        return self.history.can_undo()
+
+    def can_redo(self) -> bool:
+        """Indica se há alguma alteração anulada para refazer."""
+        return self.history.can_redo()
+
+    def undo(self) -> Change:
+        """
+        Anula a última alteração, repondo o estado anterior dos registos tocados.
+
+        Retorna:
+            Change: A alteração anulada.
+
+        Lança:
+            ValueError: Se não houver nada para anular ou se os registos já foram alterados
+                por outra instância (nesse caso o histórico é descartado).
+        """
+        return self._replay(undo=True)
+
+    def redo(self) -> Change:
+        """
+        Refaz a última alteração anulada.
+
+        Retorna:
+            Change: A alteração refeita.
+
+        Lança:
+            ValueError: Se não houver nada para refazer ou se os dados mudaram entretanto.
+        """
+        return self._replay(undo=False)
+
+    def _replay(self, undo: bool) -> Change:
+        """Aplica as imagens anteriores (anular) ou posteriores (refazer) de uma alteração."""
+        with self.data_manager.lock:
+            self.sync_external_changes()
+            change = self.history.peek_undo() if undo else self.history.peek_redo()
+            if change is None:
+                raise ValueError("Não há alterações para anular." if undo else "Não há alterações para refazer.")
+
+            # Só é seguro repor as imagens se os registos estão como a alteração os deixou
+            if not change.matches(self.data_manager, after=undo):
+                self.history.clear()
+                raise ValueError("Os dados foram alterados entretanto; o histórico de alterações foi limpo.")
+
+            change.apply(self.data_manager, after=not undo)
+            self._update_indexes(list(change.students), list(change.groups))
+            self.data_manager.mark_dirty(change.students, change.groups)
+            try:
+                self.save_data()
+            except DataConflictError:
+                self._apply_external_changes()
+                self.notify_observers()
+                raise
+            self._publish(change, ("undo_" if undo else "redo_") + change.operation, undo)
+            if undo:
+                self.history.mark_undone()
+            else:
+                self.history.mark_redone()
+            self.notify_observers()
+            return change
+
+    # --- Consistência ---
+    @property
+    def consistency(self) -> ConsistencyReport:
+        """Resultado da última verificação das referências entre alunos e grupos."""
+        return self.integrity.report
+
+    def check_consistency(self) -> ConsistencyReport:
+        """
+        Verifica as referências entre alunos e grupos (ver models/consistency.py), sem alterar nada.
+
+        Retorna:
+            ConsistencyReport: Inconsistências encontradas (também em self.consistency).
+        """
+        self.integrity.rebuild(self.data_manager.students, self.data_manager.groups)
+        return self.integrity.report
+
+    @mutation
+    def repair_consistency(self) -> ConsistencyReport:
+        """
+        Repara as referências inconsistentes entre alunos e grupos, numa única alteração
+        (uma gravação e um passo de anular). Os grupos acima da capacidade máxima não são
+        corrigidos: continuam no relatório seguinte, em self.consistency.
+
+        Retorna:
+            ConsistencyReport: Inconsistências encontradas antes da reparação.
+        """
+        students = self.data_manager.students
+        groups = self.data_manager.groups
+        report = check_consistency(students, groups)
+        if report.students or report.groups:
+            self._touch(student_numbers=report.students, group_ids=report.groups)
+            repair_references(students, groups, report)
+        self.integrity.rebuild(students, groups)
+        return report
+
+    # --- Instantâneos ---
+    def take_snapshot(self, label: str) -> Snapshot:
+        """
+        Congela o estado atual dos alunos e grupos com um nome (ex.: "Início do projeto").
+        A criação é O(1): o instantâneo partilha a estrutura com os dados atuais.
+
+        Lança:
+            ValueError: Se o nome estiver vazio ou já existir.
+        """
+        with self.data_manager.lock:
+            self.sync_external_changes()
+            return self.snapshots.take(label)
+
+    def list_snapshots(self) -> List[Snapshot]:
+        """Instantâneos existentes, pela ordem de criação."""
+        return self.snapshots.all()
+
+    def diff_snapshots(self, old_label: Optional[str], new_label: Optional[str] = None) -> SnapshotDiff:
+        """
+        Compara dois instantâneos (None representa o estado atual).
+
+        Lança:
+            ValueError: Se algum instantâneo não existir.
+        """
+        return self.snapshots.diff(old_label, new_label)
+
     def _normalize(self, text: str) -> str:
         """Normaliza texto para pesquisa (lowercase e sem acentos)."""
-        if not text:
-            return ""
-        return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII').lower()
+        return normalize_text(text)
 
     # --- Gestão de Alunos ---
+    @mutation
     def create_student(self, student_number: str, name: str, email: str) -> Student:
         """
         Cria um novo aluno validando todas as regras de negócio.
@@ -57,41 +496,86 @@ class MainController:
             ValueError: Se os dados forem inválidos.
         """
         # Validação: Número de estudante deve conter apenas dígitos
-        if not student_number.isdigit():
-            raise ValueError("Número de estudante deve conter apenas dígitos.")
+        check_student_number(student_number)
         
         # Validação: Número de estudante deve ser único
         if student_number in self.data_manager.students:
             raise ValueError("Número de estudante já registado.")
 
-        # Validação: Campos obrigatórios não podem estar vazios
-        if not name or not email or not student_number:
-            raise ValueError("Todos os campos são obrigatórios.")
-        
-        # Validação: O domínio do email deve ser institucional
-        if not (email.endswith("@my.istec.pt") or email.endswith("@istec.pt")):
-            raise ValueError("O email do aluno deve ser do domínio @my.istec.pt ou @istec.pt")
+        # Validação: Campos obrigatórios e domínio institucional do email
+        check_student_contact(name, email)
         
         # Validação: O email deve ser único no sistema
-        for s in self.data_manager.students.values():
-            if s.email.lower() == email.lower():
-                 raise ValueError("Email já registado no sistema.")
+        if self.lookups.students_with_email(email):
+            raise ValueError("Email já registado no sistema.")
 
-        # Validação: O nome deve ter um comprimento mínimo
-        if len(name) < 3:
-            raise ValueError("O nome deve ter pelo menos 3 caracteres.")
-        
-        # Validação: O nome não pode conter dígitos numéricos
-        if any(char.isdigit() for char in name):
-            raise ValueError("O nome não pode conter números.")
+        # Validação: Comprimento mínimo do nome, sem dígitos
+        check_student_name(name)
 
         # Criação e armazenamento do aluno
-        student = Student(student_number, name, email)
-        self.data_manager.students[student_number] = student
-        self.save_data()
-        self.notify_observers()
+        student = self.data_manager.intern_student(Student(student_number, name, email))
+        self._touch(student_numbers=[student_number])
+        self.data_manager.students[student.student_number] = student
         return student
 
+    @mutation
+    def import_students(self, rows: List[ImportRow], dry_run: bool = False,
+                        issues: Optional[Dict[int, RowIssues]] = None) -> List[RowError]:
+        """
+        Cria de uma só vez os alunos de uma importação (uma gravação e um passo de anular).
+
+        As linhas chegam já normalizadas, com o formato do número validado e, em issues, os erros
+        dos campos e do nome de cada aluno (calculados em paralelo, ver ImportController); aqui,
+        num só passo e sob o bloqueio dos dados, verifica-se apenas a unicidade dos números e dos
+        emails, tanto em relação aos alunos existentes como entre as próprias linhas (a primeira
+        ocorrência é aceite). Cada linha rejeitada fica com a mensagem que create_student daria:
+        unicidade do número, campos, unicidade do email e, por fim, o nome.
+
+        Args:
+            rows (List[ImportRow]): Linhas (linha, número, nome, email, data de criação), pela ordem do ficheiro.
+            dry_run (bool, optional): Apenas verificar, sem criar os alunos. Predefinição: False.
+            issues (Optional[Dict[int, RowIssues]], optional): Erros dos campos e do nome por linha
+                (só as linhas com erros). Predefinição: calculados aqui, linha a linha.
+
+        Retorna:
+            List[RowError]: Linhas rejeitadas, como (linha, mensagem).
+        """
+        students = self.data_manager.students
+        seen_numbers: Dict[str, int] = {}
+        seen_emails: Dict[str, int] = {}
+        accepted: List[ImportRow] = []
+        rejected: List[RowError] = []
+        for row in rows:
+            line, student_number, name, email, _ = row
+            contact_error, name_error = ((issues.get(line) if issues is not None else student_row_issues(name, email))
+                                         or (None, None))
+            email_key = email.lower()
+            if student_number in students:
+                rejected.append((line, "Número de estudante já registado."))
+            elif student_number in seen_numbers:
+                rejected.append((line, f"Número de estudante repetido (linha {seen_numbers[student_number]})."))
+            elif contact_error is not None:
+                rejected.append((line, contact_error))
+            elif self.lookups.students_with_email(email):
+                rejected.append((line, "Email já registado no sistema."))
+            elif email_key in seen_emails:
+                rejected.append((line, f"Email repetido (linha {seen_emails[email_key]})."))
+            elif name_error is not None:
+                rejected.append((line, name_error))
+            else:
+                seen_numbers[student_number] = line
+                seen_emails[email_key] = line
+                accepted.append(row)
+
+        if dry_run or not accepted:
+            return rejected
+        self._touch(student_numbers=[row[1] for row in accepted])
+        intern = self.data_manager.intern_student
+        for _, student_number, name, email, creation_date in accepted:
+            students[student_number] = intern(Student(student_number, name, email, creation_date))
+        return rejected
+
+    @mutation
     def update_student(self, student_number: str, name: str, email: str) -> Student:
         """
         Atualiza os dados de um aluno existente.
@@ -99,32 +583,24 @@ class MainController:
         if student_number not in self.data_manager.students:
              raise ValueError("Aluno não encontrado.")
 
-        if not name or not email:
-            raise ValueError("Todos os campos são obrigatórios.")
-
-        # Validação de domínio de email
-        if not (email.endswith("@my.istec.pt") or email.endswith("@istec.pt")):
-            raise ValueError("O email do aluno deve ser do domínio @my.istec.pt ou @istec.pt")
+        # Validação dos campos e do domínio do email
+        check_student_contact(name, email)
         
         # Validação de unicidade de email (excluindo o próprio aluno)
-        for s in self.data_manager.students.values():
-            if s.email.lower() == email.lower() and s.student_number != student_number:
-                 raise ValueError("Email já registado no sistema.")
+        if self.lookups.students_with_email(email) - {student_number}:
+            raise ValueError("Email já registado no sistema.")
 
         # Validação do nome
-        if len(name) < 3:
-            raise ValueError("O nome deve ter pelo menos 3 caracteres.")
-        if any(char.isdigit() for char in name):
-            raise ValueError("O nome não pode conter números.")
+        check_student_name(name)
 
         # Atualização dos dados
         student = self.data_manager.students[student_number]
+        self._touch(student_numbers=[student_number])
         student.name = name
         student.email = email
-        self.save_data()
-        self.notify_observers()
         return student
 
+    @mutation
     def delete_student(self, student_number: str) -> None:
         """
         Remove um aluno do sistema.
@@ -134,17 +610,25 @@ class MainController:
             raise ValueError("Aluno não encontrado.")
         
         student = self.data_manager.students[student_number]
+        waiting_group_id = self.lookups.waiting_group(student_number)
+        self._touch(student_numbers=[student_number], group_ids=[student.group_id, waiting_group_id])
         
         # Se pertencer a um grupo, remover a referência no grupo
         if student.group_id:
             group = self.data_manager.groups.get(student.group_id)
             if group:
                 group.remove_student(student_number)
+
+        # Se estiver numa lista de espera, sair dela
+        waiting_group = self.data_manager.groups.get(waiting_group_id) if waiting_group_id else None
+        if waiting_group:
+            waiting_group.leave_waitlist(student_number)
         
         # Remover do dicionário global de alunos
         del self.data_manager.students[student_number]
-        self.save_data()
-        self.notify_observers()
+
+        # A vaga libertada é ocupada pela lista de espera
+        self._promote_waiting([student.group_id])
 
     def get_all_students(self) -> List[Student]:
         """Retorna uma lista de todos os alunos."""
@@ -152,20 +636,122 @@ class MainController:
 
     def search_students(self, query: str) -> List[Student]:
         """Pesquisa alunos por nome, número ou email (case insensitive)."""
-        normalized_query = self._normalize(query)
-        results = []
-        for student in self.data_manager.students.values():
-            if (normalized_query in self._normalize(student.name) or 
-                normalized_query in str(student.student_number) or 
-                normalized_query in self._normalize(student.email)):
-                results.append(student)
-        return results
+        students = self.data_manager.students
+        return [students[n] for n in self.lookups.search_students(self._normalize(query))]
+
+    def search_students_fuzzy(self, query: str, limit: int = 50) -> List[Student]:
+        """
+        Pesquisa aproximada (tolerante a erros de escrita) por nome, email ou número.
+        Usa o índice de trigramas; os resultados vêm do mais para o menos parecido.
+
+        Args:
+            query (str): Texto a pesquisar.
+            limit (int, optional): Número máximo de resultados. Predefinição: 50.
+        """
+        students = self.data_manager.students
+        return [students[n] for n, _ in self.fuzzy_index.search(query, limit) if n in students]
 
     def get_student(self, student_number: str) -> Optional[Student]:
         """Obtém um objeto aluno específico."""
         return self.data_manager.students.get(student_number)
 
+    def get_sorted_students(self, column: str, descending: bool = False, students: Optional[List[Student]] = None) -> List[Student]:
+        """
+        Retorna alunos ordenados por uma coluna da tabela, usando as chaves em cache.
+
+        Args:
+            column (str): "number", "name", "email", "group" ou "creationDate".
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+            students (Optional[List[Student]], optional): Subconjunto a ordenar (ex.: pesquisa).
+                Predefinição: todos os alunos.
+        """
+        if students is None:
+            numbers = self.student_sort.sorted_ids(column, descending)
+        else:
+            numbers = self.student_sort.sort_ids((s.student_number for s in students), column, descending)
+        all_students = self.data_manager.students
+        return [all_students[n] for n in numbers if n in all_students]
+
+    def query_students(self, filters: Optional[Dict[str, Any]] = None, sort: str = "number", descending: bool = False,
+                       offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
+        """
+        Consulta paginada de alunos: aplica os filtros, ordena por uma coluna e devolve
+        apenas uma página, com o total de resultados. Os filtros são executados por um
+        plano que parte do índice mais seletivo (ver plan_query) e a página é recortada
+        das ordenações em cache, pelo que pedir uma página não percorre nem ordena a
+        lista completa.
+
+        Filtros (combinados com "e"; um valor None ou vazio é ignorado):
+            "text" (str): Nome, número ou email contém o texto (como search_students).
+            "group_id" (str): Membros do grupo.
+            "without_group" (bool): True = apenas alunos sem grupo; False = apenas com grupo.
+            "domain" (str): Domínio do email (ex.: "my.istec.pt").
+            "created_from" / "created_to" (str): Data de criação entre estas datas (dd/mm/aaaa, inclusive).
+
+        Args:
+            filters (Optional[Dict[str, Any]], optional): Filtros. Predefinição: nenhum.
+            sort (str, optional): "number", "name", "email", "group" ou "creationDate".
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+            offset (int, optional): Alunos a saltar (depois do cursor, se existir). Predefinição: 0.
+            limit (Optional[int], optional): Tamanho da página. Predefinição: sem limite.
+            cursor (Optional[str], optional): next_cursor da página anterior (paginação por chave,
+                estável mesmo que sejam criados ou removidos alunos entre pedidos).
+
+        Retorna:
+            Page: Alunos da página, total e cursor da página seguinte.
+
+        Lança:
+            ValueError: Se um filtro, a coluna, o offset, o limite ou o cursor forem inválidos.
+        """
+        candidates = plan_query(self._student_terms(filters)).execute(self.data_manager.students)
+        return self._query_page(self.student_sort, self.data_manager.students, candidates, sort, descending, offset, limit, cursor)
+
+    def explain_student_query(self, filters: Dict[str, Any]) -> List[str]:
+        """Descreve o plano escolhido para os filtros de query_students (para diagnóstico)."""
+        return plan_query(self._student_terms(filters)).describe()
+
+    def _student_terms(self, filters: Optional[Dict[str, Any]]) -> List[FilterTerm]:
+        """Converte os filtros de query_students em condições para o planeador."""
+        students = self.data_manager.students
+        terms: List[FilterTerm] = []
+        date_from = date_to = None
+        for name, value in (filters or {}).items():
+            if value is None or value == "":
+                continue
+            if name == "text":
+                query = self._normalize(str(value).strip())
+                if query:
+                    terms.append(FilterTerm(f"text~{query}", lambda n, q=query: self.lookups.student_matches(n, q)))
+            elif name == "group_id":
+                group = self.data_manager.groups.get(value)
+                members = group.student_ids if group else []
+                terms.append(FilterTerm(f"group_id={value}", lambda n, g=value: students[n].group_id == g,
+                                        lambda m=members: m, len(members)))
+            elif name == "without_group":
+                unassigned = self.statistics.unassigned_count
+                if value:
+                    terms.append(FilterTerm("without_group", lambda n: not students[n].group_id,
+                                            self.lookups.unassigned_students, unassigned))
+                else:
+                    terms.append(FilterTerm("with_group", lambda n: bool(students[n].group_id),
+                                            estimate=self.statistics.student_count - unassigned))
+            elif name == "domain":
+                domain = str(value).strip().lower().lstrip("@")
+                numbers = self.lookups.students_with_domain(domain)
+                terms.append(FilterTerm(f"domain={domain}", numbers.__contains__, lambda m=numbers: m, len(numbers)))
+            elif name == "created_from":
+                date_from = parse_filter_date(value)
+            elif name == "created_to":
+                date_to = parse_filter_date(value, end_of_day=True)
+            else:
+                raise ValueError(f"Filtro desconhecido: {name}.")
+        if date_from is not None or date_to is not None:
+            terms.append(self._date_term(date_from, date_to, lambda n: students[n].created_at,
+                                         self.creation_dates.students_between, self.creation_dates.count_students_between))
+        return terms
+
     # --- Gestão de Grupos ---
+    @mutation
     def create_group(self, name: str, max_capacity: str, min_capacity: str = "2") -> Group:
         """
         Cria um novo grupo com validações de capacidade e nome.
@@ -175,9 +761,8 @@ class MainController:
             raise ValueError("O nome do grupo deve conter apenas caracteres alfanuméricos e espaços.")
 
         # Validação: Nome deve ser único
-        for group in self.data_manager.groups.values():
-            if group.name.lower() == name.lower():
-                raise ValueError("Nome de grupo já existe.")
+        if self.lookups.groups_with_name(name):
+            raise ValueError("Nome de grupo já existe.")
         
         try:
             # Conversão e validação das capacidades
@@ -200,12 +785,12 @@ class MainController:
 
         # Gera ID único e cria o grupo
         group_id = str(uuid.uuid4())
-        group = Group(group_id, name, max_cap, min_cap)
-        self.data_manager.groups[group_id] = group
-        self.save_data()
-        self.notify_observers()
+        group = self.data_manager.intern_group(Group(group_id, name, max_cap, min_cap))
+        self._touch(group_ids=[group_id])
+        self.data_manager.groups[group.group_id] = group
         return group
 
+    @mutation
     def update_group(self, group_id: str, name: str, max_capacity: str, min_capacity: str) -> Group:
         """
         Atualiza dados do grupo, garantindo que a nova capacidade acomoda os membros atuais.
@@ -219,9 +804,8 @@ class MainController:
             raise ValueError("O nome do grupo deve conter apenas caracteres alfanuméricos e espaços.")
 
         # Verifica unicidade do nome, ignorando o próprio grupo
-        for g in self.data_manager.groups.values():
-            if g.name.lower() == name.lower() and g.group_id != group_id:
-                raise ValueError("Nome de grupo já existe.")
+        if self.lookups.groups_with_name(name) - {group_id}:
+            raise ValueError("Nome de grupo já existe.")
         
         try:
             max_cap = int(max_capacity)
@@ -244,13 +828,16 @@ class MainController:
                 raise e
             raise ValueError("Capacidades devem ser números inteiros.")
 
+        self._touch(group_ids=[group_id])
         group.name = name
         group.max_capacity = max_cap
         group.min_capacity = min_cap
-        self.save_data()
-        self.notify_observers()
+
+        # Um aumento da capacidade máxima abre vagas para a lista de espera
+        self._promote_waiting([group_id])
         return group
 
+    @mutation
     def delete_group(self, group_id: str) -> None:
         """
         Remove um grupo e atualiza os alunos desse grupo para ficarem sem grupo.
@@ -259,6 +846,7 @@ class MainController:
             raise ValueError("Grupo não encontrado.")
         
         group = self.data_manager.groups[group_id]
+        self._touch(student_numbers=group.student_ids, group_ids=[group_id])
         
         # Remove a referência de grupo de todos os alunos membros
         for s_num in group.student_ids:
@@ -267,24 +855,150 @@ class MainController:
                 student.group_id = None
         
         del self.data_manager.groups[group_id]
-        self.save_data()
-        self.notify_observers()
 
     def get_all_groups(self) -> List[Group]:
         return list(self.data_manager.groups.values())
 
     def search_groups(self, query: str) -> List[Group]:
-        normalized_query = self._normalize(query)
-        results = []
-        for group in self.data_manager.groups.values():
-            if normalized_query in self._normalize(group.name):
-                results.append(group)
-        return results
+        groups = self.data_manager.groups
+        return [groups[g] for g in self.lookups.search_groups(self._normalize(query))]
 
     def get_group(self, group_id: str) -> Optional[Group]:
         return self.data_manager.groups.get(group_id)
 
+    def get_sorted_groups(self, column: str, descending: bool = False, groups: Optional[List[Group]] = None) -> List[Group]:
+        """
+        Retorna grupos ordenados por uma coluna da tabela, usando as chaves em cache.
+
+        Args:
+            column (str): "name", "capacity" ou "count".
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+            groups (Optional[List[Group]], optional): Subconjunto a ordenar. Predefinição: todos.
+        """
+        if groups is None:
+            group_ids = self.group_sort.sorted_ids(column, descending)
+        else:
+            group_ids = self.group_sort.sort_ids((g.group_id for g in groups), column, descending)
+        all_groups = self.data_manager.groups
+        return [all_groups[g] for g in group_ids if g in all_groups]
+
+    def query_groups(self, filters: Optional[Dict[str, Any]] = None, sort: str = "name", descending: bool = False,
+                     offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
+        """
+        Consulta paginada de grupos (ver query_students).
+
+        Filtros (combinados com "e"; um valor None ou vazio é ignorado):
+            "text" (str): Nome contém o texto (como search_groups).
+            "has_vacancy" (bool): True = apenas grupos com vagas; False = apenas grupos cheios.
+            "full" (bool): True = apenas grupos com a capacidade máxima atingida; False = com vagas.
+            "under_min" (bool): True = apenas grupos abaixo da capacidade mínima; False = os restantes.
+            "min_members" / "max_members" (int): Número de membros entre estes valores (inclusive).
+            "created_from" / "created_to" (str): Data de criação entre estas datas (dd/mm/aaaa, inclusive).
+
+        Args:
+            filters (Optional[Dict[str, Any]], optional): Filtros. Predefinição: nenhum.
+            sort (str, optional): "name", "capacity" ou "count".
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+            offset (int, optional): Grupos a saltar. Predefinição: 0.
+            limit (Optional[int], optional): Tamanho da página. Predefinição: sem limite.
+            cursor (Optional[str], optional): next_cursor da página anterior.
+
+        Retorna:
+            Page: Grupos da página, total e cursor da página seguinte.
+
+        Lança:
+            ValueError: Se um filtro, a coluna, o offset, o limite ou o cursor forem inválidos.
+        """
+        candidates = plan_query(self._group_terms(filters)).execute(self.data_manager.groups)
+        return self._query_page(self.group_sort, self.data_manager.groups, candidates, sort, descending, offset, limit, cursor)
+
+    def explain_group_query(self, filters: Dict[str, Any]) -> List[str]:
+        """Descreve o plano escolhido para os filtros de query_groups (para diagnóstico)."""
+        return plan_query(self._group_terms(filters)).describe()
+
+    def _group_terms(self, filters: Optional[Dict[str, Any]]) -> List[FilterTerm]:
+        """Converte os filtros de query_groups em condições para o planeador."""
+        groups = self.data_manager.groups
+        stats = self.statistics
+        terms: List[FilterTerm] = []
+        date_from = date_to = None
+        min_members, max_members = 0, None
+        for name, value in (filters or {}).items():
+            if value is None or value == "":
+                continue
+            if name == "text":
+                query = self._normalize(str(value).strip())
+                if query:
+                    terms.append(FilterTerm(f"text~{query}", lambda g, q=query: self.lookups.group_matches(g, q)))
+            elif name in ("has_vacancy", "full"):
+                full = stats.full_groups
+                if (name == "full") == bool(value):
+                    terms.append(FilterTerm("full", full.__contains__, lambda: full, len(full)))
+                else:
+                    terms.append(FilterTerm("has_vacancy", lambda g: g not in full, estimate=stats.group_count - len(full)))
+            elif name == "under_min":
+                under = stats.under_min_groups
+                if value:
+                    terms.append(FilterTerm("under_min", under.__contains__, lambda: under, len(under)))
+                else:
+                    terms.append(FilterTerm("min_reached", lambda g: g not in under, estimate=stats.group_count - len(under)))
+            elif name in ("min_members", "max_members"):
+                try:
+                    count = int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"O filtro {name} deve ser um número inteiro.")
+                if name == "min_members":
+                    min_members = count
+                else:
+                    max_members = count
+            elif name == "created_from":
+                date_from = parse_filter_date(value)
+            elif name == "created_to":
+                date_to = parse_filter_date(value, end_of_day=True)
+            else:
+                raise ValueError(f"Filtro desconhecido: {name}.")
+        if min_members > 0 or max_members is not None:
+            high = max_members if max_members is not None else float('inf')
+            # A distribuição de tamanhos dá o número exato de grupos no intervalo (sem os percorrer)
+            estimate = sum(count for size, count in stats.size_distribution.items() if min_members <= size <= high)
+            terms.append(FilterTerm("members", lambda g: min_members <= groups[g].current_size() <= high, estimate=estimate))
+        if date_from is not None or date_to is not None:
+            terms.append(self._date_term(date_from, date_to, lambda g: groups[g].created_at,
+                                         self.creation_dates.groups_between, self.creation_dates.count_groups_between))
+        return terms
+
+    @staticmethod
+    def _date_term(date_from: Optional[int], date_to: Optional[int], created_at, between, count_between) -> FilterTerm:
+        """Condição "criado entre date_from e date_to", servida pelo índice de datas de criação."""
+        low = date_from if date_from is not None else -2 ** 63
+        high = date_to if date_to is not None else 2 ** 63
+        if low > high:
+            raise ValueError("A data inicial é posterior à data final.")
+        return FilterTerm("creation_date", lambda row_id: low <= created_at(row_id) <= high,
+                          lambda: between(low, high), count_between(low, high))
+
+    def _query_page(self, sort_index, records: Dict[str, Any], candidates: Optional[Set[str]], sort: str,
+                    descending: bool, offset: int, limit: Optional[int], cursor: Optional[str]) -> Page:
+        """Recorta uma página de uma ordenação em cache (comum a query_students e query_groups)."""
+        if sort not in sort_index.columns:
+            raise ValueError(f"Coluna de ordenação desconhecida: {sort}.")
+        if offset < 0:
+            raise ValueError("O offset não pode ser negativo.")
+        if limit is not None and limit <= 0:
+            raise ValueError("O limite deve ser maior que zero.")
+        after = decode_cursor(cursor, sort, descending) if cursor else None
+
+        # Pede mais um registo para saber se existe página seguinte
+        entries = sort_index.page(sort, descending, offset, limit + 1 if limit is not None else None, after, candidates)
+        next_cursor = None
+        if limit is not None and len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(sort, descending, entries[-1])
+        total = len(candidates) if candidates is not None else len(records)
+        return Page([records[row_id] for _, row_id in entries], total, next_cursor)
+
     # --- Gestão de Associações (Alunos <-> Grupos) ---
+    @mutation
     def add_student_to_group(self, student_number: str, group_id: str) -> None:
         """
         Adiciona um aluno a um grupo se houver vaga e o aluno não tiver grupo.
@@ -305,11 +1019,12 @@ class MainController:
         if not group.has_vacancy():
             raise ValueError("Grupo cheio.")
 
+        self._touch(student_numbers=[student_number], group_ids=[group_id])
         if group.add_student(student.student_number):
             student.group_id = group.group_id
-            self.save_data()
-            self.notify_observers()
+        group.leave_waitlist(student_number)
 
+    @mutation
     def remove_student_from_group(self, student_number: str, group_id: str) -> None:
         """
         Remove um aluno de um grupo, validando a regra de capacidade mínima.
@@ -328,15 +1043,19 @@ class MainController:
         if group.current_size() - 1 < group.min_capacity and group.current_size() > 0:
              raise ValueError(f"Não é permitido remover aluno. O grupo ficaria com menos de {group.min_capacity} elementos.")
 
+        self._touch(student_numbers=[student_number], group_ids=[group_id])
         if group.remove_student(student_number):
             student.group_id = None
-            self.save_data()
-            self.notify_observers()
+
+        # A vaga libertada é ocupada pela lista de espera
+        self._promote_waiting([group_id])
 
     def get_students_without_group(self) -> List[Student]:
         """Retorna apenas os alunos que ainda não têm grupo."""
-        return [s for s in self.data_manager.students.values() if not s.group_id]
+        students = self.data_manager.students
+        return [students[n] for n in self.lookups.unassigned_students()]
 
+    @mutation
     def transfer_student(self, student_number: str, new_group_id: str) -> None:
         """
         Transfere um aluno do grupo atual para um novo grupo.
@@ -357,6 +1076,8 @@ class MainController:
              raise ValueError("Grupo de destino cheio.")
 
         # Se o aluno já tem grupo, tenta remover (verificando regra de mínimo)
+        old_group_id = student.group_id
+        self._touch(student_numbers=[student_number], group_ids=[new_group_id, old_group_id])
         if student.group_id:
             current_group = self.data_manager.groups.get(student.group_id)
             if current_group:
@@ -367,7 +1088,187 @@ class MainController:
                  current_group.remove_student(student_number)
         
         # Adiciona ao novo grupo
-        new_group.add_student(student_number)
-        student.group_id = new_group_id
-        self.save_data()
-        self.notify_observers()
+        new_group.add_student(student.student_number)
+        new_group.leave_waitlist(student_number)
+        student.group_id = new_group.group_id
+
+        # A vaga libertada no grupo antigo é ocupada pela lista de espera
+        self._promote_waiting([old_group_id])
+
+    # --- Atribuição por Preferências ---
+    @mutation
+    def set_student_preferences(self, student_number: str, group_ids: List[str]) -> Student:
+        """
+        Define os grupos preferidos de um aluno, do mais para o menos desejado.
+        Preferências por grupos entretanto eliminados são ignoradas na atribuição.
+
+        Args:
+            student_number (str): Número do aluno.
+            group_ids (List[str]): IDs dos grupos, por ordem de preferência (lista vazia apaga).
+
+        Retorna:
+            Student: O aluno atualizado.
+
+        Lança:
+            ValueError: Se o aluno ou algum grupo não existir, houver grupos repetidos ou demasiados.
+        """
+        student = self.data_manager.students.get(student_number)
+        if not student:
+            raise ValueError("Aluno não encontrado.")
+        if len(group_ids) > MAX_PREFERENCES:
+            raise ValueError(f"Só é possível indicar até {MAX_PREFERENCES} grupos preferidos.")
+        if len(set(group_ids)) != len(group_ids):
+            raise ValueError("As preferências não podem repetir grupos.")
+        if any(group_id not in self.data_manager.groups for group_id in group_ids):
+            raise ValueError("Grupo não encontrado.")
+
+        self._touch(student_numbers=[student_number])
+        student.preferences = [self.data_manager.group_ids.canonical(g) for g in group_ids]
+        return student
+
+    def get_student_preferences(self, student_number: str) -> List[Group]:
+        """Grupos preferidos de um aluno (que ainda existem), por ordem de preferência."""
+        student = self.data_manager.students.get(student_number)
+        if not student:
+            return []
+        groups = self.data_manager.groups
+        return [groups[g] for g in student.preferences if g in groups]
+
+    def preview_preference_assignment(self, seed: Optional[int] = None, fill_minimum: bool = True) -> MatchingResult:
+        """
+        Calcula (sem aplicar) a atribuição dos alunos sem grupo segundo as suas preferências.
+        Ver models/matching.py (aceitação diferida com capacidades e sorteio para desempates).
+        """
+        return match_students(self.data_manager.students, self.data_manager.groups, seed, fill_minimum)
+
+    @mutation
+    def assign_by_preferences(self, seed: Optional[int] = None, fill_minimum: bool = True) -> MatchingResult:
+        """
+        Atribui os alunos sem grupo aos grupos segundo as suas preferências, respeitando
+        as capacidades máxima e mínima. Todas as colocações são aplicadas como uma única
+        alteração (uma gravação e um passo de anular).
+
+        Args:
+            seed (Optional[int], optional): Semente do sorteio de desempate. Predefinição: aleatória.
+            fill_minimum (bool, optional): Completar grupos abaixo do mínimo com alunos sem
+                preferência satisfeita. Predefinição: True.
+
+        Retorna:
+            MatchingResult: Atribuições e estatísticas de satisfação.
+        """
+        result = match_students(self.data_manager.students, self.data_manager.groups, seed, fill_minimum)
+        students = self.data_manager.students
+        groups = self.data_manager.groups
+        self._touch(student_numbers=list(result.assignments), group_ids=set(result.assignments.values()))
+        for student_number, group_id in result.assignments.items():
+            groups[group_id].add_student(student_number)
+            students[student_number].group_id = group_id
+        return result
+
+    # --- Listas de Espera ---
+    @mutation
+    def join_waitlist(self, student_number: str, group_id: str, priority: str = "0") -> None:
+        """
+        Inscreve um aluno na lista de espera de um grupo cheio.
+        Quando abrir uma vaga, o aluno com maior prioridade (em caso de empate, o pedido
+        mais antigo) entra automaticamente no grupo. Um aluno que já tem grupo pode
+        inscrever-se para ser transferido. Cada aluno só pode estar numa lista de espera.
+
+        Args:
+            student_number (str): Número do aluno.
+            group_id (str): ID do grupo.
+            priority (str, optional): Prioridade (número inteiro; maior é atendido primeiro). Predefinição: "0".
+
+        Lança:
+            ValueError: Se os dados forem inválidos, o grupo tiver vagas ou o aluno já estiver em espera.
+        """
+        student = self.data_manager.students.get(student_number)
+        group = self.data_manager.groups.get(group_id)
+
+        if not student:
+            raise ValueError("Aluno não encontrado.")
+        if not group:
+            raise ValueError("Grupo não encontrado.")
+        if student.group_id == group_id:
+            raise ValueError("O aluno já pertence a este grupo.")
+        if group.has_vacancy():
+            raise ValueError("O grupo tem vagas; adicione o aluno diretamente.")
+
+        waiting_group = self.data_manager.groups.get(self.lookups.waiting_group(student_number) or "")
+        if waiting_group:
+            raise ValueError(f"O aluno já está na lista de espera do grupo {waiting_group.name}.")
+
+        try:
+            priority_value = int(priority)
+        except (TypeError, ValueError):
+            raise ValueError("Prioridade deve ser um número inteiro.")
+
+        self._touch(group_ids=[group_id])
+        group.join_waitlist(student.student_number, priority_value)
+
+    @mutation
+    def leave_waitlist(self, student_number: str) -> None:
+        """
+        Retira um aluno da lista de espera em que está inscrito.
+
+        Lança:
+            ValueError: Se o aluno não estiver em nenhuma lista de espera.
+        """
+        group_id = self.lookups.waiting_group(student_number)
+        group = self.data_manager.groups.get(group_id) if group_id else None
+        if not group:
+            raise ValueError("O aluno não está em nenhuma lista de espera.")
+
+        self._touch(group_ids=[group_id])
+        group.leave_waitlist(student_number)
+
+    def get_waitlist(self, group_id: str) -> List[Student]:
+        """Alunos na lista de espera de um grupo, pela ordem em que serão atendidos."""
+        group = self.data_manager.groups.get(group_id)
+        if not group:
+            return []
+        students = self.data_manager.students
+        return [students[n] for n in group.waiting_students() if n in students]
+
+    def _promote_waiting(self, group_ids: Iterable[Optional[str]]) -> None:
+        """
+        Ocupa as vagas dos grupos indicados com os alunos das respetivas listas de espera.
+        Cada promoção retira o topo da heap, em O(log n). Um aluno promovido que já tinha
+        grupo é transferido (se o grupo antigo não ficar abaixo do mínimo; caso contrário
+        mantém o lugar na lista), o que abre uma vaga no grupo antigo: as promoções seguem
+        em cascata. Corre dentro da operação em curso, pelo que toda a cascata é gravada,
+        anulada e notificada como uma única alteração.
+        """
+        students = self.data_manager.students
+        groups = self.data_manager.groups
+        pending = deque(g for g in group_ids if g)
+        while pending:
+            group_id = pending.popleft()
+            group = groups.get(group_id)
+            if group is None:
+                continue
+
+            deferred = []
+            while group.has_vacancy() and group.waitlist:
+                self._touch(group_ids=[group_id])
+                entry = group.pop_waiting()
+                student_number = entry[2]
+                student = students.get(student_number)
+                # Entradas de alunos removidos ou que já estão no grupo são descartadas
+                if student is None or student.group_id == group_id:
+                    continue
+
+                old_group = groups.get(student.group_id) if student.group_id else None
+                if old_group is not None and old_group.current_size() - 1 < old_group.min_capacity:
+                    deferred.append(entry)
+                    continue
+
+                self._touch(student_numbers=[student_number], group_ids=[student.group_id])
+                if old_group is not None:
+                    old_group.remove_student(student_number)
+                    pending.append(old_group.group_id)
+                group.add_student(student_number)
+                student.group_id = group.group_id
+
+            for priority, requested_at, student_number in deferred:
+                group.join_waitlist(student_number, -priority, requested_at)
@@ -0,0 +1,37 @@
+"""
+Conversão do ficheiro de dados para outro formato (linha de comandos).
+
+Exemplos:
+    python convert.py gzip
+    python convert.py json --data-file outro.json
+    python convert.py lzma --course redes-2025-26
+"""
+import argparse
+import sys
+from controllers.course_controller import CourseController
+from models.data_manager import DataManager
+from models.storage_format import STORAGE_FORMATS
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da conversão por linha de comandos."""
+    parser = argparse.ArgumentParser(description="Converte o ficheiro de dados para outro formato (o formato é detetado ao abrir).")
+    parser.add_argument("format", choices=STORAGE_FORMATS, help="Formato de destino.")
+    parser.add_argument("--data-file", default=None, help="Ficheiro de dados a converter (predefinição: data.json).")
+    parser.add_argument("--course", default=None, help="Identificador do curso a converter (em vez de --data-file).")
+    args = parser.parse_args(argv)
+
+    try:
+        data_file = CourseController().data_file(args.course) if args.course else args.data_file
+        data_manager = DataManager(data_file, storage_format=args.format)
+        # Gravação completa no novo formato (inclui as alterações do diário)
+        data_manager.compact()
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"{data_manager.data_file} convertido para '{args.format}' ({len(data_manager.students)} alunos, {len(data_manager.groups)} grupos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
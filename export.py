@@ -0,0 +1,48 @@
+"""
+Exportação de listas a partir da linha de comandos (sem interface gráfica).
+
+Exemplos:
+    python export.py students alunos.csv
+    python export.py groups grupos.jsonl
+    python export.py reports relatorios/
+    python export.py students alunos.csv --course redes-2025-26
+"""
+import argparse
+import sys
+from controllers.main_controller import MainController
+from controllers.course_controller import CourseController
+from controllers.export_controller import ExportController, EXPORT_KINDS, EXPORT_FORMATS
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da exportação por linha de comandos."""
+    parser = argparse.ArgumentParser(description="Exporta alunos e grupos para CSV ou JSONL.")
+    parser.add_argument("kind", choices=list(EXPORT_KINDS) + ["reports"], help="Tipo de lista a exportar ('reports' cria um CSV por grupo).")
+    parser.add_argument("path", help="Ficheiro de destino (ou pasta, para 'reports').")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None, help="Formato (predefinição: extensão do ficheiro).")
+    parser.add_argument("--data-file", default=None, help="Ficheiro de dados a usar (predefinição: data.json).")
+    parser.add_argument("--course", default=None, help="Identificador do curso a exportar (em vez de --data-file).")
+    args = parser.parse_args(argv)
+
+    try:
+        data_file = CourseController().data_file(args.course) if args.course else args.data_file
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    exporter = ExportController(MainController(data_file))
+    try:
+        if args.kind == "reports":
+            count = exporter.export_group_reports(args.path)
+            print(f"{count} relatórios criados em {args.path}")
+        else:
+            count = exporter.export(args.kind, args.path, args.format)
+            print(f"{count} registos exportados para {args.path}")
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Importação de listas de alunos a partir da linha de comandos (sem interface gráfica).
+
+O ficheiro é validado em paralelo por vários processos; as linhas inválidas ou
+repetidas são indicadas no fim e os restantes alunos são criados numa só alteração.
+
+Exemplos:
+    python import_roster.py alunos.csv
+    python import_roster.py alunos.jsonl --workers 4
+    python import_roster.py alunos.csv --dry-run --course redes-2025-26
+"""
+import argparse
+import sys
+from controllers.main_controller import MainController
+from controllers.course_controller import CourseController
+from controllers.import_controller import ImportController, IMPORT_FORMATS
+
+# Número máximo de linhas rejeitadas mostradas (as restantes são só contadas)
+MAX_ERRORS_SHOWN = 20
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da importação por linha de comandos."""
+    parser = argparse.ArgumentParser(description="Importa alunos de um ficheiro CSV ou JSONL (um aluno por linha).")
+    parser.add_argument("path", help="Ficheiro a importar (CSV com as colunas student_number, name, email e, opcionalmente, creation_date).")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Formato (predefinição: extensão do ficheiro).")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos na validação (predefinição: número de CPUs).")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas verificar o ficheiro, sem criar alunos.")
+    parser.add_argument("--data-file", default=None, help="Ficheiro de dados a usar (predefinição: data.json).")
+    parser.add_argument("--course", default=None, help="Identificador do curso onde importar (em vez de --data-file).")
+    args = parser.parse_args(argv)
+
+    try:
+        data_file = CourseController().data_file(args.course) if args.course else args.data_file
+        report = ImportController(MainController(data_file)).import_file(args.path, args.format, args.workers, args.dry_run)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    for line, message in report.errors[:MAX_ERRORS_SHOWN]:
+        print(f"Linha {line}: {message}", file=sys.stderr)
+    if len(report.errors) > MAX_ERRORS_SHOWN:
+        print(f"... e mais {len(report.errors) - MAX_ERRORS_SHOWN} linhas rejeitadas.", file=sys.stderr)
+    action = "a importar" if args.dry_run else "importados"
+    print(f"{report.imported} de {report.rows} alunos {action} ({len(report.errors)} rejeitados, {report.workers} processos).")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,30 @@
+import multiprocessing
+import queue
+import threading
 import customtkinter as ctk
-from controllers.main_controller import MainController
+from tkinter import messagebox
+from controllers.course_controller import CourseController
+from models.data_manager import DataConflictError
 from views.student_view import StudentView
 from views.group_view import GroupView
+from views.dashboard_view import DashboardView
+from views.task_runner import TaskRunner
 
 # Configuração global da aparência do CustomTkinter
 ctk.set_appearance_mode("Dark")  # Força o modo escuro
 ctk.set_default_color_theme("blue") 
 
+# Intervalo (ms) entre verificações de alterações feitas por outras instâncias
+EXTERNAL_CHANGES_POLL_MS = 2000
+
+# Intervalo (ms) entre verificações de cursos inativos a descarregar da memória
+IDLE_COURSES_CHECK_MS = 60000
+
+# Intervalo (ms) entre leituras dos blocos carregados em segundo plano
+LOAD_POLL_MS = 50
+# Máximo de blocos inseridos nas tabelas por ciclo, para a janela continuar responsiva
+LOAD_CHUNKS_PER_POLL = 4
+
 class App(ctk.CTk):
     """
     Classe principal da aplicação.
@@ -17,39 +35,280 @@ class App(ctk.CTk):
         self.title("Gestor de Grupos de Trabalho")
         self.geometry("900x700")
         
-        # Inicializa o controlador central
-        self.controller = MainController()
+        # Cursos disponíveis; só o curso ativo é carregado, em segundo plano
+        self.courses = CourseController()
+        self.controller = self.courses.open(self.courses.active_id, load=False)
+        self.loading_queue = None
+        # Operações demoradas em segundo plano; no fim das que alteram dados, as vistas são atualizadas
+        self.tasks = TaskRunner(self, on_mutation_done=lambda: self.controller.notify_observers())
 
-        # Cria a interface
+        # Cria a interface (vazia) e começa a carregar os dados
         self.create_widgets()
+        self.start_loading(self.controller)
         
         # Garante que os dados são salvos ao fechar a janela
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        # Atalhos de anular/refazer, ativos em ambas as abas (reencaminhados para a vista ativa)
+        for sequence in ("<Control-z>", "<Control-Z>"):
+            self.bind_all(sequence, self.undo)
+        for sequence in ("<Control-y>", "<Control-Y>"):
+            self.bind_all(sequence, self.redo)
+
+        # Verifica periodicamente se outra instância alterou o ficheiro de dados
+        self.after(EXTERNAL_CHANGES_POLL_MS, self.check_external_changes)
+        self.after(IDLE_COURSES_CHECK_MS, self.unload_idle_courses)
+
     def create_widgets(self):
-        """Cria o sistema de abas e adiciona as vistas."""
+        """Cria o seletor de curso, o sistema de abas e adiciona as vistas."""
+        course_frame = ctk.CTkFrame(self)
+        course_frame.pack(fill="x", padx=20, pady=(20, 0))
+
+        ctk.CTkLabel(course_frame, text="Curso:").pack(side="left", padx=10, pady=10)
+        self.combo_course = ctk.CTkComboBox(course_frame, values=[], width=250, state="readonly", command=self.switch_course)
+        self.combo_course.pack(side="left", padx=5, pady=10)
+        self.button_new_course = ctk.CTkButton(course_frame, text="Novo Curso", command=self.create_course, width=120)
+        self.button_new_course.pack(side="left", padx=10, pady=10)
+        self.button_check = ctk.CTkButton(course_frame, text="Verificar Dados", command=self.check_data, width=120)
+        self.button_check.pack(side="left", padx=10, pady=10)
+        self.refresh_courses()
+
+        # Progresso do carregamento (visível apenas enquanto os dados são carregados)
+        self.progress_label = ctk.CTkLabel(course_frame, text="")
+        self.progress_bar = ctk.CTkProgressBar(course_frame, width=200)
+        self.progress_bar.set(0)
+
         self.tabview = ctk.CTkTabview(self)
         self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
 
         # Adiciona abas
         self.tabview.add("Gerir Alunos")
         self.tabview.add("Gerir Grupos")
+        self.tabview.add("Painel")
         
         # Inicializa a vista de alunos na primeira aba
-        self.student_view = StudentView(self.tabview.tab("Gerir Alunos"), self.controller)
+        self.student_view = StudentView(self.tabview.tab("Gerir Alunos"), self.controller, self.tasks)
         self.student_view.pack(fill="both", expand=True)
         self.controller.add_observer(self.student_view)
 
         # Inicializa a vista de grupos na segunda aba
-        self.group_view = GroupView(self.tabview.tab("Gerir Grupos"), self.controller)
+        self.group_view = GroupView(self.tabview.tab("Gerir Grupos"), self.controller, self.tasks)
         self.group_view.pack(fill="both", expand=True)
         self.controller.add_observer(self.group_view)
 
+        # Painel de estatísticas na terceira aba
+        self.dashboard_view = DashboardView(self.tabview.tab("Painel"), self.controller)
+        self.dashboard_view.pack(fill="both", expand=True)
+        self.controller.add_observer(self.dashboard_view)
+
+    def views(self):
+        """Vistas ligadas ao controlador do curso ativo."""
+        return (self.student_view, self.group_view, self.dashboard_view)
+
+    def refresh_courses(self):
+        """Atualiza a lista de cursos no seletor."""
+        self.course_ids = {name: course_id for course_id, name in self.courses.list_courses()}
+        self.combo_course.configure(values=list(self.course_ids))
+        self.combo_course.set(self.courses.course_name(self.courses.active_id))
+        self.title(f"Gestor de Grupos de Trabalho - {self.courses.course_name(self.courses.active_id)}")
+
+    def switch_course(self, name):
+        """Abre o curso escolhido (carregando-o se necessário) e liga-lhe as vistas."""
+        course_id = self.course_ids.get(name)
+        if course_id is None or course_id == self.courses.active_id:
+            return
+        try:
+            controller = self.courses.open(course_id, load=False)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            self.refresh_courses()
+            return
+
+        for view in self.views():
+            self.controller.remove_observer(view)
+            view.controller = controller
+            controller.add_observer(view)
+        self.controller = controller
+        self.refresh_courses()
+
+        # Pesquisas do curso anterior deixam de fazer sentido
+        self.student_view.clear_search()
+        self.group_view.clear_search()
+        self.dashboard_view.refresh_list()
+
+        # Um curso ainda não carregado é carregado em segundo plano
+        if not controller.loaded:
+            self.start_loading(controller)
+
+    def start_loading(self, controller):
+        """
+        Carrega os dados de um curso numa thread de trabalho.
+        A janela continua responsiva: as tabelas vão sendo preenchidas com os blocos
+        já carregados e a edição fica bloqueada até ao fim.
+        """
+        self.loading_queue = queue.Queue()
+        self.loading_group_names = {}
+        self.loading_counts = {"groups": 0, "students": 0}
+        self.student_view.set_loading(True)
+        self.group_view.set_loading(True)
+        self.combo_course.configure(state="disabled")
+        self.button_new_course.configure(state="disabled")
+        self.button_check.configure(state="disabled")
+
+        self.progress_label.configure(text="A carregar dados...")
+        self.progress_label.pack(side="left", padx=(20, 5), pady=10)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=5, pady=10)
+
+        threading.Thread(target=self.load_worker, args=(controller, self.loading_queue), daemon=True).start()
+        self.after(LOAD_POLL_MS, self.poll_loading)
+
+    @staticmethod
+    def load_worker(controller, results):
+        """Executado na thread de trabalho: não toca na interface, só envia mensagens pela fila."""
+        try:
+            controller.load(lambda kind, items, done, total: results.put(("chunk", kind, items, done, total)))
+            results.put(("done", None))
+        except Exception as e:
+            results.put(("error", str(e)))
+
+    def poll_loading(self):
+        """Mostra os blocos carregados entretanto e, no fim, desbloqueia a edição."""
+        for _ in range(LOAD_CHUNKS_PER_POLL):
+            try:
+                message = self.loading_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if message[0] != "chunk":
+                self.finish_loading(message[1] if message[0] == "error" else None)
+                return
+
+            _, kind, items, done, total = message
+            self.loading_counts[kind] += len(items)
+            if kind == "groups":
+                self.loading_group_names.update((g.group_id, g.name) for g in items)
+                self.group_view.append_rows(items)
+            else:
+                self.student_view.append_rows(items, self.loading_group_names)
+            self.progress_label.configure(text=f"A carregar... {self.loading_counts['groups']} grupos, {self.loading_counts['students']} alunos")
+            self.progress_bar.set(min(done / total, 1) if total else 1)
+
+        self.after(LOAD_POLL_MS, self.poll_loading)
+
+    def finish_loading(self, error=None):
+        """Conclui o carregamento: esconde o progresso, desbloqueia a edição e mostra os dados ordenados."""
+        self.loading_queue = None
+        self.progress_label.pack_forget()
+        self.progress_bar.pack_forget()
+        self.combo_course.configure(state="readonly")
+        self.button_new_course.configure(state="normal")
+        self.button_check.configure(state="normal")
+        self.student_view.set_loading(False)
+        self.group_view.set_loading(False)
+        self.controller.notify_observers()
+        if error:
+            messagebox.showerror("Erro", f"Erro ao carregar dados: {error}")
+        elif not self.controller.consistency.ok:
+            self.review_consistency(self.controller.consistency)
+
+    def check_data(self):
+        """Verifica as referências entre alunos e grupos do curso ativo (botão "Verificar Dados")."""
+        self.tasks.submit("A verificar os dados...", lambda task: self.controller.check_consistency(), self.show_check_result)
+
+    def show_check_result(self, report):
+        """Mostra o resultado de uma verificação pedida pelo utilizador."""
+        if report.ok:
+            messagebox.showinfo("Verificar Dados", "Não foram encontradas inconsistências.")
+        else:
+            self.review_consistency(report)
+
+    def review_consistency(self, report):
+        """Mostra o resumo das inconsistências encontradas e propõe a reparação automática."""
+        summary = "\n".join(report.summary())
+        if not report.repairable:
+            messagebox.showwarning("Dados inconsistentes", f"{summary}\n\nEstas situações têm de ser corrigidas manualmente.")
+            return
+        if not messagebox.askyesno("Dados inconsistentes", f"Foram encontradas inconsistências nos dados:\n\n{summary}\n\nReparar automaticamente?"):
+            return
+        try:
+            self.tasks.submit("A reparar os dados...", lambda task: self.controller.repair_consistency(),
+                              lambda _: self.show_repair_result(), mutating=True, cancellable=False)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def show_repair_result(self):
+        """Mostra o que ficou por resolver depois da reparação automática."""
+        remaining = self.controller.consistency
+        if remaining.ok:
+            messagebox.showinfo("Verificar Dados", "Dados reparados.")
+        else:
+            remaining_summary = "\n".join(remaining.summary())
+            messagebox.showwarning("Verificar Dados", f"Dados reparados. Por resolver manualmente:\n\n{remaining_summary}")
+
+    def create_course(self):
+        """Pede o nome de um curso novo, cria-o e abre-o."""
+        dialog = ctk.CTkInputDialog(text="Nome do curso (ex: Programação 2025/26):", title="Novo Curso")
+        name = dialog.get_input()
+        if not name:
+            return
+        try:
+            course_id = self.courses.create_course(name)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        self.refresh_courses()
+        self.switch_course(self.courses.course_name(course_id))
+
+    def unload_idle_courses(self):
+        """Liberta a memória dos cursos que não são usados há algum tempo."""
+        if self.loading_queue is None and not self.tasks.busy:
+            self.courses.unload_idle()
+        self.after(IDLE_COURSES_CHECK_MS, self.unload_idle_courses)
+
+    def active_view(self):
+        """Vista da aba atualmente selecionada (a de alunos por omissão)."""
+        if self.tabview.get() == "Gerir Grupos":
+            return self.group_view
+        return self.student_view
+
+    def undo(self, event=None):
+        """Anula a última alteração (Ctrl+Z)."""
+        self.active_view().undo()
+
+    def redo(self, event=None):
+        """Refaz a última alteração anulada (Ctrl+Y)."""
+        self.active_view().redo()
+
+    def check_external_changes(self):
+        """Integra alterações de outras instâncias e reagenda a verificação."""
+        # Durante uma tarefa em segundo plano, os dados não podem mudar por baixo dela
+        if not self.tasks.busy:
+            try:
+                self.controller.sync_external_changes()
+            except ValueError as e:
+                # Bloqueio ocupado por outra instância: tenta novamente no próximo ciclo
+                print(f"Erro ao sincronizar dados: {e}")
+        self.after(EXTERNAL_CHANGES_POLL_MS, self.check_external_changes)
+
     def on_close(self):
         """Executado quando a janela é fechada."""
-        self.controller.save_data()
+        # Cancela as tarefas em curso e espera por elas antes de gravar
+        self.tasks.shutdown()
+        for controller in self.courses.loaded_controllers():
+            try:
+                controller.save_data()
+            except DataConflictError:
+                # Outra instância gravou depois de nós; as alterações locais já foram guardadas
+                pass
+            # Guarda as estruturas derivadas para o próximo arranque não as reconstruir
+            controller.save_cache()
+            # Espera que o registo de auditoria tenha escrito as últimas alterações
+            controller.audit.flush()
         self.destroy()
 
 if __name__ == "__main__":
+    # Necessário para os processos da importação paralela numa versão empacotada (ex.: PyInstaller)
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
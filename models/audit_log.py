@@ -0,0 +1,343 @@
+import atexit
+import getpass
+import gzip
+import json
+import os
+import queue
+import re
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from models.change_log import Change, RecordImage, thaw_record
+from models.file_lock import FileLock
+
+# Tamanho a partir do qual o segmento ativo é fechado e comprimido
+AUDIT_SEGMENT_BYTES = 4 * 1024 * 1024
+# Número máximo de entradas escritas de uma só vez pela thread de escrita
+AUDIT_BATCH_SIZE = 500
+# Listas e dicionários maiores do que isto nos argumentos (ex.: as linhas de uma importação) ficam só com o tamanho;
+# os registos alterados constam sempre por inteiro das imagens
+AUDIT_MAX_ARG_ITEMS = 20
+
+
+def _current_user() -> Tuple[str, str]:
+    """Utilizador e máquina que fazem as alterações (registados em cada entrada)."""
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError, ImportError):
+        user = "desconhecido"
+    try:
+        host = socket.gethostname()
+    except OSError:
+        host = ""
+    return user, host
+
+
+_USER, _HOST = _current_user()
+
+
+def _audit_value(value: Any) -> Any:
+    """Converte um argumento de uma operação num valor JSON (as listas longas ficam resumidas)."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple, dict)) and len(value) > AUDIT_MAX_ARG_ITEMS:
+        return f"<{len(value)} itens>"
+    if isinstance(value, dict):
+        return {str(k): _audit_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_audit_value(v) for v in value]
+    return str(value)
+
+
+def summarize_args(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Forma resumida (JSON) dos argumentos de uma operação, a registada na auditoria.
+    Também é a que fica no histórico de alterações, para que este não retenha, por exemplo,
+    todas as linhas de uma importação.
+    """
+    return {name: _audit_value(value) for name, value in args.items()}
+
+
+def _record_change(kind: str, record_id: str, before: RecordImage, after: RecordImage) -> Dict[str, Any]:
+    """Descreve a alteração de um registo: estado completo ao criar/apagar, só os campos alterados ao atualizar."""
+    if before is None:
+        return {"type": kind, "id": record_id, "action": "create", "before": None, "after": thaw_record(after)}
+    if after is None:
+        return {"type": kind, "id": record_id, "action": "delete", "before": thaw_record(before), "after": None}
+    old, new = thaw_record(before), thaw_record(after)
+    fields = [k for k in new if old.get(k) != new[k]] + [k for k in old if k not in new]
+    return {"type": kind, "id": record_id, "action": "update",
+            "before": {k: old.get(k) for k in fields}, "after": {k: new.get(k) for k in fields}}
+
+
+def _entry(change: Change, operation: str, args: Any, time: str, undo: bool) -> Dict[str, Any]:
+    """
+    Converte uma alteração confirmada numa entrada de auditoria. As listas "students" e "groups"
+    indicam todos os alunos e grupos envolvidos (incluindo os membros que entraram ou saíram de um
+    grupo e os grupos de origem e destino de um aluno) e servem às consultas.
+    """
+    students: Set[str] = set(change.students)
+    groups: Set[str] = set(change.groups)
+    records = []
+    for number, images in change.students.items():
+        before, after = reversed(images) if undo else images
+        records.append(_record_change("student", number, before, after))
+        for image in (before, after):
+            if image is not None and image.get("group_id"):
+                groups.add(image["group_id"])
+    for group_id, images in change.groups.items():
+        before, after = reversed(images) if undo else images
+        records.append(_record_change("group", group_id, before, after))
+        old_members = set(before["student_ids"]) if before is not None else set()
+        new_members = set(after["student_ids"]) if after is not None else set()
+        students.update(old_members ^ new_members)
+    return {"time": time, "user": _USER, "host": _HOST, "operation": operation, "args": args,
+            "students": sorted(students), "groups": sorted(groups), "changes": records}
+
+
+class _AuditWriter:
+    """
+    Thread de escrita partilhada por todos os registos de auditoria do processo.
+    As entradas são postas numa fila pela thread que faz a alteração e escritas em lotes,
+    pelo que o custo de serializar e gravar não recai sobre a interface.
+    """
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Tuple[AuditLog, Change, str, Any, str, bool]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def put(self, log: 'AuditLog', item: Tuple[Change, str, Any, str, bool]) -> None:
+        """Acrescenta uma alteração à fila (inicia a thread na primeira utilização)."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                    self._thread.start()
+                    # As entradas ainda na fila são escritas antes de o processo terminar
+                    atexit.register(self.flush)
+        self._queue.put((log,) + item)
+
+    def flush(self) -> None:
+        """Espera que todas as entradas postas na fila estejam escritas."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Junta ao lote o que entretanto se acumulou, sem esperar por mais
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            by_log: Dict[AuditLog, List[Dict[str, Any]]] = {}
+            for log, change, operation, args, time, undo in batch:
+                by_log.setdefault(log, []).append(_entry(change, operation, args, time, undo))
+            for log, entries in by_log.items():
+                # Uma falha não pode parar a thread: as alterações seguintes continuam a ser registadas
+                try:
+                    log._write(entries)
+                except Exception as e:
+                    print(f"Erro ao guardar registo de auditoria: {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+
+_writer = _AuditWriter()
+
+
+class AuditLog:
+    """
+    Registo de auditoria de todas as alterações ("data.json.audit"): quem fez o quê e quando.
+
+    Cada alteração confirmada (incluindo anular/refazer) dá uma linha JSON com a data e hora,
+    o utilizador e a máquina, a operação e os seus argumentos (por nome, incluindo os predefinidos),
+    e o antes e depois de cada registo alterado:
+        {"time": "...", "user": "...", "host": "...", "operation": "transfer_student",
+         "args": {"student_number": "2021001", "new_group_id": "g2"},
+         "students": ["2021001"], "groups": ["g1", "g2"],
+         "changes": [{"type": "student", "id": "2021001", "action": "update",
+                      "before": {"group_id": "g1"}, "after": {"group_id": "g2"}}, ...]}
+    Nas atualizações constam só os campos alterados; ao criar ou apagar, o registo completo.
+
+    As entradas são escritas em lotes por uma thread em segundo plano (record só as põe na fila).
+    Quando o segmento ativo passa de segment_bytes é fechado como "data.json.audit.<n>",
+    comprimido ("data.json.audit.<n>.gz") e resumido em "data.json.audit.<n>.keys" (os alunos e
+    grupos que refere), para que uma consulta só descomprima os segmentos relevantes.
+    As escritas e a rotação são feitas sob um bloqueio próprio ("data.json.audit.lock"),
+    partilhado pelas instâncias que usam o mesmo ficheiro.
+
+    Atributos:
+        path (str): Segmento ativo.
+        segment_bytes (int): Tamanho a partir do qual o segmento ativo é rodado.
+    """
+    def __init__(self, path: str, segment_bytes: int = AUDIT_SEGMENT_BYTES) -> None:
+        self.path: str = path
+        self.segment_bytes: int = segment_bytes
+        self.lock: FileLock = FileLock(path + ".lock")
+        self._segment_pattern = re.compile(re.escape(os.path.basename(path)) + r"\.(\d+)(\.gz|\.keys)?$")
+        # Resumos dos segmentos comprimidos já lidos (não mudam depois de escritos)
+        self._keys: Dict[int, Tuple[Set[str], Set[str]]] = {}
+
+    def record(self, change: Change, operation: Optional[str] = None, undo: bool = False) -> None:
+        """
+        Regista uma alteração confirmada (e gravada). Só a põe na fila; a entrada é construída
+        e escrita pela thread de escrita.
+
+        Args:
+            change (Change): Alteração selada (com imagens anteriores e posteriores).
+            operation (Optional[str], optional): Nome a registar. Predefinição: change.operation.
+            undo (bool, optional): Se True, regista a alteração anulada (imagens trocadas).
+        """
+        # O momento e os argumentos são fixados já: as imagens da alteração são imutáveis, os argumentos não
+        time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _writer.put(self, (change, operation or change.operation, summarize_args(change.args), time, undo))
+
+    def flush(self) -> None:
+        """Espera que as alterações registadas por este processo estejam escritas."""
+        _writer.flush()
+
+    # --- Escrita e rotação (na thread de escrita) ---
+    def _write(self, entries: List[Dict[str, Any]]) -> None:
+        """Acrescenta um lote de entradas ao segmento ativo e roda-o se ficou grande demais."""
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode('utf-8')
+        with self.lock:
+            with open(self.path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            if size >= self.segment_bytes:
+                self._rotate()
+
+    def _segments(self) -> Dict[int, Set[str]]:
+        """Segmentos fechados: número -> sufixos presentes ("", ".gz", ".keys")."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        segments: Dict[int, Set[str]] = {}
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return segments
+        for name in names:
+            match = self._segment_pattern.match(name)
+            if match:
+                segments.setdefault(int(match.group(1)), set()).add(match.group(2) or "")
+        return segments
+
+    def _segment_path(self, number: int, suffix: str = "") -> str:
+        return f"{self.path}.{number}{suffix}"
+
+    def _rotate(self) -> None:
+        """Fecha o segmento ativo e comprime-o (com os segmentos que uma interrupção deixou por comprimir)."""
+        segments = self._segments()
+        number = max(segments, default=0) + 1
+        os.replace(self.path, self._segment_path(number))
+        segments[number] = {""}
+        for pending, suffixes in sorted(segments.items()):
+            if "" in suffixes:
+                self._compress(pending)
+
+    def _compress(self, number: int) -> None:
+        """Comprime um segmento fechado e escreve o resumo dos alunos e grupos que refere."""
+        raw = self._segment_path(number)
+        students: Set[str] = set()
+        groups: Set[str] = set()
+        with open(raw, 'rb') as source, gzip.open(raw + ".gz.tmp", 'wb') as target:
+            for line in source:
+                target.write(line)
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                students.update(entry.get("students", ()))
+                groups.update(entry.get("groups", ()))
+        os.replace(raw + ".gz.tmp", raw + ".gz")
+        with open(raw + ".keys.tmp", 'w', encoding='utf-8') as f:
+            json.dump({"students": sorted(students), "groups": sorted(groups)}, f, ensure_ascii=False)
+        os.replace(raw + ".keys.tmp", raw + ".keys")
+        os.remove(raw)
+
+    # --- Consultas ---
+    def _segment_keys(self, number: int) -> Tuple[Set[str], Set[str]]:
+        """Alunos e grupos referidos num segmento comprimido (lidos uma vez e guardados)."""
+        if number not in self._keys:
+            with open(self._segment_path(number, ".keys"), 'r', encoding='utf-8') as f:
+                keys = json.load(f)
+            self._keys[number] = (set(keys["students"]), set(keys["groups"]))
+        return self._keys[number]
+
+    def _read_lines(self, path: str, compressed: bool, needles: List[bytes]) -> Iterator[bytes]:
+        """Linhas completas de um segmento que contêm todos os textos procurados."""
+        try:
+            f = gzip.open(path, 'rb') if compressed else open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                # Filtro rápido sobre o texto; a correspondência exata é confirmada depois de descodificar
+                if line.endswith(b"\n") and all(needle in line for needle in needles):
+                    yield line
+
+    def query(self, student_number: Optional[str] = None, group_id: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Entradas que envolvem um aluno e/ou um grupo, por ordem cronológica (inclui as alterações
+        feitas por outras instâncias). Os segmentos comprimidos que não referem o aluno nem o grupo
+        não são lidos.
+
+        Args:
+            student_number (Optional[str], optional): Número do aluno. Predefinição: qualquer.
+            group_id (Optional[str], optional): ID do grupo. Predefinição: qualquer.
+            limit (Optional[int], optional): Número máximo de entradas (as mais recentes). Predefinição: sem limite.
+
+        Retorna:
+            List[Dict[str, Any]]: Entradas encontradas.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        self.flush()
+        needles = [json.dumps(key, ensure_ascii=False).encode('utf-8') for key in (student_number, group_id) if key]
+
+        def wanted(entry: Dict[str, Any]) -> bool:
+            return ((student_number is None or student_number in entry.get("students", ()))
+                    and (group_id is None or group_id in entry.get("groups", ())))
+
+        found: List[Dict[str, Any]] = []
+        with self.lock:
+            sources: List[Tuple[str, bool]] = [(self.path, False)]
+            for number, suffixes in sorted(self._segments().items(), reverse=True):
+                if "" in suffixes:
+                    # Segmento ainda por comprimir (rotação interrompida)
+                    sources.append((self._segment_path(number), False))
+                    continue
+                if not {".gz", ".keys"} <= suffixes:
+                    continue
+                try:
+                    students, groups = self._segment_keys(number)
+                except (IOError, json.JSONDecodeError, KeyError) as e:
+                    print(f"Erro ao ler resumo da auditoria: {e}")
+                    students = groups = None
+                if students is not None and ((student_number and student_number not in students)
+                                             or (group_id and group_id not in groups)):
+                    continue
+                sources.append((self._segment_path(number, ".gz"), True))
+
+            # Do segmento mais recente para o mais antigo, até ter entradas suficientes
+            for path, compressed in sources:
+                matches = []
+                try:
+                    for line in self._read_lines(path, compressed, needles):
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if wanted(entry):
+                            matches.append(entry)
+                except (IOError, EOFError) as e:
+                    print(f"Erro ao ler registo de auditoria: {e}")
+                found = matches + found
+                if limit is not None and len(found) >= limit:
+                    break
+        return found[-limit:] if limit is not None else found
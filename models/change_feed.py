@@ -0,0 +1,259 @@
+import bisect
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from models.change_log import Change, RecordImage, thaw_record
+
+# Uma entrada em cada FEED_INDEX_INTERVAL fica registada no índice de posições,
+# para que a leitura a partir de um cursor não tenha de percorrer o feed desde o início
+FEED_INDEX_INTERVAL = 1000
+
+# Bytes lidos de cada vez ao procurar a última entrada no fim do ficheiro
+_TAIL_CHUNK = 64 * 1024
+
+
+def _image_data(image: RecordImage) -> Optional[Dict[str, Any]]:
+    return thaw_record(image) if image is not None else None
+
+
+def _action(before: RecordImage, after: RecordImage) -> str:
+    if before is None:
+        return "create"
+    if after is None:
+        return "delete"
+    return "update"
+
+
+class ChangeFeed:
+    """
+    Feed de alterações (change data capture) para sistemas externos (ex.: sincronização
+    com o LMS ou com a folha de avaliação), guardado em "data.json.feed".
+
+    Cada alteração confirmada acrescenta ao ficheiro uma linha JSON por registo alterado
+    (aluno ou grupo, com o estado final) e uma por entrada/saída de um aluno num grupo,
+    com um número de sequência crescente partilhado por todas as instâncias da aplicação.
+    Um consumidor guarda o último número que processou (o cursor) e pede apenas as
+    entradas seguintes, pelo que sincroniza em O(alterações) em vez de O(dados).
+
+    Formato de cada linha:
+        {"seq": 42, "time": "...", "version": 7, "operation": "transfer_student",
+         "type": "student" | "group" | "membership", "id": "...", "action": ..., "data": {...}}
+    em que action é "create", "update" ou "delete" para alunos e grupos e "join" ou
+    "leave" para as entradas "membership" (com "group_id" em vez de "data").
+
+    O índice "data.json.feed.idx" guarda a posição de uma entrada em cada FEED_INDEX_INTERVAL.
+    As escritas devem ser feitas sob o bloqueio do ficheiro de dados (como as gravações).
+
+    Atributos:
+        path (str): Ficheiro do feed.
+        index_path (str): Ficheiro do índice de posições.
+    """
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.index_path: str = path + ".idx"
+        # Tamanho do ficheiro e última sequência após a última escrita/leitura desta instância
+        self._size: Optional[int] = None
+        self._last_seq: int = 0
+
+    def _file_size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _read_tail(self) -> Tuple[int, int]:
+        """
+        Procura a última entrada completa do ficheiro.
+
+        Retorna:
+            Tuple[int, int]: (última sequência, posição a seguir à última linha completa).
+        """
+        size = self._file_size()
+        if not size:
+            return 0, 0
+        complete_end: Optional[int] = None
+        buffer = b""
+        end = size
+        with open(self.path, 'rb') as f:
+            while end > 0:
+                start = max(0, end - _TAIL_CHUNK)
+                f.seek(start)
+                buffer = f.read(end - start) + buffer
+                end = start
+                newline = buffer.rfind(b"\n")
+                if newline < 0:
+                    continue
+                if complete_end is None:
+                    complete_end = start + newline + 1
+                lines = buffer[:newline].split(b"\n")
+                # Com mais ficheiro antes do bloco, a primeira linha pode estar cortada
+                for line in reversed(lines if start == 0 else lines[1:]):
+                    if line.strip():
+                        try:
+                            return json.loads(line)["seq"], complete_end
+                        except (json.JSONDecodeError, KeyError, TypeError):
+                            continue
+        return 0, complete_end or 0
+
+    def last_seq(self) -> int:
+        """Número de sequência da última entrada gravada (0 se o feed estiver vazio)."""
+        size = self._file_size()
+        if size != self._size:
+            self._last_seq, _ = self._read_tail()
+            self._size = size
+        return self._last_seq
+
+    def _entries(self, change: Change, operation: str, version: int, undo: bool) -> List[Dict[str, Any]]:
+        """Converte uma alteração nas entradas do feed (sem números de sequência)."""
+        time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        base = {"time": time, "version": version, "operation": operation}
+        entries = []
+        for number, images in change.students.items():
+            before, after = reversed(images) if undo else images
+            entries.append(dict(base, type="student", id=number, action=_action(before, after), data=_image_data(after)))
+        for group_id, images in change.groups.items():
+            before, after = reversed(images) if undo else images
+            entries.append(dict(base, type="group", id=group_id, action=_action(before, after), data=_image_data(after)))
+            old_members = list(before["student_ids"]) if before is not None else []
+            new_members = list(after["student_ids"]) if after is not None else []
+            old_set, new_set = set(old_members), set(new_members)
+            for number in old_members:
+                if number not in new_set:
+                    entries.append(dict(base, type="membership", id=number, action="leave", group_id=group_id))
+            for number in new_members:
+                if number not in old_set:
+                    entries.append(dict(base, type="membership", id=number, action="join", group_id=group_id))
+        return entries
+
+    def publish(self, change: Change, operation: Optional[str] = None, version: int = 0, undo: bool = False) -> int:
+        """
+        Acrescenta ao feed as entradas de uma alteração confirmada (e gravada).
+        Deve ser chamado sob o bloqueio do ficheiro de dados.
+
+        Args:
+            change (Change): Alteração selada (com imagens anteriores e posteriores).
+            operation (Optional[str], optional): Nome a registar. Predefinição: change.operation.
+            version (int, optional): Versão dos dados após a alteração.
+            undo (bool, optional): Se True, publica a alteração anulada (imagens trocadas).
+
+        Retorna:
+            int: Número de sequência da última entrada acrescentada.
+        """
+        entries = self._entries(change, operation or change.operation, version, undo)
+        if not entries:
+            return self.last_seq()
+
+        # Outra instância pode ter escrito entretanto; uma linha incompleta (escrita interrompida) é descartada
+        size = self._file_size()
+        if size != self._size:
+            self._last_seq, complete_end = self._read_tail()
+            if complete_end < size:
+                try:
+                    os.truncate(self.path, complete_end)
+                except OSError as e:
+                    print(f"Erro ao reparar feed de alterações: {e}")
+                size = complete_end
+
+        chunks = []
+        index_lines = []
+        offset = size
+        seq = self._last_seq
+        for entry in entries:
+            seq += 1
+            line = (json.dumps(dict(seq=seq, **entry), ensure_ascii=False) + "\n").encode('utf-8')
+            if seq % FEED_INDEX_INTERVAL == 0:
+                index_lines.append(f"{seq} {offset}\n")
+            chunks.append(line)
+            offset += len(line)
+
+        try:
+            with open(self.path, 'ab') as f:
+                f.write(b"".join(chunks))
+                f.flush()
+                os.fsync(f.fileno())
+            if index_lines:
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.writelines(index_lines)
+        except IOError as e:
+            print(f"Erro ao guardar feed de alterações: {e}")
+            self._size = None
+            return self._last_seq
+
+        self._last_seq = seq
+        self._size = offset
+        return seq
+
+    def _load_index(self) -> Tuple[List[int], List[int]]:
+        """Lê o índice de posições: (sequências, posições), por ordem."""
+        seqs: List[int] = []
+        offsets: List[int] = []
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                        seq, offset = int(parts[0]), int(parts[1])
+                        if not seqs or seq > seqs[-1]:
+                            seqs.append(seq)
+                            offsets.append(offset)
+        except FileNotFoundError:
+            pass
+        except IOError as e:
+            print(f"Erro ao ler índice do feed: {e}")
+        return seqs, offsets
+
+    def read(self, cursor: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Lê as entradas posteriores a um cursor, por ordem de sequência.
+
+        Args:
+            cursor (int, optional): Última sequência já processada pelo consumidor. Predefinição: 0 (tudo).
+            limit (Optional[int], optional): Número máximo de entradas. Predefinição: sem limite.
+
+        Retorna:
+            List[Dict[str, Any]]: Entradas com seq > cursor; o novo cursor é o seq da última.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        seqs, offsets = self._load_index()
+        # Começa na última posição indexada que não ultrapassa o cursor
+        i = bisect.bisect_right(seqs, cursor + 1) - 1
+        starts = [offsets[j] for j in range(i, -1, -1)] + [0]
+
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return []
+        except IOError as e:
+            print(f"Erro ao ler feed de alterações: {e}")
+            return []
+
+        with f:
+            for start in starts:
+                f.seek(start)
+                first = f.readline()
+                try:
+                    if start and json.loads(first)["seq"] > cursor + 1:
+                        continue
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # Posição inválida (ex.: feed reparado depois de indexado): tenta a anterior
+                    continue
+                f.seek(start)
+                break
+
+            entries: List[Dict[str, Any]] = []
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Erro ao ler feed de alterações: {e}")
+                    break
+                if entry.get("seq", 0) <= cursor:
+                    continue
+                entries.append(entry)
+                if limit is not None and len(entries) >= limit:
+                    break
+        return entries
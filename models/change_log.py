@@ -0,0 +1,162 @@
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, TYPE_CHECKING
+from models.student import Student
+from models.group import Group
+
+if TYPE_CHECKING:
+    from models.data_manager import DataManager
+
+# Imagem de um registo: o seu dicionário de serialização, com listas convertidas em tuplos
+# para não ser afetada por alterações posteriores ao objeto (None = registo inexistente)
+RecordImage = Optional[Dict[str, Any]]
+
+
+def freeze_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia um dicionário de serialização convertendo listas em tuplos."""
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in data.items()}
+
+
+def thaw_record(image: Dict[str, Any]) -> Dict[str, Any]:
+    """Operação inversa de freeze_record (tuplos voltam a listas)."""
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in image.items()}
+
+
+def student_image(student: Optional[Student]) -> RecordImage:
+    """Imagem imutável de um aluno (ou None)."""
+    return freeze_record(student.to_dict()) if student is not None else None
+
+
+def group_image(group: Optional[Group]) -> RecordImage:
+    """Imagem imutável de um grupo (ou None)."""
+    return freeze_record(group.to_dict()) if group is not None else None
+
+
+class Change:
+    """
+    Alteração atómica feita por uma operação do controlador.
+    Guarda apenas as imagens anteriores e posteriores dos registos tocados, pelo que
+    ocupa memória proporcional à dimensão da alteração e não ao total de dados.
+    Aplicar as imagens anteriores anula a operação; aplicar as posteriores refá-la.
+
+    Atributos:
+        operation (str): Nome da operação (ex.: "transfer_student").
+        args (Dict[str, Any]): Argumentos da operação por nome (incluindo os passados por
+            palavra-chave e os valores predefinidos); no histórico, na forma resumida da auditoria.
+        students (Dict[str, List[RecordImage]]): Número -> [antes, depois].
+        groups (Dict[str, List[RecordImage]]): ID do grupo -> [antes, depois].
+    """
+    __slots__ = ("operation", "args", "students", "groups")
+
+    def __init__(self, operation: str, args: Optional[Dict[str, Any]] = None) -> None:
+        self.operation: str = operation
+        self.args: Dict[str, Any] = args if args is not None else {}
+        self.students: Dict[str, List[RecordImage]] = {}
+        self.groups: Dict[str, List[RecordImage]] = {}
+
+    @property
+    def touched(self) -> bool:
+        """True se a operação tocou em algum registo."""
+        return bool(self.students or self.groups)
+
+    def capture(self, data_manager: 'DataManager', student_numbers: Iterable[str] = (), group_ids: Iterable[str] = ()) -> None:
+        """
+        Regista o estado anterior dos registos que vão ser alterados.
+        Só a primeira captura de cada registo conta (é o estado antes da operação).
+        """
+        for number in student_numbers:
+            if number not in self.students:
+                self.students[number] = [student_image(data_manager.students.get(number)), None]
+        for group_id in group_ids:
+            if group_id and group_id not in self.groups:
+                self.groups[group_id] = [group_image(data_manager.groups.get(group_id)), None]
+
+    def seal(self, data_manager: 'DataManager') -> None:
+        """Regista o estado posterior e descarta os registos que acabaram iguais."""
+        for number, images in list(self.students.items()):
+            images[1] = student_image(data_manager.students.get(number))
+            if images[0] == images[1]:
+                del self.students[number]
+        for group_id, images in list(self.groups.items()):
+            images[1] = group_image(data_manager.groups.get(group_id))
+            if images[0] == images[1]:
+                del self.groups[group_id]
+
+    def matches(self, data_manager: 'DataManager', after: bool) -> bool:
+        """Verifica se os dados atuais coincidem com as imagens posteriores (ou anteriores)."""
+        side = 1 if after else 0
+        for number, images in self.students.items():
+            if student_image(data_manager.students.get(number)) != images[side]:
+                return False
+        for group_id, images in self.groups.items():
+            if group_image(data_manager.groups.get(group_id)) != images[side]:
+                return False
+        return True
+
+    def apply(self, data_manager: 'DataManager', after: bool) -> None:
+        """
+        Repõe as imagens posteriores (refazer) ou anteriores (anular) nos dados.
+
+        Args:
+            data_manager (DataManager): Dados a alterar.
+            after (bool): True para aplicar o estado posterior, False para o anterior.
+        """
+        side = 1 if after else 0
+        for number, images in self.students.items():
+            image = images[side]
+            if image is None:
+                data_manager.students.pop(number, None)
+            else:
+                data_manager.students[number] = data_manager.intern_student(Student.from_dict(thaw_record(image)))
+        for group_id, images in self.groups.items():
+            image = images[side]
+            if image is None:
+                data_manager.groups.pop(group_id, None)
+            else:
+                data_manager.groups[group_id] = data_manager.intern_group(Group.from_dict(thaw_record(image)))
+
+
+class ChangeHistory:
+    """
+    Histórico de alterações para anular/refazer.
+
+    Atributos:
+        limit (int): Número máximo de passos guardados.
+    """
+    def __init__(self, limit: int = 5000) -> None:
+        self.limit: int = limit
+        self._undo: Deque[Change] = deque(maxlen=limit)
+        self._redo: List[Change] = []
+
+    def record(self, change: Change) -> None:
+        """Regista uma nova alteração (descarta o que havia para refazer)."""
+        self._undo.append(change)
+        self._redo.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def peek_undo(self) -> Optional[Change]:
+        return self._undo[-1] if self._undo else None
+
+    def peek_redo(self) -> Optional[Change]:
+        return self._redo[-1] if self._redo else None
+
+    def mark_undone(self) -> Change:
+        """Move a última alteração para a pilha de refazer."""
+        change = self._undo.pop()
+        self._redo.append(change)
+        return change
+
+    def mark_redone(self) -> Change:
+        """Move a última alteração anulada de volta para a pilha de anular."""
+        change = self._redo.pop()
+        self._undo.append(change)
+        return change
+
+    def clear(self) -> None:
+        """Esquece todo o histórico."""
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,260 @@
+import heapq
+from typing import Dict, List, Optional, Set
+from models.student import Student
+from models.group import Group
+
+# Tipos de inconsistência (chave -> descrição apresentada nos resumos)
+ISSUE_KINDS: Dict[str, str] = {
+    "dangling_group": "Alunos com um grupo que não existe",
+    "dangling_member": "Membros de grupos que não existem como alunos",
+    "duplicate_member": "Membros repetidos no mesmo grupo",
+    "multiple_groups": "Alunos listados em vários grupos",
+    "missing_member": "Alunos que não constam da lista do seu grupo",
+    "unrecorded_member": "Membros de grupos sem esse grupo no registo do aluno",
+    "dangling_waitlist": "Inscrições em listas de espera de alunos que não existem",
+    "dangling_preference": "Preferências por grupos que não existem",
+    "over_capacity": "Grupos acima da capacidade máxima",
+}
+
+# Inconsistências que a reparação automática não resolve (exigem uma decisão de quem gere os grupos)
+MANUAL_KINDS: Set[str] = {"over_capacity"}
+
+
+class ConsistencyIssue:
+    """
+    Uma inconsistência entre as referências de alunos e grupos.
+
+    Atributos:
+        kind (str): Tipo (chave de ISSUE_KINDS).
+        message (str): Descrição legível.
+        student_number (Optional[str]): Aluno envolvido (se houver).
+        group_id (Optional[str]): Grupo envolvido (se houver).
+    """
+    __slots__ = ("kind", "message", "student_number", "group_id")
+
+    def __init__(self, kind: str, message: str, student_number: Optional[str] = None, group_id: Optional[str] = None) -> None:
+        self.kind: str = kind
+        self.message: str = message
+        self.student_number: Optional[str] = student_number
+        self.group_id: Optional[str] = group_id
+
+    @property
+    def repairable(self) -> bool:
+        """True se a reparação automática resolve esta inconsistência."""
+        return self.kind not in MANUAL_KINDS
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class ConsistencyReport:
+    """
+    Resultado de uma verificação (check_consistency) e plano da respetiva reparação.
+
+    Atributos:
+        issues (List[ConsistencyIssue]): Inconsistências encontradas.
+        owners (Dict[str, Optional[str]]): Grupo que cada aluno afetado deve ter depois da reparação.
+        students (Set[str]): Alunos que a reparação altera.
+        groups (Set[str]): Grupos que a reparação altera.
+        joining (Dict[str, List[str]]): Alunos a acrescentar à lista de cada grupo (que não os lista).
+    """
+    def __init__(self) -> None:
+        self.issues: List[ConsistencyIssue] = []
+        self.owners: Dict[str, Optional[str]] = {}
+        self.students: Set[str] = set()
+        self.groups: Set[str] = set()
+        self.joining: Dict[str, List[str]] = {}
+
+    @property
+    def ok(self) -> bool:
+        """True se não foi encontrada nenhuma inconsistência."""
+        return not self.issues
+
+    @property
+    def repairable(self) -> bool:
+        """True se a reparação automática resolve pelo menos uma inconsistência."""
+        return any(issue.repairable for issue in self.issues)
+
+    def add(self, kind: str, message: str, student_number: Optional[str] = None, group_id: Optional[str] = None) -> None:
+        """Regista uma inconsistência."""
+        self.issues.append(ConsistencyIssue(kind, message, student_number, group_id))
+
+    def counts(self) -> Dict[str, int]:
+        """Número de inconsistências por tipo (só os tipos encontrados, pela ordem de ISSUE_KINDS)."""
+        counts = dict.fromkeys(ISSUE_KINDS, 0)
+        for issue in self.issues:
+            counts[issue.kind] += 1
+        return {kind: count for kind, count in counts.items() if count}
+
+    def summary(self) -> List[str]:
+        """Resumo legível: uma linha por tipo de inconsistência encontrado."""
+        return [f"{ISSUE_KINDS[kind]}: {count}" for kind, count in self.counts().items()]
+
+
+def _final_members(group: Group, students: Dict[str, Student], report: ConsistencyReport) -> List[str]:
+    """Lista de membros de um grupo afetado depois da reparação (sem repetidos nem alunos de outros grupos)."""
+    owners = report.owners
+    members: List[str] = []
+    seen: Set[str] = set()
+    for number in group.student_ids + report.joining.get(group.group_id, []):
+        if number in seen or number not in students:
+            continue
+        owner = owners[number] if number in owners else students[number].group_id
+        if owner == group.group_id:
+            seen.add(number)
+            members.append(number)
+    return members
+
+
+def check_consistency(students: Dict[str, Student], groups: Dict[str, Group]) -> ConsistencyReport:
+    """
+    Verifica as referências entre alunos e grupos nos dois sentidos (Student.group_id e
+    Group.student_ids), num único percurso de cada coleção (O(alunos + membros)); os membros
+    de cada grupo são verificados com operações de conjuntos, e só os registos com problemas
+    são percorridos um a um. Nada é alterado; o relatório indica também como a reparação
+    resolve cada caso:
+
+    - o grupo do aluno prevalece se existir (é acrescentado à lista desse grupo e retirado das outras);
+    - caso contrário, prevalece o primeiro grupo que o lista (ou fica sem grupo);
+    - membros, inscrições em listas de espera e preferências que apontam para registos
+      inexistentes são retirados, tal como os membros repetidos.
+
+    Args:
+        students (Dict[str, Student]): Alunos por número.
+        groups (Dict[str, Group]): Grupos por ID.
+
+    Retorna:
+        ConsistencyReport: Inconsistências encontradas e plano de reparação.
+    """
+    report = ConsistencyReport()
+    # Grupo que lista cada aluno; os alunos listados em vários grupos guardam a lista completa (por ordem)
+    listed_in: Dict[str, str] = {}
+    listings: Dict[str, List[str]] = {}
+    memberships = 0
+    for group_id, group in groups.items():
+        members = set(group.student_ids)
+        if len(members) != len(group.student_ids):
+            seen: Set[str] = set()
+            for number in group.student_ids:
+                if number in seen:
+                    report.add("duplicate_member", f"O aluno {number} aparece repetido no grupo {group.name}.", number, group_id)
+                seen.add(number)
+            report.groups.add(group_id)
+        missing = members.difference(students)
+        if missing:
+            for number in [n for n in group.student_ids if n in missing]:
+                report.add("dangling_member", f"O grupo {group.name} lista o aluno {number}, que não existe.", number, group_id)
+            members -= missing
+            report.groups.add(group_id)
+        memberships += len(members)
+        listed_in.update(dict.fromkeys(members, group_id))
+        for _, _, number in group.waitlist:
+            if number not in students:
+                report.add("dangling_waitlist", f"A lista de espera do grupo {group.name} tem o aluno {number}, que não existe.", number, group_id)
+                report.groups.add(group_id)
+
+    if len(listed_in) != memberships:
+        # Há alunos em mais de um grupo: segundo percurso, só para saber quais e por que ordem
+        first: Dict[str, str] = {}
+        for group_id, group in groups.items():
+            for number in dict.fromkeys(group.student_ids):
+                previous = first.setdefault(number, group_id)
+                if previous != group_id:
+                    listings.setdefault(number, [previous]).append(group_id)
+        for number, group_ids in listings.items():
+            listed_in[number] = group_ids[0]
+
+    get_listed = listed_in.get
+    for number, student in students.items():
+        group_id = student.group_id
+        # Caso comum: o aluno consta só da lista do seu grupo (ou de nenhuma) e as preferências existem
+        if get_listed(number) == group_id and number not in listings and not student.preferences:
+            continue
+
+        if student.preferences and any(g not in groups for g in student.preferences):
+            report.add("dangling_preference", f"O aluno {number} tem preferências por grupos que não existem.", number)
+            report.students.add(number)
+
+        owner = group_id
+        listed = listings.get(number) or ([listed_in[number]] if number in listed_in else [])
+        if group_id is not None and group_id not in groups:
+            owner = listed[0] if listed else None
+            report.add("dangling_group", f"O aluno {number} pertence ao grupo {group_id}, que não existe.", number, group_id)
+        elif group_id is not None and group_id not in listed:
+            report.add("missing_member", f"O aluno {number} pertence ao grupo {groups[group_id].name}, mas não consta da sua lista.", number, group_id)
+        elif group_id is None and listed:
+            owner = listed[0]
+            report.add("unrecorded_member", f"O aluno {number} consta do grupo {groups[owner].name}, mas está registado sem grupo.", number, owner)
+        if len(listed) > 1:
+            names = ", ".join(groups[g].name for g in listed)
+            report.add("multiple_groups", f"O aluno {number} consta de vários grupos ({names}).", number, owner)
+
+        if owner != group_id:
+            report.owners[number] = owner
+            report.students.add(number)
+        # Grupos que listam o aluno sem serem o seu, e o grupo que passa a listá-lo
+        report.groups.update(g for g in listed if g != owner)
+        if owner is not None and owner not in listed:
+            report.joining.setdefault(owner, []).append(number)
+            report.groups.add(owner)
+
+    # Capacidade depois da reparação: os grupos não afetados já têm a lista correta
+    for group_id, group in groups.items():
+        size = len(_final_members(group, students, report)) if group_id in report.groups else len(group.student_ids)
+        if size > group.max_capacity:
+            report.add("over_capacity", f"O grupo {group.name} tem {size} alunos (máximo {group.max_capacity}).", group_id=group_id)
+    return report
+
+
+def repair_references(students: Dict[str, Student], groups: Dict[str, Group], report: ConsistencyReport) -> None:
+    """
+    Aplica a reparação planeada por check_consistency (no próprio lugar).
+    Só os registos em report.students e report.groups são alterados; os grupos acima
+    da capacidade máxima não são corrigidos.
+
+    Args:
+        students (Dict[str, Student]): Alunos por número.
+        groups (Dict[str, Group]): Grupos por ID.
+        report (ConsistencyReport): Relatório de uma verificação feita sobre estes mesmos dados.
+    """
+    for group_id in report.groups:
+        group = groups[group_id]
+        group.student_ids = _final_members(group, students, report)
+        if any(number not in students for _, _, number in group.waitlist):
+            group.waitlist = [entry for entry in group.waitlist if entry[2] in students]
+            heapq.heapify(group.waitlist)
+
+    for number in report.students:
+        student = students[number]
+        if number in report.owners:
+            student.group_id = report.owners[number]
+        student.preferences = [g for g in student.preferences if g in groups]
+
+
+class ConsistencyMonitor:
+    """
+    Guarda o resultado da verificação das referências (check_consistency) como estrutura derivada,
+    para que seja restaurado da cache de arranque com as restantes: a verificação completa só
+    corre quando o ficheiro mudou desde a última sessão (ex.: editado à mão ou gravado a meio),
+    que é precisamente quando pode ter ficado inconsistente.
+
+    As alterações feitas pelo controlador mantêm as referências consistentes, pelo que não
+    atualizam o relatório: este descreve os dados na última verificação (ver
+    MainController.check_consistency e repair_consistency).
+
+    Atributos:
+        report (ConsistencyReport): Resultado da última verificação.
+    """
+    def __init__(self) -> None:
+        self.report: ConsistencyReport = ConsistencyReport()
+
+    # --- Protocolo de estrutura derivada (ver MainController.add_index) ---
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Verifica todos os registos."""
+        self.report = check_consistency(students, groups)
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Nada a fazer (ver descrição da classe)."""
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Nada a fazer (ver descrição da classe)."""
@@ -1,9 +1,15 @@
 import json
+import lzma
 import os
+import re
 import sys
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from models.student import Student
 from models.group import Group
+from models.file_lock import FileLock
+from models.storage_format import STORAGE_FORMATS, detect_format, read_data, read_head, write_data
+from models.json_stream import iter_object_members
+from models.id_table import IdTable
 
 # Determina o caminho correto para o ficheiro de dados
 # Se estiver a executar como executável compilado, usa a pasta do executável
@@ -17,59 +23,660 @@ else:
 
 DATA_FILE = os.path.join(BASE_DIR, "data.json")
 
+# Expressão usada para ler a versão do ficheiro sem o interpretar por completo
+_VERSION_PATTERN = re.compile(r'"version"\s*:\s*(\d+)')
+
+# O diário é compactado (reescrita completa do ficheiro de dados) quando ultrapassa
+# este tamanho e o tamanho do próprio ficheiro de dados...
+JOURNAL_COMPACT_MIN_BYTES = 1024 * 1024
+# ...ou, com ficheiros de dados grandes, quando ultrapassa este tamanho fixo
+JOURNAL_COMPACT_MAX_BYTES = 16 * 1024 * 1024
+
+# Bytes lidos de cada vez ao procurar a última entrada no fim do diário
+_JOURNAL_TAIL_CHUNK = 64 * 1024
+
+# Número de registos convertidos entre cada aviso de progresso do carregamento
+LOAD_CHUNK_SIZE = 2000
+
+# Aviso de progresso: (tipo "groups"/"students", registos do bloco, progresso feito, progresso total);
+# o progresso é medido em registos ou, na leitura em streaming, em caracteres do ficheiro
+LoadCallback = Callable[[str, List[Any], int, int], None]
+
+
+class DataConflictError(ValueError):
+    """Lançada quando o ficheiro foi alterado por outra instância desde a última sincronização."""
+
+
 class DataManager:
     """
     Gestor de persistência de dados.
     Carrega e guarda dados num ficheiro JSON.
 
+    As gravações são incrementais: apenas os registos marcados como alterados
+    (mark_dirty) são acrescentados a um diário ("data.json.journal"), uma linha por
+    gravação, pelo que os bytes escritos são proporcionais à alteração. Quando o diário
+    cresce mais do que o ficheiro de dados (ou do que JOURNAL_COMPACT_MAX_BYTES), os dois
+    são compactados num ficheiro completo. O diário é sempre lido linha a linha.
+    Sem registos alterados, a gravação não escreve nada.
+
+    O ficheiro e cada linha do diário incluem um carimbo de versão incrementado a cada
+    gravação, permitindo detetar alterações feitas por outras instâncias da aplicação
+    (controlo otimista). As gravações são protegidas por um bloqueio consultivo entre processos.
+
     Atributos:
+        data_file (str): Caminho do ficheiro de dados.
+        journal_file (str): Caminho do diário de alterações.
         students (Dict[str, Student]): Dicionário de alunos (chave: número de estudante).
         groups (Dict[str, Group]): Dicionário de grupos (chave: ID do grupo).
+        version (int): Versão dos dados conhecida por esta instância.
+        lock (FileLock): Bloqueio partilhado entre instâncias.
+        storage_format (str): Formato do ficheiro de dados (ver models/storage_format.py).
+        student_ids (IdTable): Números de aluno internados (ver intern_student).
+        group_ids (IdTable): IDs de grupo internados (ver intern_group).
     """
-    def __init__(self) -> None:
-        """Inicializa o DataManager e carrega os dados automaticamente."""
+    def __init__(self, data_file: Optional[str] = None, storage_format: Optional[str] = None, autoload: bool = True) -> None:
+        """
+        Inicializa o DataManager e carrega os dados automaticamente.
+
+        Args:
+            data_file (Optional[str], optional): Caminho do ficheiro. Predefinição: DATA_FILE.
+            storage_format (Optional[str], optional): Formato a usar nas gravações completas.
+                Predefinição: o formato detetado no ficheiro existente ("json" se não existir).
+            autoload (bool, optional): Se False, os dados só são lidos ao chamar load_data
+                (ex.: numa thread de trabalho). Predefinição: True.
+
+        Lança:
+            ValueError: Se o formato for desconhecido.
+        """
+        if storage_format is not None and storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Formato de dados desconhecido: {storage_format}.")
+        self.data_file: str = data_file or DATA_FILE
+        self.storage_format: str = storage_format or "json"
+        self._format_requested: bool = storage_format is not None
+        self.journal_file: str = self.data_file + ".journal"
         self.students: Dict[str, Student] = {}
         self.groups: Dict[str, Group] = {}
-        self.load_data()
+        self.student_ids: IdTable = IdTable()
+        self.group_ids: IdTable = IdTable()
+        self.version: int = 0
+        self.lock: FileLock = FileLock(self.data_file + ".lock")
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        # Posição do diário até onde as alterações já estão refletidas em memória
+        self._journal_offset: int = 0
+        # Registos alterados em memória ainda não gravados
+        self._dirty_students: Set[str] = set()
+        self._dirty_groups: Set[str] = set()
+        if autoload:
+            self.load_data()
+
+    def _stat_file(self) -> Optional[Tuple[int, int]]:
+        """Obtém (mtime, tamanho) do ficheiro de dados, ou None se não existir."""
+        try:
+            st = os.stat(self.data_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _journal_size(self) -> int:
+        """Tamanho atual do diário (0 se não existir)."""
+        try:
+            return os.path.getsize(self.journal_file)
+        except OSError:
+            return 0
 
-    def load_data(self) -> None:
+    def _read_file(self) -> Optional[Dict[str, Any]]:
         """
-        Carrega os dados do ficheiro JSON para a memória.
-        Se o ficheiro não existir, não faz nada (inicia vazio).
+        Lê e interpreta o ficheiro de dados completo, em qualquer formato.
+        Se não foi pedido um formato, as gravações seguintes mantêm o formato detetado.
         """
-        if not os.path.exists(DATA_FILE):
+        try:
+            data, fmt = read_data(self.data_file)
+        except (json.JSONDecodeError, IOError, EOFError, lzma.LZMAError) as e:
+            print(f"Erro ao carregar dados: {e}")
+            return None
+        if not self._format_requested:
+            self.storage_format = fmt
+        return data
+
+    def _detect_file_format(self) -> str:
+        """Formato do ficheiro de dados atual, pelos primeiros bytes."""
+        try:
+            with open(self.data_file, 'rb') as f:
+                return detect_format(f.read(256))
+        except IOError:
+            return "json"
+
+    def _iter_journal(self, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Lê as entradas completas do diário a partir de uma posição, linha a linha (o diário
+        nunca é lido de uma vez). Uma última linha incompleta (gravação interrompida) termina a leitura.
+
+        Args:
+            offset (int, optional): Posição inicial. Predefinição: início do diário.
+
+        Retorna:
+            Iterator[Tuple[Dict[str, Any], int]]: Cada entrada e a posição a seguir a ela.
+        """
+        try:
+            f = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return
+        except IOError as e:
+            print(f"Erro ao ler diário de alterações: {e}")
             return
 
+        with f:
+            f.seek(offset)
+            end = offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Erro ao ler diário de alterações: {e}")
+                    break
+                yield entry, end
+
+    def _discard_journal_tail(self, end: int) -> None:
+        """Remove do diário uma entrada incompleta, para que as próximas gravações fiquem legíveis."""
+        if self._journal_size() > end:
+            try:
+                os.truncate(self.journal_file, end)
+            except OSError as e:
+                print(f"Erro ao reparar diário de alterações: {e}")
+
+    def _read_disk_version(self) -> int:
+        """Lê apenas o início do ficheiro para obter a versão gravada."""
+        try:
+            head = read_head(self.data_file)
+        except (IOError, EOFError, lzma.LZMAError):
+            return 0
+        match = _VERSION_PATTERN.search(head)
+        return int(match.group(1)) if match else 0
+
+    def _last_journal_version(self) -> int:
+        """
+        Versão da última entrada completa do diário (0 se estiver vazio), lida a partir do fim
+        do ficheiro: as versões das entradas são crescentes, pelo que as anteriores não contam.
+        """
+        size = self._journal_size()
+        buffer = b""
+        end = size
+        try:
+            with open(self.journal_file, 'rb') as f:
+                while end > 0:
+                    start = max(0, end - _JOURNAL_TAIL_CHUNK)
+                    f.seek(start)
+                    buffer = f.read(end - start) + buffer
+                    end = start
+                    newline = buffer.rfind(b"\n")
+                    if newline < 0:
+                        continue
+                    lines = buffer[:newline].split(b"\n")
+                    # Com mais ficheiro antes do bloco, a primeira linha pode estar cortada
+                    for line in reversed(lines if start == 0 else lines[1:]):
+                        if line.strip():
+                            try:
+                                return json.loads(line).get("version", 0)
+                            except (json.JSONDecodeError, AttributeError):
+                                continue
+        except FileNotFoundError:
+            return 0
+        except IOError as e:
+            print(f"Erro ao ler diário de alterações: {e}")
+        return 0
+
+    def _disk_version(self) -> int:
+        """Versão mais recente gravada (a última entrada do diário ou a do ficheiro)."""
+        return max(self._read_disk_version(), self._last_journal_version())
+
+    def _replay_journal(self, version: int, students: Dict[str, Any], groups: Dict[str, Any],
+                        student_factory: Callable[[Dict[str, Any]], Any],
+                        group_factory: Callable[[Dict[str, Any]], Any]) -> int:
+        """
+        Aplica aos registos lidos do ficheiro as entradas do diário posteriores à sua versão.
+
+        Args:
+            version (int): Versão do ficheiro de dados.
+            students (Dict[str, Any]): Alunos lidos (alterado no próprio lugar).
+            groups (Dict[str, Any]): Grupos lidos (alterado no próprio lugar).
+            student_factory (Callable): Converte o dicionário de um aluno no valor a guardar.
+            group_factory (Callable): Converte o dicionário de um grupo no valor a guardar.
+
+        Retorna:
+            int: Versão final dos dados.
+        """
+        end = 0
+        for entry, end in self._iter_journal(0):
+            # Entradas anteriores a uma compactação já estão incluídas no ficheiro
+            if entry.get("version", 0) <= version:
+                continue
+            for number, s_data in entry.get("students", {}).items():
+                if s_data is None:
+                    students.pop(number, None)
+                else:
+                    students[number] = student_factory(s_data)
+            for group_id, g_data in entry.get("groups", {}).items():
+                if g_data is None:
+                    groups.pop(group_id, None)
+                else:
+                    groups[group_id] = group_factory(g_data)
+            version = entry["version"]
+        self._discard_journal_tail(end)
+        self._journal_offset = end
+        return version
+
+    def _read_disk_records(self) -> Optional[Tuple[int, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]]:
+        """
+        Lê o estado gravado completo: o ficheiro de dados com as entradas do diário aplicadas.
+
+        Retorna:
+            Optional[Tuple[int, Dict, Dict]]: Versão, alunos e grupos (como dicionários), ou None em caso de erro.
+        """
+        if self._stat_file() is None:
+            data: Optional[Dict[str, Any]] = {}
+        else:
+            data = self._read_file()
+        if data is None:
+            return None
+
+        version = data.get("version", 0)
+        students = {s["student_number"]: s for s in data.get("students", [])}
+        groups = {g["group_id"]: g for g in data.get("groups", [])}
+        version = self._replay_journal(version, students, groups, dict, dict)
+        return version, students, groups
+
+    def _stream_objects(self, on_chunk: Optional[LoadCallback], chunk_size: int) -> Optional[Tuple[int, Dict[str, Student], Dict[str, Group]]]:
+        """
+        Lê um ficheiro em formato "json" elemento a elemento, criando logo os objetos.
+        Ao contrário de json.load, nunca tem em memória a árvore completa de dicionários:
+        apenas o bloco de texto em curso e os objetos já criados.
+
+        Retorna:
+            Optional[Tuple[int, Dict, Dict]]: Versão do ficheiro, alunos e grupos, ou None em caso de erro.
+        """
+        total = max(self._stat_file()[1], 1)
+        version = 0
+        students: Dict[str, Student] = {}
+        groups: Dict[str, Group] = {}
+        chunk: List[Any] = []
+        chunk_kind = ""
+
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Carrega a lista de alunos e converte para objetos Student
-                for s_data in data.get("students", []):
-                    student = Student.from_dict(s_data)
-                    self.students[student.student_number] = student
-                
-                # Carrega a lista de grupos e converte para objetos Group
-                for g_data in data.get("groups", []):
-                    group = Group.from_dict(g_data)
-                    self.groups[group.group_id] = group
-
-        except (json.JSONDecodeError, IOError) as e:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                for kind, key, value, offset in iter_object_members(f):
+                    if kind == "value":
+                        if key == "version":
+                            version = value
+                        continue
+                    if key == "students":
+                        record: Any = Student.from_dict(value)
+                        students[record.student_number] = record
+                    elif key == "groups":
+                        record = Group.from_dict(value)
+                        groups[record.group_id] = record
+                    else:
+                        continue
+
+                    if on_chunk is None:
+                        continue
+                    if chunk and (chunk_kind != key or len(chunk) >= chunk_size):
+                        on_chunk(chunk_kind, chunk, min(offset, total), total)
+                        chunk = []
+                    chunk_kind = key
+                    chunk.append(record)
+        except (json.JSONDecodeError, IOError, KeyError) as e:
             print(f"Erro ao carregar dados: {e}")
+            return None
+
+        if on_chunk is not None and chunk:
+            on_chunk(chunk_kind, chunk, total, total)
+        if not self._format_requested:
+            self.storage_format = "json"
+        return version, students, groups
+
+    def _convert_records(self, student_data: Dict[str, Dict[str, Any]], group_data: Dict[str, Dict[str, Any]],
+                         on_chunk: Optional[LoadCallback], chunk_size: int) -> Tuple[Dict[str, Student], Dict[str, Group]]:
+        """Converte os dicionários lidos em objetos, avisando o progresso bloco a bloco (grupos primeiro)."""
+        total = len(student_data) + len(group_data)
+        done = 0
+        groups: Dict[str, Group] = {}
+        students: Dict[str, Student] = {}
+
+        chunk: List[Any] = []
+        for g_data in group_data.values():
+            group = Group.from_dict(g_data)
+            groups[group.group_id] = group
+            chunk.append(group)
+            if len(chunk) >= chunk_size:
+                done += len(chunk)
+                if on_chunk:
+                    on_chunk("groups", chunk, done, total)
+                chunk = []
+        if chunk:
+            done += len(chunk)
+            if on_chunk:
+                on_chunk("groups", chunk, done, total)
+            chunk = []
+
+        for s_data in student_data.values():
+            student = Student.from_dict(s_data)
+            students[student.student_number] = student
+            chunk.append(student)
+            if len(chunk) >= chunk_size:
+                done += len(chunk)
+                if on_chunk:
+                    on_chunk("students", chunk, done, total)
+                chunk = []
+        if chunk:
+            done += len(chunk)
+            if on_chunk:
+                on_chunk("students", chunk, done, total)
+        return students, groups
+
+    def load_data(self, on_chunk: Optional[LoadCallback] = None, chunk_size: int = LOAD_CHUNK_SIZE) -> None:
+        """
+        Carrega os dados do ficheiro JSON (e do diário de alterações) para a memória.
+        Se o ficheiro não existir, não faz nada (inicia vazio).
+
+        No formato "json" o ficheiro é lido em streaming, elemento a elemento, sem construir
+        a árvore completa de dicionários; nos formatos compactos é descodificado de uma vez.
+
+        Os objetos são criados em dicionários novos, que só substituem os atuais no fim;
+        por isso o carregamento pode correr numa thread de trabalho sem que a interface
+        veja dados a meio.
+
+        Args:
+            on_chunk (Optional[LoadCallback], optional): Chamado após cada bloco de registos criados.
+            chunk_size (int, optional): Registos por bloco. Predefinição: LOAD_CHUNK_SIZE.
+        """
+        if not os.path.exists(self.data_file) and not os.path.exists(self.journal_file):
+            return
+
+        with self.lock:
+            stamp = self._stat_file()
+            if stamp is not None and self._detect_file_format() == "json":
+                loaded = self._stream_objects(on_chunk, chunk_size)
+                if loaded is None:
+                    return
+                version, students, groups = loaded
+                version = self._replay_journal(version, students, groups, Student.from_dict, Group.from_dict)
+            else:
+                records = self._read_disk_records()
+                if records is None:
+                    return
+                version, student_data, group_data = records
+                students, groups = self._convert_records(student_data, group_data, on_chunk, chunk_size)
+
+        student_ids, group_ids = IdTable(students), IdTable(groups)
+        for student in students.values():
+            self.intern_student(student, student_ids, group_ids)
+        for group in groups.values():
+            self.intern_group(group, student_ids, group_ids)
+
+        self.students = students
+        self.groups = groups
+        self.student_ids = student_ids
+        self.group_ids = group_ids
+        self.version = version
+        self._file_stamp = stamp
+
+    def intern_student(self, student: Student, student_ids: Optional[IdTable] = None,
+                       group_ids: Optional[IdTable] = None) -> Student:
+        """
+        Faz as referências do aluno (número, grupo e preferências) apontar para os
+        identificadores internados, partilhados por todos os registos em vez de uma cópia
+        do texto por ocorrência (como ficam depois de lidos do JSON).
+
+        Args:
+            student (Student): Aluno a atualizar (no próprio lugar).
+            student_ids (Optional[IdTable], optional): Tabela de alunos. Predefinição: self.student_ids.
+            group_ids (Optional[IdTable], optional): Tabela de grupos. Predefinição: self.group_ids.
+
+        Retorna:
+            Student: O próprio aluno.
+        """
+        student_ids = student_ids if student_ids is not None else self.student_ids
+        group_ids = group_ids if group_ids is not None else self.group_ids
+        student.student_number = student_ids.canonical(student.student_number)
+        if student.group_id:
+            student.group_id = group_ids.canonical(student.group_id)
+        if student.preferences:
+            student.preferences = group_ids.canonical_list(student.preferences)
+        return student
+
+    def intern_group(self, group: Group, student_ids: Optional[IdTable] = None,
+                     group_ids: Optional[IdTable] = None) -> Group:
+        """
+        Faz as referências do grupo (ID, membros e lista de espera) apontar para os
+        identificadores internados (ver intern_student).
+
+        Args:
+            group (Group): Grupo a atualizar (no próprio lugar).
+            student_ids (Optional[IdTable], optional): Tabela de alunos. Predefinição: self.student_ids.
+            group_ids (Optional[IdTable], optional): Tabela de grupos. Predefinição: self.group_ids.
+
+        Retorna:
+            Group: O próprio grupo.
+        """
+        student_ids = student_ids if student_ids is not None else self.student_ids
+        group_ids = group_ids if group_ids is not None else self.group_ids
+        group.group_id = group_ids.canonical(group.group_id)
+        group.student_ids = student_ids.canonical_list(group.student_ids)
+        if group.waitlist:
+            # Só o número muda de objeto (o valor é o mesmo), pelo que a ordem do heap mantém-se
+            group.waitlist = [(priority, requested_at, student_ids.canonical(n)) for priority, requested_at, n in group.waitlist]
+        return group
+
+    def mark_dirty(self, student_numbers: Iterable[str] = (), group_ids: Iterable[str] = ()) -> None:
+        """
+        Marca registos alterados em memória, para serem incluídos na próxima gravação.
+
+        Args:
+            student_numbers (Iterable[str], optional): Números dos alunos alterados (ou removidos).
+            group_ids (Iterable[str], optional): IDs dos grupos alterados (ou removidos).
+        """
+        self._dirty_students.update(student_numbers)
+        self._dirty_groups.update(group_ids)
+
+    def is_dirty(self) -> bool:
+        """Indica se há alterações em memória por gravar."""
+        return bool(self._dirty_students or self._dirty_groups)
+
+    def fingerprint(self) -> Tuple[int, Optional[Tuple[int, int]], int]:
+        """
+        Impressão digital dos dados em memória: versão, (mtime, tamanho) do ficheiro
+        e posição do diário na última leitura/gravação. Só identifica o conteúdo gravado
+        se não houver alterações por gravar (ver is_dirty).
+        """
+        return (self.version, self._file_stamp, self._journal_offset)
+
+    def has_external_changes(self) -> bool:
+        """
+        Verifica (sem ler o ficheiro) se outra instância alterou os dados.
+        Compara a data de modificação e o tamanho do ficheiro, e o tamanho do diário,
+        com os da última sincronização.
+
+        Retorna:
+            bool: True se os dados gravados mudaram desde a última leitura/gravação.
+        """
+        return self._stat_file() != self._file_stamp or self._journal_size() != self._journal_offset
+
+    def _apply_student_data(self, number: str, s_data: Optional[Dict[str, Any]], changed: Set[str]) -> None:
+        """Substitui um aluno em memória pelo gravado, se forem diferentes."""
+        current = self.students.get(number)
+        if s_data is None:
+            if current is not None:
+                del self.students[number]
+                changed.add(number)
+        elif current is None or current.to_dict() != s_data:
+            student = self.intern_student(Student.from_dict(s_data))
+            self.students[student.student_number] = student
+            changed.add(number)
+
+    def _apply_group_data(self, group_id: str, g_data: Optional[Dict[str, Any]], changed: Set[str]) -> None:
+        """Substitui um grupo em memória pelo gravado, se forem diferentes."""
+        current = self.groups.get(group_id)
+        if g_data is None:
+            if current is not None:
+                del self.groups[group_id]
+                changed.add(group_id)
+        elif current is None or current.to_dict() != g_data:
+            group = self.intern_group(Group.from_dict(g_data))
+            self.groups[group.group_id] = group
+            changed.add(group_id)
+
+    def reload_changes(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Integra na memória apenas os registos alterados por outra instância.
+        Os registos iguais aos gravados mantêm os mesmos objetos.
+
+        Se só o diário cresceu, lê apenas as entradas novas; se o ficheiro de dados mudou
+        (ex.: compactação) ou há alterações locais por gravar, compara o estado completo.
+        Alterações locais por gravar são descartadas em favor das gravadas.
+
+        Retorna:
+            Tuple[Set[str], Set[str]]: Números de alunos e IDs de grupos alterados.
+        """
+        changed_students: Set[str] = set()
+        changed_groups: Set[str] = set()
+
+        with self.lock:
+            stamp = self._stat_file()
+            journal_size = self._journal_size()
+            if stamp == self._file_stamp and journal_size == self._journal_offset:
+                return changed_students, changed_groups
+
+            if stamp == self._file_stamp and journal_size > self._journal_offset and not self.is_dirty():
+                # Apenas novas entradas no diário: aplica-as por ordem
+                end = self._journal_offset
+                for entry, end in self._iter_journal(self._journal_offset):
+                    # Entradas já incluídas no ficheiro (compactação interrompida) são ignoradas
+                    if entry.get("version", 0) <= self.version:
+                        continue
+                    for number, s_data in entry.get("students", {}).items():
+                        self._apply_student_data(number, s_data, changed_students)
+                    for group_id, g_data in entry.get("groups", {}).items():
+                        self._apply_group_data(group_id, g_data, changed_groups)
+                    self.version = max(self.version, entry.get("version", 0))
+                self._discard_journal_tail(end)
+                self._journal_offset = end
+                return changed_students, changed_groups
+
+            records = self._read_disk_records()
+            if records is None:
+                return changed_students, changed_groups
+            disk_version, students, groups = records
+
+            if disk_version == self.version and self._file_stamp is not None and not self.is_dirty():
+                # Apenas o carimbo mudou (ex.: cópia do ficheiro); conteúdo da mesma versão
+                self._file_stamp = stamp
+                return changed_students, changed_groups
+
+            for number, s_data in students.items():
+                self._apply_student_data(number, s_data, changed_students)
+            for number in [n for n in self.students if n not in students]:
+                self._apply_student_data(number, None, changed_students)
+            for group_id, g_data in groups.items():
+                self._apply_group_data(group_id, g_data, changed_groups)
+            for group_id in [g for g in self.groups if g not in groups]:
+                self._apply_group_data(group_id, None, changed_groups)
+
+            self.version = disk_version
+            self._file_stamp = stamp
+            self._dirty_students.clear()
+            self._dirty_groups.clear()
+
+        return changed_students, changed_groups
 
     def save_data(self) -> None:
         """
-        Guarda os dados atuais (alunos e grupos) no ficheiro JSON.
-        Sobrescreve o ficheiro existente.
+        Grava as alterações pendentes (registos marcados com mark_dirty).
+        Acrescenta ao diário apenas os registos alterados; se o diário ficar maior do que o
+        ficheiro de dados (ou do que JOURNAL_COMPACT_MAX_BYTES), compacta tudo num ficheiro
+        completo (ver compact). Não faz nada se não houver alterações.
+
+        Lança:
+            DataConflictError: Se outra instância gravou uma versão mais recente entretanto.
         """
-        # Converte todos os objetos em memória para dicionários
+        with self.lock:
+            if not self.is_dirty():
+                return
+            self._check_conflict()
+
+            # Uma entrada por gravação: registo atual de cada alterado (None = removido)
+            entry = {
+                "version": self.version + 1,
+                "students": {n: s.to_dict() if s is not None else None
+                             for n, s in ((n, self.students.get(n)) for n in self._dirty_students)},
+                "groups": {g: grp.to_dict() if grp is not None else None
+                           for g, grp in ((g, self.groups.get(g)) for g in self._dirty_groups)},
+            }
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+
+            file_size = self._file_stamp[1] if self._file_stamp else 0
+            limit = min(max(JOURNAL_COMPACT_MIN_BYTES, file_size), JOURNAL_COMPACT_MAX_BYTES)
+            if self._stat_file() is None or self._journal_offset + len(line) > limit:
+                self._write_full()
+                return
+
+            try:
+                with open(self.journal_file, 'ab') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except IOError as e:
+                print(f"Erro ao guardar dados: {e}")
+                return
+
+            self.version += 1
+            self._journal_offset += len(line)
+            self._dirty_students.clear()
+            self._dirty_groups.clear()
+
+    def compact(self) -> None:
+        """
+        Reescreve o ficheiro de dados completo e esvazia o diário.
+
+        Lança:
+            DataConflictError: Se outra instância gravou uma versão mais recente entretanto.
+        """
+        with self.lock:
+            self._check_conflict()
+            self._write_full()
+
+    def _check_conflict(self) -> None:
+        """Controlo otimista: só permite gravar se os dados gravados ainda estão na versão conhecida."""
+        if self.has_external_changes() and (self._stat_file() is not None or self._journal_size()):
+            if self._disk_version() != self.version:
+                raise DataConflictError("Os dados foram alterados noutra instância da aplicação. A alteração não foi guardada; a lista foi atualizada.")
+
+    def _write_full(self) -> None:
+        """Grava todos os dados num ficheiro novo (atómico) e remove o diário."""
+        # Converte todos os objetos em memória para dicionários (versão primeiro para leitura rápida)
         data = {
-            "students": [s.to_dict() for s in self.students.values()],
-            "groups": [g.to_dict() for g in self.groups.values()]
+            "version": self.version + 1,
+            # Grupos antes dos alunos: ao carregar por blocos, os nomes dos grupos já são conhecidos
+            "groups": [g.to_dict() for g in self.groups.values()],
+            "students": [s.to_dict() for s in self.students.values()]
         }
+        tmp_file = self.data_file + ".tmp"
         try:
-            # Escreve no ficheiro com indentação para legibilidade
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            write_data(tmp_file, data, self.storage_format)
+            os.replace(tmp_file, self.data_file)
+            # As entradas do diário ficam incluídas no ficheiro (e seriam ignoradas pela versão)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
         except IOError as e:
             print(f"Erro ao guardar dados: {e}")
+            return
+
+        self.version += 1
+        self._file_stamp = self._stat_file()
+        self._journal_offset = 0
+        self._dirty_students.clear()
+        self._dirty_groups.clear()
@@ -0,0 +1,86 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+from models.student import Student
+from models.group import Group
+
+
+class _TimestampOrder:
+    """Lista ordenada de (instante, id), atualizada com bisect a cada alteração."""
+    def __init__(self) -> None:
+        self._order: List[Tuple[int, str]] = []
+        self._timestamps: Dict[str, int] = {}
+
+    def rebuild(self, timestamps: Dict[str, int]) -> None:
+        """Substitui todo o conteúdo."""
+        self._timestamps = dict(timestamps)
+        self._order = sorted((ts, row_id) for row_id, ts in self._timestamps.items())
+
+    def set(self, row_id: str, timestamp: Optional[int]) -> None:
+        """Atualiza o instante de um registo (None = registo removido)."""
+        old = self._timestamps.get(row_id)
+        if old == timestamp:
+            return
+        if old is not None:
+            pos = bisect_left(self._order, (old, row_id))
+            if pos < len(self._order) and self._order[pos] == (old, row_id):
+                del self._order[pos]
+            del self._timestamps[row_id]
+        if timestamp is not None:
+            insort(self._order, (timestamp, row_id))
+            self._timestamps[row_id] = timestamp
+
+    def _bounds(self, low: int, high: int) -> Tuple[int, int]:
+        # Os ids são texto: "" fica antes de todos e "\uffff" depois de todos os ids reais
+        return bisect_left(self._order, (low, "")), bisect_right(self._order, (high, "\uffff"))
+
+    def between(self, low: int, high: int) -> List[str]:
+        """IDs com instante entre low e high (inclusive), por ordem cronológica."""
+        start, end = self._bounds(low, high)
+        return [row_id for _, row_id in self._order[start:end]]
+
+    def count_between(self, low: int, high: int) -> int:
+        """Número de registos com instante entre low e high (inclusive), em O(log n)."""
+        start, end = self._bounds(low, high)
+        return max(end - start, 0)
+
+
+class CreationDateIndex:
+    """
+    Índice das datas de criação de alunos e grupos (created_at), por ordem cronológica.
+    Responde a "criados entre X e Y" com procura binária em O(log n + k) e dá a contagem
+    exata em O(log n), usada pelo planeador das consultas para escolher o índice de partida.
+    """
+    def __init__(self) -> None:
+        self._students: _TimestampOrder = _TimestampOrder()
+        self._groups: _TimestampOrder = _TimestampOrder()
+
+    # --- Protocolo de estrutura derivada (ver MainController.add_index) ---
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Reconstrói o índice a partir de todos os registos."""
+        self._students.rebuild({number: s.created_at for number, s in students.items()})
+        self._groups.rebuild({group_id: g.created_at for group_id, g in groups.items()})
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Atualiza a data de um aluno alterado (ou removido)."""
+        self._students.set(student_number, student.created_at if student is not None else None)
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Atualiza a data de um grupo alterado (ou removido)."""
+        self._groups.set(group_id, group.created_at if group is not None else None)
+
+    # --- Consultas ---
+    def students_between(self, low: int, high: int) -> List[str]:
+        """Números dos alunos criados entre low e high (segundos desde a época, inclusive)."""
+        return self._students.between(low, high)
+
+    def count_students_between(self, low: int, high: int) -> int:
+        """Número de alunos criados entre low e high."""
+        return self._students.count_between(low, high)
+
+    def groups_between(self, low: int, high: int) -> List[str]:
+        """IDs dos grupos criados entre low e high (segundos desde a época, inclusive)."""
+        return self._groups.between(low, high)
+
+    def count_groups_between(self, low: int, high: int) -> int:
+        """Número de grupos criados entre low e high."""
+        return self._groups.count_between(low, high)
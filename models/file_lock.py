@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from typing import Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLockTimeout(ValueError):
+    """Lançada quando não é possível obter o bloqueio dentro do tempo limite."""
+
+
+class FileLock:
+    """
+    Bloqueio consultivo entre processos baseado num ficheiro auxiliar.
+    Usa fcntl (Linux/macOS) ou msvcrt (Windows) e é reentrante dentro do mesmo processo,
+    pelo que pode ser adquirido várias vezes pela mesma thread.
+
+    Atributos:
+        path (str): Caminho do ficheiro de bloqueio.
+        timeout (float): Tempo máximo (segundos) de espera pelo bloqueio.
+    """
+    def __init__(self, path: str, timeout: float = 10.0, poll_interval: float = 0.05) -> None:
+        """
+        Inicializa o bloqueio (não o adquire).
+
+        Args:
+            path (str): Caminho do ficheiro de bloqueio.
+            timeout (float, optional): Tempo máximo de espera. Predefinição: 10 segundos.
+            poll_interval (float, optional): Intervalo entre tentativas. Predefinição: 0.05 segundos.
+        """
+        self.path: str = path
+        self.timeout: float = timeout
+        self.poll_interval: float = poll_interval
+        self._handle = None
+        self._depth: int = 0
+        self._thread_lock = threading.RLock()
+
+    def acquire(self) -> None:
+        """
+        Adquire o bloqueio, esperando até ao tempo limite.
+
+        Lança:
+            FileLockTimeout: Se outra instância mantiver o bloqueio durante todo o tempo limite.
+        """
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise FileLockTimeout("Os dados estão bloqueados por outra operação. Tente novamente.")
+        if self._depth == 0:
+            try:
+                self._handle = self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        """Liberta o bloqueio (apenas o liberta no sistema quando a última aquisição termina)."""
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth == 0 and self._handle is not None:
+            self._unlock_file(self._handle)
+            self._handle = None
+        self._thread_lock.release()
+
+    def _lock_file(self):
+        """Abre o ficheiro de bloqueio e tenta bloqueá-lo até ao tempo limite."""
+        handle = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise FileLockTimeout("Os dados estão bloqueados por outra instância da aplicação. Tente novamente.")
+                time.sleep(self.poll_interval)
+
+    def _unlock_file(self, handle) -> None:
+        """Desbloqueia e fecha o ficheiro de bloqueio."""
+        try:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        finally:
+            handle.close()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> Optional[bool]:
+        self.release()
+        return None
@@ -0,0 +1,152 @@
+import heapq
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from models.student import Student
+from models.group import Group
+
+# Separadores de palavras em nomes e emails (espaços, pontos, hífenes, etc.)
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza texto para pesquisa (lowercase e sem acentos)."""
+    if not text:
+        return ""
+    return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII').lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Divide texto normalizado em palavras."""
+    return [t for t in _TOKEN_SPLIT.split(normalize_text(text)) if t]
+
+
+def trigrams(token: str) -> Set[str]:
+    """
+    Trigramas de uma palavra, com espaços nas pontas para valorizar início e fim.
+    Ex.: "ana" -> {"  a", " an", "ana", "na "}.
+    """
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyStudentIndex:
+    """
+    Índice de n-gramas (trigramas) para pesquisa aproximada de alunos.
+    As palavras do nome e do email (parte antes do @) são indexadas uma vez por palavra
+    distinta, e cada palavra aponta para os alunos que a contêm. Uma pesquisa só compara
+    a consulta com as palavras que partilham pelo menos um trigrama, e não com todos os alunos.
+
+    A semelhança entre duas palavras é o coeficiente de Dice dos seus trigramas
+    (2 * comuns / (total A + total B)), tolerante a letras trocadas ou em falta.
+    """
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        """Esvazia o índice."""
+        self._token_students: Dict[str, Set[str]] = {}
+        self._trigram_tokens: Dict[str, Set[str]] = defaultdict(set)
+        self._token_size: Dict[str, int] = {}
+        self._student_tokens: Dict[str, Tuple[str, ...]] = {}
+
+    def _student_words(self, student: Student) -> Tuple[str, ...]:
+        """Palavras indexadas de um aluno (nome, email e número)."""
+        local_part = student.email.split("@", 1)[0]
+        words = tokenize(student.name) + tokenize(local_part) + [student.student_number]
+        return tuple(dict.fromkeys(words))
+
+    def _add_token(self, token: str, student_number: str) -> None:
+        students = self._token_students.get(token)
+        if students is None:
+            students = self._token_students[token] = set()
+            grams = trigrams(token)
+            self._token_size[token] = len(grams)
+            for gram in grams:
+                self._trigram_tokens[gram].add(token)
+        students.add(student_number)
+
+    def _remove_token(self, token: str, student_number: str) -> None:
+        students = self._token_students.get(token)
+        if students is None:
+            return
+        students.discard(student_number)
+        if not students:
+            # Palavra deixou de existir: retira-a das listas de trigramas
+            del self._token_students[token]
+            del self._token_size[token]
+            for gram in trigrams(token):
+                tokens = self._trigram_tokens.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigram_tokens[gram]
+
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Reconstrói o índice a partir de todos os alunos."""
+        self._reset()
+        for number, student in students.items():
+            self.update_student(number, student)
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Atualiza as palavras indexadas de um aluno alterado (ou removido)."""
+        old = self._student_tokens.pop(student_number, ())
+        new = self._student_words(student) if student is not None else ()
+        for token in old:
+            if token not in new:
+                self._remove_token(token, student_number)
+        for token in new:
+            self._add_token(token, student_number)
+        if student is not None:
+            self._student_tokens[student_number] = new
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Os grupos não fazem parte da pesquisa aproximada de alunos."""
+
+    def _similar_tokens(self, word: str, threshold: float) -> Dict[str, float]:
+        """Palavras indexadas semelhantes a uma palavra da consulta, com a semelhança."""
+        grams = trigrams(word)
+        common: Counter = Counter()
+        for gram in grams:
+            tokens = self._trigram_tokens.get(gram)
+            if tokens:
+                common.update(tokens)
+        size = len(grams)
+        result = {}
+        for token, shared in common.items():
+            score = 2.0 * shared / (size + self._token_size[token])
+            if score >= threshold:
+                result[token] = score
+        return result
+
+    def search(self, query: str, limit: int = 50, threshold: float = 0.45) -> List[Tuple[str, float]]:
+        """
+        Pesquisa aproximada por nome, email ou número.
+        Com várias palavras, a pontuação é a média da melhor semelhança de cada palavra.
+
+        Args:
+            query (str): Texto a pesquisar.
+            limit (int, optional): Número máximo de resultados. Predefinição: 50.
+            threshold (float, optional): Semelhança mínima (0 a 1). Predefinição: 0.45.
+
+        Retorna:
+            List[Tuple[str, float]]: Pares (número do aluno, pontuação), do mais para o menos parecido.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        totals: Dict[str, float] = defaultdict(float)
+        for word in words:
+            best: Dict[str, float] = {}
+            for token, score in self._similar_tokens(word, threshold).items():
+                for number in self._token_students[token]:
+                    if score > best.get(number, 0.0):
+                        best[number] = score
+            for number, score in best.items():
+                totals[number] += score
+
+        ranked = ((number, total / len(words)) for number, total in totals.items())
+        ranked = [item for item in ranked if item[1] >= threshold]
+        return heapq.nsmallest(limit, ranked, key=lambda item: (-item[1], item[0]))
@@ -1,5 +1,11 @@
-from typing import List, Dict, Any, Optional
+import heapq
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from models.timestamps import format_datetime, now, parse_datetime
+
+# Entrada da lista de espera: (-prioridade, data do pedido, número do aluno); a ordem natural
+# dos tuplos dá a maior prioridade primeiro e, em caso de empate, o pedido mais antigo
+WaitlistEntry = Tuple[int, str, str]
 
 class Group:
     """
@@ -10,8 +16,10 @@ class Group:
         name (str): Nome do grupo.
         max_capacity (int): Capacidade máxima.
         min_capacity (int): Capacidade mínima.
-        creation_date (str): Data de criação.
+        created_at (int): Data/hora de criação, em segundos desde a época.
+        creation_date (str): A mesma data no formato aaaa-mm-dd HH:MM:SS (usado nos ficheiros).
         student_ids (List[str]): Lista de IDs dos alunos no grupo.
+        waitlist (List[WaitlistEntry]): Lista de espera, mantida como heap (ver heapq).
     """
     def __init__(self, group_id: str, name: str, max_capacity: int, min_capacity: int = 2, creation_date: Optional[str] = None) -> None:
         """
@@ -29,8 +37,28 @@ class Group:
         self.max_capacity: int = int(max_capacity)
         self.min_capacity: int = int(min_capacity)
         # Define a data de criação atual se não for fornecida
-        self.creation_date: str = creation_date if creation_date else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.created_at: int = 0
+        # Texto original de uma data que não foi possível interpretar (mantido tal como estava no ficheiro)
+        self._creation_text: Optional[str] = None
+        if creation_date:
+            self.creation_date = creation_date
+        else:
+            self.created_at = now()
         self.student_ids: List[str] = []  # Lista que armazena apenas os números dos alunos (IDs)
+        self.waitlist: List[WaitlistEntry] = []
+
+    @property
+    def creation_date(self) -> str:
+        """Data de criação no formato aaaa-mm-dd HH:MM:SS."""
+        if self._creation_text is not None:
+            return self._creation_text
+        return format_datetime(self.created_at)
+
+    @creation_date.setter
+    def creation_date(self, value: str) -> None:
+        timestamp = parse_datetime(value)
+        self.created_at = timestamp if timestamp is not None else 0
+        self._creation_text = None if timestamp is not None else value
 
     def add_student(self, student_number: str) -> bool:
         """
@@ -63,6 +91,44 @@ class Group:
             return True
         return False
 
+    def join_waitlist(self, student_number: str, priority: int = 0, requested_at: Optional[str] = None) -> None:
+        """
+        Inscreve um aluno na lista de espera, em O(log n).
+        Não verifica se o aluno já está inscrito (feito no controlador).
+
+        Args:
+            student_number (str): Número do aluno.
+            priority (int, optional): Prioridade (maior é atendido primeiro). Predefinição: 0.
+            requested_at (Optional[str], optional): Data do pedido. Predefinição: agora.
+        """
+        requested_at = requested_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        heapq.heappush(self.waitlist, (-priority, requested_at, student_number))
+
+    def leave_waitlist(self, student_number: str) -> bool:
+        """
+        Retira um aluno da lista de espera.
+
+        Retorna:
+            bool: True se retirado, False se não estava inscrito.
+        """
+        for i, entry in enumerate(self.waitlist):
+            if entry[2] == student_number:
+                # Substitui pela última entrada e repõe a propriedade de heap
+                last = self.waitlist.pop()
+                if i < len(self.waitlist):
+                    self.waitlist[i] = last
+                    heapq.heapify(self.waitlist)
+                return True
+        return False
+
+    def pop_waiting(self) -> Optional[WaitlistEntry]:
+        """Retira e devolve a próxima entrada da lista de espera (O(log n)), ou None se estiver vazia."""
+        return heapq.heappop(self.waitlist) if self.waitlist else None
+
+    def waiting_students(self) -> List[str]:
+        """Números dos alunos em espera, pela ordem em que serão atendidos."""
+        return [entry[2] for entry in sorted(self.waitlist)]
+
     def has_vacancy(self) -> bool:
         """
         Verifica se há vagas no grupo.
@@ -96,7 +162,8 @@ class Group:
             "max_capacity": self.max_capacity,
             "min_capacity": self.min_capacity,
             "creation_date": self.creation_date,
-            "student_ids": self.student_ids
+            "student_ids": self.student_ids,
+            "waitlist": [list(entry) for entry in self.waitlist]
         }
 
     @classmethod
@@ -113,6 +180,7 @@ class Group:
         """
         group = cls(data["group_id"], data["name"], data["max_capacity"], data.get("min_capacity", 2), data.get("creation_date"))
         group.student_ids = data.get("student_ids", [])
+        group.waitlist = [tuple(entry) for entry in data.get("waitlist") or []]
         return group
 
     def __str__(self) -> str:
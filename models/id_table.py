@@ -0,0 +1,56 @@
+from typing import Dict, Iterable, List, Optional
+
+
+class IdTable:
+    """
+    Tabela de internamento de identificadores externos (números de aluno, UUIDs de grupo).
+
+    Cada identificador distinto recebe um código inteiro pequeno e denso (0, 1, 2, ...) e
+    fica guardado como um único objeto de texto. canonical() devolve sempre esse objeto,
+    pelo que as referências (grupo de cada aluno, membros e lista de espera de cada grupo,
+    preferências) partilham a mesma cadeia em vez de uma cópia por ocorrência, como acontece
+    quando são lidas do JSON. Os códigos permitem usar listas indexadas em vez de
+    dicionários nos cálculos sobre muitos registos (ex.: atribuição por preferências).
+
+    Os identificadores nunca são retirados da tabela: os códigos ficam estáveis durante
+    toda a vida da tabela (uma por carregamento dos dados).
+    """
+    def __init__(self, keys: Iterable[str] = ()) -> None:
+        self._codes: Dict[str, int] = {}
+        self._keys: List[str] = []
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key: str) -> int:
+        """Código do identificador, atribuindo um novo se ainda não existir."""
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self._keys)
+            self._keys.append(key)
+        return code
+
+    def canonical(self, key: str) -> str:
+        """Objeto de texto partilhado do identificador (internando-o se for novo)."""
+        code = self._codes.get(key)
+        if code is None:
+            code = self.intern(key)
+        return self._keys[code]
+
+    def canonical_list(self, keys: Iterable[str]) -> List[str]:
+        """canonical() de vários identificadores (ex.: membros de um grupo), numa só chamada."""
+        codes, all_keys = self._codes, self._keys
+        return [all_keys[codes[key]] if key in codes else self.canonical(key) for key in keys]
+
+    def code(self, key: str) -> Optional[int]:
+        """Código do identificador, ou None se nunca foi internado."""
+        return self._codes.get(key)
+
+    def key(self, code: int) -> str:
+        """Identificador externo de um código."""
+        return self._keys[code]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._codes
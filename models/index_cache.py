@@ -0,0 +1,106 @@
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, List
+
+# Incrementar sempre que mudar o estado interno de alguma estrutura guardada em cache,
+# para que as caches antigas sejam ignoradas (e reconstruídas)
+CACHE_FORMAT = 7
+
+
+def user_cache_dir() -> str:
+    """Pasta de caches do utilizador atual (%LOCALAPPDATA% no Windows, $XDG_CACHE_HOME ou ~/.cache nos restantes)."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    return os.path.join(base, "gestor-grupos")
+
+
+def cache_path(data_file: str) -> str:
+    """
+    Ficheiro da cache de um ficheiro de dados, na pasta de caches do utilizador. O nome inclui
+    um resumo do caminho absoluto, para que ficheiros com o mesmo nome em pastas diferentes
+    (ex.: cursos) tenham caches distintas.
+
+    Args:
+        data_file (str): Ficheiro de dados.
+
+    Retorna:
+        str: Caminho da cache.
+    """
+    absolute = os.path.abspath(data_file)
+    digest = hashlib.sha1(absolute.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(user_cache_dir(), f"{os.path.basename(absolute)}-{digest}.cache")
+
+
+class IndexCache:
+    """
+    Cache persistente das estruturas derivadas (estatísticas, ordenações, índices de pesquisa),
+    guardada na pasta de caches do utilizador (ver cache_path).
+
+    A cache fica associada à impressão digital dos dados (versão, data de modificação e tamanho
+    do ficheiro e posição do diário): se os dados não mudaram desde que foi gravada, o arranque
+    restaura as estruturas já calculadas em vez de as reconstruir registo a registo. Uma cache
+    desatualizada, de outro formato ou ilegível é simplesmente ignorada.
+
+    As estruturas são guardadas com pickle, que pode executar código ao ler: por isso a cache
+    nunca fica ao lado do ficheiro de dados, que pode estar numa pasta partilhada onde outros
+    escrevem, mas numa pasta local a que só o próprio utilizador acede.
+
+    Atributos:
+        path (str): Caminho do ficheiro da cache.
+    """
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    def load(self, fingerprint: Any, indexes: List[Any]) -> bool:
+        """
+        Restaura o estado das estruturas, se a cache corresponder aos dados atuais.
+
+        Args:
+            fingerprint (Any): Impressão digital dos dados carregados (ver DataManager.fingerprint).
+            indexes (List[Any]): Estruturas a restaurar (o estado é o seu __dict__).
+
+        Retorna:
+            bool: True se todas as estruturas foram restauradas; False se têm de ser reconstruídas.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError, ValueError, TypeError) as e:
+            print(f"Erro ao carregar cache de índices: {e}")
+            return False
+
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT or data.get("fingerprint") != fingerprint:
+            return False
+        states: Dict[str, Dict[str, Any]] = data.get("indexes", {})
+        if any(type(index).__name__ not in states for index in indexes):
+            return False
+        for index in indexes:
+            index.__dict__.update(states[type(index).__name__])
+        return True
+
+    def save(self, fingerprint: Any, indexes: List[Any]) -> None:
+        """
+        Grava o estado das estruturas de forma atómica (ficheiro temporário + substituição).
+
+        Args:
+            fingerprint (Any): Impressão digital dos dados a que o estado corresponde.
+            indexes (List[Any]): Estruturas a guardar.
+        """
+        data = {
+            "format": CACHE_FORMAT,
+            "fingerprint": fingerprint,
+            "indexes": {type(index).__name__: index.__dict__ for index in indexes},
+        }
+        tmp_file = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.path)
+        except (OSError, pickle.PickleError) as e:
+            print(f"Erro ao guardar cache de índices: {e}")
@@ -0,0 +1,135 @@
+import json
+import re
+from typing import Any, IO, Iterator, Tuple
+
+# Tamanho (caracteres) de cada leitura do ficheiro
+STREAM_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = "0123456789+-.eE"
+_NUMBER_TYPES = (int, float)
+
+
+class _StreamReader:
+    """
+    Leitor incremental de texto JSON: mantém em memória apenas a parte do ficheiro
+    ainda por interpretar (no máximo um bloco mais o elemento em curso).
+    """
+    def __init__(self, f: IO[str], chunk_size: int) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.consumed = 0
+        self.raw_decode = json.JSONDecoder().raw_decode
+
+    def _fill(self) -> bool:
+        """Lê mais um bloco, descartando o que já foi interpretado. Retorna False no fim do ficheiro."""
+        if self.eof:
+            return False
+        more = self.f.read(self.chunk_size)
+        if not more:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + more
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo carácter significativo (sem o consumir), ou "" no fim do ficheiro."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consome um carácter estrutural (ex.: "{" ou ":")."""
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Esperado '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Interpreta o próximo valor JSON completo (lendo mais blocos se estiver cortado)."""
+        while True:
+            buffer = self.buffer
+            pos = self.pos = _WHITESPACE.match(buffer, self.pos).end()
+            try:
+                value, end = self.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Um número no fim do bloco pode continuar no bloco seguinte (ex.: "12" + "3", "1.5e" + "3")
+            if end < len(buffer) and (type(value) not in _NUMBER_TYPES or buffer[end] not in _NUMBER_CHARS):
+                self.pos = end
+                return value
+            if not self._fill():
+                self.pos = end
+                return value
+
+    def next_char(self) -> str:
+        """Consome e devolve o próximo carácter significativo (ex.: "," ou "]")."""
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    @property
+    def offset(self) -> int:
+        """Caracteres já interpretados desde o início do ficheiro."""
+        return self.consumed + self.pos
+
+
+def iter_object_members(f: IO[str], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, str, Any, int]]:
+    """
+    Percorre um objeto JSON de topo sem o carregar por completo.
+    Os membros que são listas são devolvidos elemento a elemento; os restantes, de uma vez.
+
+    Args:
+        f (IO[str]): Ficheiro de texto aberto.
+        chunk_size (int, optional): Caracteres lidos de cada vez. Predefinição: STREAM_CHUNK_SIZE.
+
+    Retorna:
+        Iterator[Tuple[str, str, Any, int]]: (tipo, chave, valor, posição), em que o tipo é "item"
+            para um elemento de uma lista ou "value" para um membro simples; a posição (caracteres
+            já lidos) permite mostrar o progresso.
+
+    Lança:
+        json.JSONDecodeError: Se o texto não for um objeto JSON válido.
+    """
+    reader = _StreamReader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.decode()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Chave inválida", reader.buffer, reader.pos)
+        reader.expect(":")
+
+        if reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    item = reader.decode()
+                    yield "item", key, item, reader.offset
+                    separator = reader.next_char()
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise json.JSONDecodeError("Esperado ',' ou ']'", reader.buffer, reader.pos - 1)
+        else:
+            yield "value", key, reader.decode(), reader.offset
+
+        separator = reader.next_char()
+        if separator == "}":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Esperado ',' ou '}'", reader.buffer, reader.pos - 1)
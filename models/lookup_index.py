@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional, Set
+from models.student import Student
+from models.group import Group
+from models.fuzzy_index import normalize_text
+from models.statistics import email_domain
+
+
+class LookupIndex:
+    """
+    Índices de consulta direta usados pelas validações e pesquisas do controlador:
+    email -> alunos, domínio do email -> alunos, nome de grupo -> grupos, alunos sem grupo, aluno -> grupo em cuja lista
+    de espera está inscrito e o texto normalizado de pesquisa de cada aluno e grupo. Evitam percorrer todos os registos a cada
+    validação de unicidade e normalizar (remover acentos) os textos a cada pesquisa.
+
+    As chaves de email e de nome usam lower(), como as regras de unicidade do controlador.
+    """
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        """Esvazia os índices."""
+        self._email_students: Dict[str, Set[str]] = {}
+        self._domain_students: Dict[str, Set[str]] = {}
+        self._name_groups: Dict[str, Set[str]] = {}
+        self._unassigned: Dict[str, None] = {}
+        # Por aluno: (email, grupo, (nome, email), ordem de criação)
+        self._student_keys: Dict[str, tuple] = {}
+        self._next_order: int = 0
+        self._student_search: Dict[str, str] = {}
+        self._group_search: Dict[str, str] = {}
+        self._group_names: Dict[str, str] = {}
+        self._waiting: Dict[str, str] = {}
+        self._group_waiting: Dict[str, List[str]] = {}
+
+    # --- Protocolo de estrutura derivada (ver MainController.add_index) ---
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Reconstrói os índices a partir de todos os registos."""
+        self._reset()
+        for number, student in students.items():
+            self.update_student(number, student)
+        for group_id, group in groups.items():
+            self.update_group(group_id, group)
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Atualiza as entradas de um aluno alterado (ou removido)."""
+        old = self._student_keys.pop(student_number, None)
+        if old is not None:
+            old_email, _, _, _ = old
+            numbers = self._email_students.get(old_email)
+            if numbers is not None:
+                numbers.discard(student_number)
+                if not numbers:
+                    del self._email_students[old_email]
+            old_domain = email_domain(old_email)
+            numbers = self._domain_students.get(old_domain)
+            if numbers is not None:
+                numbers.discard(student_number)
+                if not numbers:
+                    del self._domain_students[old_domain]
+            self._unassigned.pop(student_number, None)
+        if student is None:
+            self._student_search.pop(student_number, None)
+            return
+
+        email = student.email.lower()
+        self._email_students.setdefault(email, set()).add(student_number)
+        self._domain_students.setdefault(email_domain(email), set()).add(student_number)
+        if not student.group_id:
+            self._unassigned[student_number] = None
+        # Texto de pesquisa: nome, número e email normalizados, separados por um carácter que não aparece
+        # na consulta (substituído no próprio lugar, para manter a ordem dos resultados); só é
+        # recalculado se o nome ou o email mudaram (ex.: não numa mudança de grupo)
+        name_email = (student.name, student.email)
+        if old is None or old[2] != name_email:
+            self._student_search[student_number] = "\x00".join(
+                (normalize_text(student.name), str(student.student_number), normalize_text(student.email)))
+        # A ordem de criação mantém-se nas atualizações (como a posição no dicionário de alunos)
+        if old is not None:
+            order = old[3]
+        else:
+            order = self._next_order
+            self._next_order += 1
+        self._student_keys[student_number] = (email, student.group_id, name_email, order)
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Atualiza as entradas de um grupo alterado (ou removido)."""
+        old_name = self._group_names.pop(group_id, None)
+        if old_name is not None:
+            ids = self._name_groups.get(old_name)
+            if ids is not None:
+                ids.discard(group_id)
+                if not ids:
+                    del self._name_groups[old_name]
+        for number in self._group_waiting.pop(group_id, ()):
+            if self._waiting.get(number) == group_id:
+                del self._waiting[number]
+        if group is None:
+            self._group_search.pop(group_id, None)
+            return
+
+        name = group.name.lower()
+        self._name_groups.setdefault(name, set()).add(group_id)
+        self._group_names[group_id] = name
+        self._group_search[group_id] = normalize_text(group.name)
+        if group.waitlist:
+            waiting = [entry[2] for entry in group.waitlist]
+            self._group_waiting[group_id] = waiting
+            for number in waiting:
+                self._waiting[number] = group_id
+
+    # --- Consultas ---
+    def students_with_email(self, email: str) -> Set[str]:
+        """Números dos alunos com este email (sem distinguir maiúsculas)."""
+        return self._email_students.get(email.lower(), set())
+
+    def students_with_domain(self, domain: str) -> Set[str]:
+        """Números dos alunos com email neste domínio (ex.: "my.istec.pt")."""
+        return self._domain_students.get(domain.lower(), set())
+
+    def groups_with_name(self, name: str) -> Set[str]:
+        """IDs dos grupos com este nome (sem distinguir maiúsculas)."""
+        return self._name_groups.get(name.lower(), set())
+
+    def waiting_group(self, student_number: str) -> Optional[str]:
+        """ID do grupo em cuja lista de espera o aluno está inscrito, ou None."""
+        return self._waiting.get(student_number)
+
+    def unassigned_students(self) -> List[str]:
+        """Números dos alunos sem grupo, pela ordem de criação (a do dicionário de alunos)."""
+        keys = self._student_keys
+        return sorted(self._unassigned, key=lambda number: keys[number][3])
+
+    def search_students(self, normalized_query: str) -> List[str]:
+        """Números dos alunos cujo nome, número ou email contém o texto (já normalizado)."""
+        if "\x00" in normalized_query:
+            return []
+        return [number for number, text in self._student_search.items() if normalized_query in text]
+
+    def student_matches(self, student_number: str, normalized_query: str) -> bool:
+        """True se o nome, número ou email do aluno contém o texto (já normalizado)."""
+        return "\x00" not in normalized_query and normalized_query in self._student_search.get(student_number, "")
+
+    def search_groups(self, normalized_query: str) -> List[str]:
+        """IDs dos grupos cujo nome contém o texto (já normalizado)."""
+        return [group_id for group_id, text in self._group_search.items() if normalized_query in text]
+
+    def group_matches(self, group_id: str, normalized_query: str) -> bool:
+        """True se o nome do grupo contém o texto (já normalizado)."""
+        return normalized_query in self._group_search.get(group_id, "")
@@ -0,0 +1,216 @@
+import heapq
+import random
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Set
+from models.student import Student
+from models.group import Group
+from models.id_table import IdTable
+
+# Número máximo de grupos que um aluno pode indicar nas suas preferências
+MAX_PREFERENCES = 10
+
+# Posição atribuída aos alunos colocados fora das suas preferências para completar um grupo
+FILLER_RANK = 0
+
+
+class MatchingResult:
+    """
+    Resultado de uma atribuição de alunos a grupos por preferências.
+
+    Atributos:
+        assignments (Dict[str, str]): Número do aluno -> ID do grupo atribuído.
+        ranks (Dict[str, int]): Número do aluno -> posição do grupo nas suas preferências
+            (1 = primeira escolha; FILLER_RANK se foi colocado para completar um grupo).
+        unmatched (List[str]): Alunos com preferências que ficaram sem grupo.
+        closed_groups (List[str]): Grupos que não atingiriam a capacidade mínima e ficaram por usar.
+        participants (int): Alunos sem grupo e com preferências considerados.
+    """
+    def __init__(self, assignments: Dict[str, str], ranks: Dict[str, int], unmatched: List[str],
+                 closed_groups: List[str], participants: int) -> None:
+        self.assignments: Dict[str, str] = assignments
+        self.ranks: Dict[str, int] = ranks
+        self.unmatched: List[str] = unmatched
+        self.closed_groups: List[str] = closed_groups
+        self.participants: int = participants
+
+    @property
+    def rank_counts(self) -> Counter:
+        """Número de alunos por posição do grupo atribuído (sem os colocados para completar grupos)."""
+        return Counter(rank for rank in self.ranks.values() if rank != FILLER_RANK)
+
+    @property
+    def filler_count(self) -> int:
+        """Alunos colocados fora das preferências para completar a capacidade mínima de um grupo."""
+        return sum(1 for rank in self.ranks.values() if rank == FILLER_RANK)
+
+    def choice_rate(self, top: int = 1) -> float:
+        """Fração dos participantes que ficou numa das suas 'top' primeiras escolhas."""
+        if not self.participants:
+            return 0.0
+        counts = self.rank_counts
+        return sum(counts[rank] for rank in range(1, top + 1)) / self.participants
+
+    @property
+    def average_rank(self) -> float:
+        """Posição média do grupo atribuído, entre os alunos colocados numa das suas preferências."""
+        counts = self.rank_counts
+        total = sum(counts.values())
+        return sum(rank * count for rank, count in counts.items()) / total if total else 0.0
+
+    def describe(self) -> List[str]:
+        """Resumo legível das estatísticas de satisfação."""
+        counts = self.rank_counts
+        lines = [
+            f"Participantes: {self.participants}",
+            f"Alunos colocados: {len(self.assignments)}",
+            f"1.ª escolha: {self.choice_rate(1):.1%} | 3 primeiras: {self.choice_rate(3):.1%}",
+            f"Posição média: {self.average_rank:.2f}",
+        ]
+        lines.extend(f"  {rank}.ª escolha: {counts[rank]}" for rank in sorted(counts))
+        if self.filler_count:
+            lines.append(f"Colocados para completar grupos: {self.filler_count}")
+        lines.append(f"Sem grupo: {len(self.unmatched)}")
+        if self.closed_groups:
+            lines.append(f"Grupos sem o mínimo de alunos (não usados): {len(self.closed_groups)}")
+        return lines
+
+
+def match_students(students: Dict[str, Student], groups: Dict[str, Group], seed: Optional[int] = None,
+                   fill_minimum: bool = True) -> MatchingResult:
+    """
+    Atribui os alunos sem grupo aos grupos segundo as suas preferências, com o algoritmo de
+    aceitação diferida (Gale-Shapley) com capacidades, em que os alunos propõem.
+
+    Os empates entre alunos que querem o mesmo grupo são decididos por um sorteio único
+    (com 'seed' o resultado é reprodutível). O resultado é estável: nenhum aluno prefere
+    um grupo onde ficou outro aluno com pior número de sorteio, e nenhum aluno ganha
+    em mentir sobre as suas preferências. Custa O(P log C), com P o total de preferências
+    e C a maior capacidade.
+
+    As vagas de cada grupo são as que sobram (max_capacity menos os membros atuais).
+    Um grupo que recebe alunos mas fica abaixo de min_capacity é completado, se
+    'fill_minimum', com alunos sem grupo que não conseguiram nenhuma preferência (ou não
+    indicaram nenhuma); se não for possível, o grupo fica por usar e os seus candidatos
+    passam à escolha seguinte. Os dados não são alterados.
+
+    Args:
+        students (Dict[str, Student]): Alunos por número.
+        groups (Dict[str, Group]): Grupos por ID.
+        seed (Optional[int], optional): Semente do sorteio. Predefinição: aleatória.
+        fill_minimum (bool, optional): Completar grupos abaixo do mínimo. Predefinição: True.
+
+    Retorna:
+        MatchingResult: Atribuições e estatísticas de satisfação.
+    """
+    # Sorteio: posição de cada aluno sem grupo (menor é melhor). A posição serve também de
+    # código do aluno e os grupos recebem códigos densos (IdTable), pelo que o ciclo principal
+    # usa listas indexadas por inteiros em vez de dicionários indexados por texto
+    unassigned = [number for number, s in students.items() if not s.group_id]
+    random.Random(seed).shuffle(unassigned)
+    student_count = len(unassigned)
+    group_table = IdTable(groups)
+    group_list = [groups[group_table.key(code)] for code in range(len(group_table))]
+    # Preferências como códigos de grupo (-1 para grupos que já não existem, que são saltados
+    # mas continuam a contar para a posição da escolha)
+    prefs: List[List[int]] = [[] for _ in range(student_count)]
+    participants: List[int] = []
+    for code, number in enumerate(unassigned):
+        preferences = students[number].preferences
+        if preferences:
+            prefs[code] = [group_table.code(g) if g in group_table else -1 for g in preferences]
+            participants.append(code)
+    is_participant = [False] * student_count
+    for code in participants:
+        is_participant[code] = True
+
+    sizes = [g.current_size() for g in group_list]
+    capacity = [max(g.max_capacity - size, 0) for g, size in zip(group_list, sizes)]
+    # Alunos aceites por grupo: heap com o pior candidato no topo (-código)
+    held: Dict[int, List[int]] = {}
+    next_choice = [0] * student_count
+    fillers: Set[int] = set()
+    exhausted = [False] * student_count
+    closed = [False] * len(group_list)
+    filler_offset = student_count
+
+    free: Deque[int] = deque(participants)
+    while True:
+        # Aceitação diferida: cada aluno livre propõe ao próximo grupo das suas preferências
+        while free:
+            code = free.popleft()
+            choices = prefs[code]
+            i = next_choice[code]
+            while i < len(choices) and (choices[i] < 0 or not capacity[choices[i]] or closed[choices[i]]):
+                i += 1
+            if i == len(choices):
+                exhausted[code] = True
+                continue
+            group_code = choices[i]
+            next_choice[code] = i + 1
+            heap = held.get(group_code)
+            if heap is None:
+                heap = held[group_code] = []
+            entry = -code
+            if len(heap) < capacity[group_code]:
+                heapq.heappush(heap, entry)
+            elif heap[0] < entry:
+                rejected = -heapq.heapreplace(heap, entry)
+                if rejected >= filler_offset:
+                    fillers.discard(rejected - filler_offset)
+                else:
+                    free.append(rejected)
+            else:
+                free.append(code)
+
+        # Grupos que receberam alunos mas ficam abaixo da capacidade mínima
+        deficient = [gc for gc, heap in held.items() if heap and sizes[gc] + len(heap) < group_list[gc].min_capacity]
+        if not deficient:
+            break
+
+        if fill_minimum:
+            placed = {_student_code(entry, filler_offset) for heap in held.values() for entry in heap}
+            pool = [code for code in range(student_count - 1, -1, -1)
+                    if code not in placed and (exhausted[code] or not is_participant[code])]
+            still_deficient = []
+            for gc in sorted(deficient, key=lambda g: group_list[g].min_capacity - sizes[g] - len(held[g])):
+                heap = held[gc]
+                need = group_list[gc].min_capacity - sizes[gc] - len(heap)
+                if need > len(pool):
+                    still_deficient.append(gc)
+                    continue
+                for _ in range(need):
+                    code = pool.pop()
+                    # Os alunos colocados para completar o grupo são os primeiros a ceder o lugar
+                    heapq.heappush(heap, -(filler_offset + code))
+                    fillers.add(code)
+            deficient = still_deficient
+
+        if not deficient:
+            break
+        for gc in deficient:
+            closed[gc] = True
+            for entry in held.pop(gc):
+                code = _student_code(entry, filler_offset)
+                if code in fillers:
+                    fillers.discard(code)
+                else:
+                    free.append(code)
+
+    assignments: Dict[str, str] = {}
+    ranks: Dict[str, int] = {}
+    for gc, heap in held.items():
+        group_id = group_table.key(gc)
+        for entry in heap:
+            code = _student_code(entry, filler_offset)
+            number = unassigned[code]
+            assignments[number] = group_id
+            ranks[number] = FILLER_RANK if code in fillers else next_choice[code]
+    unmatched = [unassigned[code] for code in participants if unassigned[code] not in assignments]
+    closed_groups = sorted(group_table.key(gc) for gc, is_closed in enumerate(closed) if is_closed)
+    return MatchingResult(assignments, ranks, unmatched, closed_groups, len(participants))
+
+
+def _student_code(entry: int, filler_offset: int) -> int:
+    """Código do aluno de uma entrada de heap (as dos alunos colocados para completar um grupo têm um desvio)."""
+    code = -entry
+    return code - filler_offset if code >= filler_offset else code
@@ -0,0 +1,276 @@
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# Cada nível da árvore consome 5 bits do hash (32 ramos por nó)
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_MISSING = object()
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & ((1 << _HASH_BITS) - 1)
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+class _Node:
+    """Nó interno: mapa de bits dos ramos ocupados e tuplo compacto com as entradas."""
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        # Cada entrada é uma folha (chave, valor) ou um nó filho (_Node/_Collision)
+        self.entries = entries
+
+
+class _Collision:
+    """Nó para chaves com o mesmo hash completo."""
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, key_hash: int, entries: tuple) -> None:
+        self.hash = key_hash
+        self.entries = entries
+
+
+_EMPTY = _Node(0, ())
+
+
+def _merge_leaves(shift: int, leaf_a: tuple, hash_a: int, leaf_b: tuple, hash_b: int):
+    """Cria a subárvore mínima que contém duas folhas com o mesmo prefixo de hash."""
+    if shift >= _HASH_BITS:
+        return _Collision(hash_a, (leaf_a, leaf_b))
+    frag_a = (hash_a >> shift) & _MASK
+    frag_b = (hash_b >> shift) & _MASK
+    if frag_a == frag_b:
+        return _Node(1 << frag_a, (_merge_leaves(shift + _BITS, leaf_a, hash_a, leaf_b, hash_b),))
+    if frag_a < frag_b:
+        return _Node((1 << frag_a) | (1 << frag_b), (leaf_a, leaf_b))
+    return _Node((1 << frag_a) | (1 << frag_b), (leaf_b, leaf_a))
+
+
+def _build(leaves: List[Tuple[int, tuple]], shift: int):
+    """Constrói de uma só vez a subárvore para folhas (hash, (chave, valor)) distintas."""
+    if shift >= _HASH_BITS:
+        return _Collision(leaves[0][0], tuple(leaf for _, leaf in leaves))
+    buckets: Dict[int, List[Tuple[int, tuple]]] = {}
+    for item in leaves:
+        buckets.setdefault((item[0] >> shift) & _MASK, []).append(item)
+    bitmap = 0
+    entries = []
+    for fragment in sorted(buckets):
+        bucket = buckets[fragment]
+        bitmap |= 1 << fragment
+        entries.append(bucket[0][1] if len(bucket) == 1 else _build(bucket, shift + _BITS))
+    return _Node(bitmap, tuple(entries))
+
+
+def _get(node, shift: int, key_hash: int, key) -> Any:
+    while True:
+        if isinstance(node, _Collision):
+            for k, v in node.entries:
+                if k == key:
+                    return v
+            return _MISSING
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+        if isinstance(entry, tuple):
+            return entry[1] if entry[0] == key else _MISSING
+        node = entry
+        shift += _BITS
+
+
+def _set(node, shift: int, key_hash: int, key, value) -> Tuple[Any, bool]:
+    """Devolve (novo nó, True se a chave é nova). Copia apenas o caminho até à folha."""
+    if isinstance(node, _Collision):
+        entries = list(node.entries)
+        for i, (k, v) in enumerate(entries):
+            if k == key:
+                if v is value:
+                    return node, False
+                entries[i] = (key, value)
+                return _Collision(node.hash, tuple(entries)), False
+        return _Collision(node.hash, tuple(entries) + ((key, value),)), True
+
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    idx = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, entries[:idx] + ((key, value),) + entries[idx:]), True
+
+    entry = entries[idx]
+    if isinstance(entry, tuple):
+        if entry[0] == key:
+            if entry[1] is value:
+                return node, False
+            new_entry, added = (key, value), False
+        else:
+            new_entry = _merge_leaves(shift + _BITS, entry, _hash(entry[0]), (key, value), key_hash)
+            added = True
+    else:
+        new_entry, added = _set(entry, shift + _BITS, key_hash, key, value)
+        if new_entry is entry:
+            return node, False
+    return _Node(node.bitmap, entries[:idx] + (new_entry,) + entries[idx + 1:]), added
+
+
+def _delete(node, shift: int, key_hash: int, key):
+    """Devolve o novo nó (None se ficou vazio) ou o próprio nó se a chave não existia."""
+    if isinstance(node, _Collision):
+        entries = tuple(e for e in node.entries if e[0] != key)
+        if len(entries) == len(node.entries):
+            return node
+        if len(entries) == 1:
+            return entries[0]
+        return _Collision(node.hash, entries)
+
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+    idx = _popcount(node.bitmap & (bit - 1))
+    entry = node.entries[idx]
+    if isinstance(entry, tuple):
+        if entry[0] != key:
+            return node
+        new_entry = None
+    else:
+        new_entry = _delete(entry, shift + _BITS, key_hash, key)
+        if new_entry is entry:
+            return node
+        # Um filho com uma única folha é recolhido para este nível
+        if isinstance(new_entry, _Node) and len(new_entry.entries) == 1 and isinstance(new_entry.entries[0], tuple):
+            new_entry = new_entry.entries[0]
+
+    if new_entry is None:
+        bitmap = node.bitmap & ~bit
+        entries = node.entries[:idx] + node.entries[idx + 1:]
+        if not entries:
+            return None
+        return _Node(bitmap, entries)
+    return _Node(node.bitmap, node.entries[:idx] + (new_entry,) + node.entries[idx + 1:])
+
+
+def _iter_items(node) -> Iterator[Tuple[Any, Any]]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        for entry in current.entries:
+            if isinstance(entry, tuple):
+                yield entry
+            else:
+                stack.append(entry)
+
+
+def _diff(a, b, out: List[Tuple[Any, Any, Any]]) -> None:
+    """Acrescenta a 'out' as diferenças (chave, valor em a, valor em b), saltando subárvores partilhadas."""
+    if a is b:
+        return
+    if isinstance(a, _Node) and isinstance(b, _Node):
+        bits = a.bitmap | b.bitmap
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            entry_a = a.entries[_popcount(a.bitmap & (bit - 1))] if a.bitmap & bit else None
+            entry_b = b.entries[_popcount(b.bitmap & (bit - 1))] if b.bitmap & bit else None
+            if entry_a is entry_b:
+                continue
+            if isinstance(entry_a, _Node) and isinstance(entry_b, _Node):
+                _diff(entry_a, entry_b, out)
+            else:
+                _diff_entries(entry_a, entry_b, out)
+        return
+    _diff_entries(a, b, out)
+
+
+def _diff_entries(a, b, out: List[Tuple[Any, Any, Any]]) -> None:
+    """Compara duas entradas de formas diferentes (folha, nó, colisão ou ausente)."""
+    def items(entry) -> Dict[Any, Any]:
+        if entry is None:
+            return {}
+        if isinstance(entry, tuple):
+            return {entry[0]: entry[1]}
+        return dict(_iter_items(entry))
+    items_a, items_b = items(a), items(b)
+    for key, value_a in items_a.items():
+        value_b = items_b.get(key, _MISSING)
+        if value_b is _MISSING:
+            out.append((key, value_a, None))
+        elif value_b is not value_a and value_b != value_a:
+            out.append((key, value_a, value_b))
+    for key, value_b in items_b.items():
+        if key not in items_a:
+            out.append((key, None, value_b))
+
+
+class PersistentMap:
+    """
+    Dicionário imutável com partilha estrutural (árvore HAMT de 32 ramos).
+    set/delete devolvem um novo mapa em O(log32 n), copiando apenas o caminho alterado;
+    as versões anteriores continuam válidas e partilham o resto da árvore.
+    A comparação entre duas versões salta as subárvores partilhadas, custando
+    O(diferenças · log n) em vez de O(n).
+    """
+    __slots__ = ("_root", "_count")
+
+    def __init__(self, _root: Optional[_Node] = None, _count: int = 0) -> None:
+        self._root = _root if _root is not None else _EMPTY
+        self._count = _count
+
+    @classmethod
+    def from_dict(cls, data: Dict[Any, Any]) -> 'PersistentMap':
+        """Constrói um mapa a partir de um dicionário em O(n), sem cópias intermédias."""
+        if not data:
+            return cls()
+        return cls(_build([(_hash(k), (k, v)) for k, v in data.items()], 0), len(data))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key) -> bool:
+        return _get(self._root, 0, _hash(key), key) is not _MISSING
+
+    def __iter__(self) -> Iterator[Any]:
+        for key, _ in _iter_items(self._root):
+            yield key
+
+    def get(self, key, default=None) -> Any:
+        """Valor associado à chave, ou 'default'."""
+        value = _get(self._root, 0, _hash(key), key)
+        return default if value is _MISSING else value
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """Pares (chave, valor), sem ordem definida."""
+        return _iter_items(self._root)
+
+    def set(self, key, value) -> 'PersistentMap':
+        """Novo mapa com a chave associada ao valor."""
+        root, added = _set(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return PersistentMap(root, self._count + (1 if added else 0))
+
+    def delete(self, key) -> 'PersistentMap':
+        """Novo mapa sem a chave (o próprio mapa se a chave não existir)."""
+        root = _delete(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+        if root is None:
+            return PersistentMap(None, 0)
+        if isinstance(root, tuple):
+            # A raiz ficou com uma única folha vinda de uma colisão
+            root = _Node(1 << (_hash(root[0]) & _MASK), (root,))
+        return PersistentMap(root, self._count - 1)
+
+    def diff(self, other: 'PersistentMap') -> List[Tuple[Any, Any, Any]]:
+        """
+        Diferenças para outra versão do mapa.
+
+        Retorna:
+            List[Tuple[Any, Any, Any]]: (chave, valor aqui, valor em 'other'); None indica ausência.
+        """
+        out: List[Tuple[Any, Any, Any]] = []
+        _diff(self._root, other._root, out)
+        return out
@@ -0,0 +1,144 @@
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, List, Optional, Set, Tuple
+
+# Entrada de uma ordenação: (chave da coluna, id do registo)
+SortEntry = Tuple[Any, str]
+
+
+class Page:
+    """
+    Uma página de resultados de uma consulta (query_students / query_groups).
+
+    Atributos:
+        items (List[Any]): Registos (alunos ou grupos) da página, pela ordem pedida.
+        total (int): Número total de registos que satisfazem os filtros (em todas as páginas).
+        next_cursor (Optional[str]): Cursor para pedir a página seguinte (None se esta for a última).
+    """
+    def __init__(self, items: List[Any], total: int, next_cursor: Optional[str]) -> None:
+        self.items: List[Any] = items
+        self.total: int = total
+        self.next_cursor: Optional[str] = next_cursor
+
+    @property
+    def has_more(self) -> bool:
+        """True se existirem registos depois desta página."""
+        return self.next_cursor is not None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def _as_tuple(value: Any) -> Any:
+    """Reconstrói as chaves de ordenação (tuplos) depois de passarem por JSON (listas)."""
+    if isinstance(value, list):
+        return tuple(_as_tuple(v) for v in value)
+    return value
+
+
+def encode_cursor(column: str, descending: bool, entry: SortEntry) -> str:
+    """
+    Cursor opaco que identifica a posição a seguir ao último registo de uma página.
+    Guarda a chave de ordenação e o id (e não a posição), pelo que continua válido
+    mesmo que entretanto sejam criados ou removidos registos antes dele.
+
+    Args:
+        column (str): Coluna de ordenação.
+        descending (bool): Ordem decrescente.
+        entry (SortEntry): Último registo entregue, como (chave, id).
+
+    Retorna:
+        str: Cursor (texto seguro para URLs).
+    """
+    key, row_id = entry
+    data = json.dumps([column, descending, key, row_id], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, column: str, descending: bool) -> SortEntry:
+    """
+    Lê um cursor criado por encode_cursor.
+
+    Args:
+        cursor (str): Cursor recebido da página anterior.
+        column (str): Coluna de ordenação da consulta atual.
+        descending (bool): Ordem da consulta atual.
+
+    Retorna:
+        SortEntry: (chave, id) do último registo da página anterior.
+
+    Lança:
+        ValueError: Se o cursor for inválido ou de outra ordenação.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        cursor_column, cursor_descending, key, row_id = data
+    except (binascii.Error, UnicodeError, json.JSONDecodeError, ValueError, TypeError, AttributeError):
+        raise ValueError("Cursor inválido.")
+    if cursor_column != column or cursor_descending != descending:
+        raise ValueError("O cursor não corresponde à ordenação pedida.")
+    if not isinstance(row_id, str):
+        raise ValueError("Cursor inválido.")
+    return (_as_tuple(key), row_id)
+
+
+def page_entries(order: List[SortEntry], descending: bool, offset: int, limit: Optional[int],
+                 after: Optional[SortEntry] = None, candidates: Optional[Set[str]] = None) -> List[SortEntry]:
+    """
+    Recorta uma página de uma ordenação crescente de (chave, id), sem copiar a lista inteira.
+
+    Com 'after' (cursor), a página começa logo a seguir a essa entrada (procura binária);
+    'offset' salta ainda esse número de registos. Com 'candidates', só contam os ids
+    desse conjunto: a ordenação é percorrida a partir do início da página até juntar
+    'limit' registos, o que compensa quando os candidatos são uma boa parte do total.
+
+    Args:
+        order (List[SortEntry]): Entradas por ordem crescente.
+        descending (bool): Percorrer do fim para o início.
+        offset (int): Registos a saltar.
+        limit (Optional[int]): Tamanho máximo da página (None = até ao fim).
+        after (Optional[SortEntry], optional): Última entrada da página anterior.
+        candidates (Optional[Set[str]], optional): Ids admitidos (None = todos).
+
+    Retorna:
+        List[SortEntry]: Entradas da página, pela ordem pedida.
+
+    Lança:
+        ValueError: Se a entrada do cursor não for comparável com as da ordenação.
+    """
+    try:
+        if descending:
+            start = len(order) - 1 if after is None else bisect_left(order, after) - 1
+        else:
+            start = 0 if after is None else bisect_right(order, after)
+    except TypeError:
+        # Chave do cursor com um tipo que não é comparável com as da coluna
+        raise ValueError("Cursor inválido.")
+
+    if candidates is None:
+        if descending:
+            stop = start - offset + 1
+            first = stop - limit if limit is not None else 0
+            return order[max(first, 0):max(stop, 0)][::-1]
+        first = start + offset
+        return order[first:first + limit] if limit is not None else order[first:]
+
+    entries: List[SortEntry] = []
+    step = -1 if descending else 1
+    i = start
+    skip = offset
+    while 0 <= i < len(order) and (limit is None or len(entries) < limit):
+        entry = order[i]
+        i += step
+        if entry[1] not in candidates:
+            continue
+        if skip:
+            skip -= 1
+            continue
+        entries.append(entry)
+    return entries
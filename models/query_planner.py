@@ -0,0 +1,99 @@
+from typing import Callable, Iterable, List, Optional, Set
+from models.timestamps import SECONDS_PER_DAY, parse_date
+
+
+def parse_filter_date(text: str, end_of_day: bool = False) -> int:
+    """
+    Converte uma data de filtro 'dd/mm/aaaa' num instante comparável com created_at.
+
+    Args:
+        text (str): Data escrita pelo utilizador.
+        end_of_day (bool, optional): Se True, devolve o último segundo do dia (limite superior
+            inclusivo de um intervalo). Predefinição: False (início do dia).
+
+    Lança:
+        ValueError: Se a data não estiver no formato dd/mm/aaaa.
+    """
+    timestamp = parse_date(str(text).strip())
+    if timestamp is None:
+        raise ValueError(f"Data inválida: {text} (use dd/mm/aaaa).")
+    return timestamp + SECONDS_PER_DAY - 1 if end_of_day else timestamp
+
+
+class FilterTerm:
+    """
+    Uma condição de uma consulta composta.
+
+    Atributos:
+        name (str): Descrição da condição (ex.: "domain=my.istec.pt"), usada em QueryPlan.describe.
+        test (Callable[[str], bool]): Verifica a condição para um ID de registo.
+        lookup (Optional[Callable[[], Iterable[str]]]): Devolve os IDs que a satisfazem a partir de
+            um índice (None se só for possível verificar registo a registo).
+        estimate (Optional[int]): Número de IDs que o índice devolve, conhecido sem o consultar
+            (None se desconhecido).
+    """
+    def __init__(self, name: str, test: Callable[[str], bool],
+                 lookup: Optional[Callable[[], Iterable[str]]] = None, estimate: Optional[int] = None) -> None:
+        self.name: str = name
+        self.test: Callable[[str], bool] = test
+        self.lookup: Optional[Callable[[], Iterable[str]]] = lookup
+        self.estimate: Optional[int] = estimate
+
+
+class QueryPlan:
+    """
+    Plano de execução de uma consulta composta: um índice de partida (o mais seletivo)
+    e as restantes condições, verificadas por ordem de seletividade sobre os candidatos.
+
+    Atributos:
+        driver (Optional[FilterTerm]): Condição cujo índice fornece os candidatos (None = todos os registos).
+        residual (List[FilterTerm]): Condições verificadas registo a registo.
+    """
+    def __init__(self, driver: Optional[FilterTerm], residual: List[FilterTerm]) -> None:
+        self.driver: Optional[FilterTerm] = driver
+        self.residual: List[FilterTerm] = residual
+
+    def execute(self, universe: Iterable[str]) -> Optional[Set[str]]:
+        """
+        Executa o plano.
+
+        Args:
+            universe (Iterable[str]): Todos os IDs (percorridos só se nenhuma condição tiver índice).
+
+        Retorna:
+            Optional[Set[str]]: IDs que satisfazem todas as condições (None se não houver condições).
+        """
+        if self.driver is None and not self.residual:
+            return None
+        candidates = self.driver.lookup() if self.driver is not None else universe
+        tests = [term.test for term in self.residual]
+        return {row_id for row_id in candidates if all(test(row_id) for test in tests)}
+
+    def describe(self) -> List[str]:
+        """Resumo legível do plano (para diagnóstico)."""
+        if self.driver is None:
+            lines = ["percorrer todos os registos"]
+        else:
+            lines = [f"índice {self.driver.name} (~{self.driver.estimate})"]
+        lines.extend(f"verificar {term.name}" for term in self.residual)
+        return lines
+
+
+def plan_query(terms: List[FilterTerm]) -> QueryPlan:
+    """
+    Escolhe o plano de uma consulta composta: parte do índice com menor estimativa
+    (o mais seletivo) e verifica as restantes condições nos candidatos, começando
+    pelas mais seletivas para que 'all' pare o mais cedo possível.
+
+    Args:
+        terms (List[FilterTerm]): Condições da consulta (combinadas com "e").
+
+    Retorna:
+        QueryPlan: Plano a executar.
+    """
+    indexed = [term for term in terms if term.lookup is not None and term.estimate is not None]
+    driver = min(indexed, key=lambda term: term.estimate) if indexed else None
+    unknown = float('inf')
+    residual = sorted((term for term in terms if term is not driver),
+                      key=lambda term: term.estimate if term.estimate is not None else unknown)
+    return QueryPlan(driver, residual)
@@ -0,0 +1,280 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from models.student import Student
+from models.group import Group
+from models.change_log import RecordImage, student_image, group_image, freeze_record, thaw_record
+from models.persistent_map import PersistentMap
+
+
+class Snapshot:
+    """
+    Estado congelado dos alunos e grupos num dado momento.
+    Guarda apenas as raízes de dois mapas persistentes, por isso é criado em O(1)
+    e continua legível enquanto os dados atuais são alterados.
+
+    Atributos:
+        label (str): Nome do instantâneo (ex.: "Início do projeto").
+        created_at (str): Data de criação.
+        students (PersistentMap): Número -> imagem do aluno.
+        groups (PersistentMap): ID -> imagem do grupo.
+    """
+    __slots__ = ("label", "created_at", "students", "groups")
+
+    def __init__(self, label: str, created_at: str, students: PersistentMap, groups: PersistentMap) -> None:
+        self.label: str = label
+        self.created_at: str = created_at
+        self.students: PersistentMap = students
+        self.groups: PersistentMap = groups
+
+    def get_student(self, student_number: str) -> Optional[Student]:
+        """Aluno tal como estava no instantâneo (cópia independente)."""
+        image = self.students.get(student_number)
+        return Student.from_dict(thaw_record(image)) if image is not None else None
+
+    def get_group(self, group_id: str) -> Optional[Group]:
+        """Grupo tal como estava no instantâneo (cópia independente)."""
+        image = self.groups.get(group_id)
+        return Group.from_dict(thaw_record(image)) if image is not None else None
+
+
+class SnapshotDiff:
+    """
+    Diferenças entre dois instantâneos.
+
+    Atributos:
+        students (List[Tuple[str, RecordImage, RecordImage]]): (número, antes, depois).
+        groups (List[Tuple[str, RecordImage, RecordImage]]): (ID, antes, depois).
+    """
+    def __init__(self, students: List[Tuple[str, RecordImage, RecordImage]], groups: List[Tuple[str, RecordImage, RecordImage]]) -> None:
+        self.students = students
+        self.groups = groups
+
+    def is_empty(self) -> bool:
+        return not self.students and not self.groups
+
+    def describe(self) -> List[str]:
+        """Descrição legível de cada diferença."""
+        lines = []
+        for number, before, after in sorted(self.students, key=lambda item: item[0]):
+            if before is None:
+                lines.append(f"+ Aluno {number} ({after['name']})")
+            elif after is None:
+                lines.append(f"- Aluno {number} ({before['name']})")
+            else:
+                fields = [k for k in after if before.get(k) != after.get(k)]
+                lines.append(f"~ Aluno {number} ({after['name']}): {', '.join(fields)}")
+        for group_id, before, after in self.groups:
+            if before is None:
+                lines.append(f"+ Grupo {after['name']}")
+            elif after is None:
+                lines.append(f"- Grupo {before['name']}")
+            else:
+                added = [s for s in after["student_ids"] if s not in before["student_ids"]]
+                removed = [s for s in before["student_ids"] if s not in after["student_ids"]]
+                parts = [k for k in after if k not in ("student_ids", "waitlist") and before.get(k) != after.get(k)]
+                if added:
+                    parts.append("entraram " + ", ".join(added))
+                if removed:
+                    parts.append("saíram " + ", ".join(removed))
+                if (before.get("waitlist") or []) != (after.get("waitlist") or []):
+                    parts.append("lista de espera")
+                lines.append(f"~ Grupo {after['name']}: {'; '.join(parts)}")
+        return lines
+
+
+class SnapshotStore:
+    """
+    Modelo versionado dos dados com partilha estrutural.
+    Mantém uma versão persistente (imutável) dos alunos e grupos, atualizada registo a
+    registo em O(log n) a cada alteração; um instantâneo é apenas uma referência a essa
+    versão. Instantâneos consecutivos partilham quase toda a árvore, pelo que a memória
+    extra é proporcional às alterações entre eles.
+
+    A versão persistente duplica os dados em memória, pelo que só é construída (e o ficheiro
+    de instantâneos só é lido) no primeiro pedido de instantâneos; até lá, as alterações
+    não custam nada.
+
+    Os instantâneos são guardados num ficheiro JSONL em que cada linha contém apenas
+    as diferenças para o instantâneo anterior desta instância, indicado em "base"
+    (o primeiro contém o estado completo).
+
+    Atributos:
+        path (Optional[str]): Ficheiro onde os instantâneos são guardados.
+    """
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path: Optional[str] = path
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._students: PersistentMap = PersistentMap()
+        self._groups: PersistentMap = PersistentMap()
+        # Dados atuais (os dicionários do DataManager), usados para construir a versão persistente
+        self._source: Tuple[Dict[str, Student], Dict[str, Group]] = ({}, {})
+        self._built: bool = False
+
+    # --- Protocolo de estrutura derivada (ver MainController.add_index) ---
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Descarta a versão atual; é reconstruída no próximo pedido de instantâneos (ver _ensure_built)."""
+        self._source = (students, groups)
+        self._snapshots = {}
+        self._students, self._groups = PersistentMap(), PersistentMap()
+        self._built = False
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Atualiza um aluno na versão atual (se já estiver construída)."""
+        if not self._built:
+            return
+        if student is None:
+            self._students = self._students.delete(student_number)
+            return
+        image = student_image(student)
+        if self._students.get(student_number) != image:
+            self._students = self._students.set(student_number, image)
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Atualiza um grupo na versão atual (se já estiver construída)."""
+        if not self._built:
+            return
+        if group is None:
+            self._groups = self._groups.delete(group_id)
+            return
+        image = group_image(group)
+        if self._groups.get(group_id) != image:
+            self._groups = self._groups.set(group_id, image)
+
+    def _ensure_built(self) -> None:
+        """Reabre os instantâneos guardados em ficheiro e constrói a versão atual, se ainda não o foram."""
+        if self._built:
+            return
+        self._built = True
+        students, groups = self._source
+        self.load()
+
+        if not self._snapshots:
+            self._students = PersistentMap.from_dict({n: student_image(s) for n, s in students.items()})
+            self._groups = PersistentMap.from_dict({g: group_image(group) for g, group in groups.items()})
+            return
+
+        # Parte do último instantâneo para que a versão atual partilhe a sua árvore
+        last = list(self._snapshots.values())[-1]
+        self._students, self._groups = last.students, last.groups
+        for number in [n for n in self._students if n not in students]:
+            self._students = self._students.delete(number)
+        for group_id in [g for g in self._groups if g not in groups]:
+            self._groups = self._groups.delete(group_id)
+        for number, student in students.items():
+            self.update_student(number, student)
+        for group_id, group in groups.items():
+            self.update_group(group_id, group)
+
+    # --- Instantâneos ---
+    def all(self) -> List[Snapshot]:
+        """Instantâneos guardados, pela ordem de criação."""
+        self._ensure_built()
+        return list(self._snapshots.values())
+
+    def current(self) -> Snapshot:
+        """Instantâneo (sem nome) do estado atual, em O(1) depois da primeira utilização."""
+        self._ensure_built()
+        return Snapshot("Atual", datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self._students, self._groups)
+
+    def take(self, label: str) -> Snapshot:
+        """
+        Cria um instantâneo com nome do estado atual (O(1) em memória).
+
+        Args:
+            label (str): Nome do instantâneo.
+
+        Retorna:
+            Snapshot: O instantâneo criado.
+
+        Lança:
+            ValueError: Se o nome estiver vazio ou já existir.
+        """
+        label = label.strip()
+        if not label:
+            raise ValueError("O nome do instantâneo é obrigatório.")
+        self._ensure_built()
+        if label in self._snapshots:
+            raise ValueError("Já existe um instantâneo com esse nome.")
+        previous = list(self._snapshots.values())[-1] if self._snapshots else None
+        snapshot = self.current()
+        snapshot.label = label
+        self._snapshots[label] = snapshot
+        self._append(snapshot, previous)
+        return snapshot
+
+    def get(self, label: Optional[str]) -> Snapshot:
+        """Instantâneo pelo nome (None = estado atual)."""
+        if label is None:
+            return self.current()
+        self._ensure_built()
+        if label not in self._snapshots:
+            raise ValueError("Instantâneo não encontrado.")
+        return self._snapshots[label]
+
+    def diff(self, old_label: Optional[str], new_label: Optional[str] = None) -> SnapshotDiff:
+        """
+        Diferenças entre dois instantâneos (None = estado atual).
+        Custa O(diferenças · log n) graças à partilha estrutural.
+        """
+        old = self.get(old_label)
+        new = self.get(new_label)
+        return SnapshotDiff(old.students.diff(new.students), old.groups.diff(new.groups))
+
+    # --- Persistência ---
+    def _append(self, snapshot: Snapshot, previous: Optional[Snapshot]) -> None:
+        """Acrescenta um instantâneo ao ficheiro, guardando só as diferenças para o anterior."""
+        if not self.path:
+            return
+        if previous is None:
+            students = {k: v for k, v in snapshot.students.items()}
+            groups = {k: v for k, v in snapshot.groups.items()}
+        else:
+            students = {k: new for k, _, new in previous.students.diff(snapshot.students)}
+            groups = {k: new for k, _, new in previous.groups.diff(snapshot.groups)}
+        record = {
+            "label": snapshot.label,
+            "created_at": snapshot.created_at,
+            "base": previous.label if previous else None,
+            "students": {k: thaw_record(v) if v is not None else None for k, v in students.items()},
+            "groups": {k: thaw_record(v) if v is not None else None for k, v in groups.items()},
+        }
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+        except IOError as e:
+            print(f"Erro ao guardar instantâneo: {e}")
+
+    def load(self) -> None:
+        """
+        Reabre os instantâneos guardados, reconstruindo a partilha estrutural entre eles.
+        Cada linha guarda as diferenças para o instantâneo indicado em "base" (que, com o
+        ficheiro partilhado por várias instâncias, não é necessariamente a linha anterior).
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        empty = PersistentMap()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record: Dict[str, Any] = json.loads(line)
+                    label = record["label"]
+                    base = record.get("base")
+                    if base is None:
+                        students, groups = empty, empty
+                    elif base in self._snapshots:
+                        students, groups = self._snapshots[base].students, self._snapshots[base].groups
+                    else:
+                        print(f"Instantâneo '{label}' ignorado: o instantâneo base '{base}' não existe.")
+                        continue
+                    for key, data in record.get("students", {}).items():
+                        students = students.delete(key) if data is None else students.set(key, freeze_record(data))
+                    for key, data in record.get("groups", {}).items():
+                        groups = groups.delete(key) if data is None else groups.set(key, freeze_record(data))
+                    self._snapshots[label] = Snapshot(label, record.get("created_at", ""), students, groups)
+        except (json.JSONDecodeError, KeyError, IOError) as e:
+            print(f"Erro ao carregar instantâneos: {e}")
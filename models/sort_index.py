@@ -0,0 +1,219 @@
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from models.student import Student
+from models.group import Group
+from models.query import SortEntry, page_entries
+
+# Um subconjunto menor do que 1/_SUBSET_SORT_RATIO dos registos é ordenado à parte;
+# um maior é recortado da ordenação em cache da coluna
+_SUBSET_SORT_RATIO = 16
+
+
+def collation_key(text: str) -> Tuple[str, str]:
+    """
+    Chave de ordenação alfabética independente de acentos e maiúsculas.
+    "Álvaro" fica junto de "Alvaro" e antes de "Bruno", como num dicionário português;
+    o texto original (casefold) desempata palavras que só diferem nos acentos.
+
+    Args:
+        text (str): Texto a ordenar.
+
+    Retorna:
+        Tuple[str, str]: Chave primária (sem acentos) e secundária (com acentos).
+    """
+    folded = text.casefold()
+    base = unicodedata.normalize('NFKD', folded).encode('ASCII', 'ignore').decode('ASCII')
+    return (base, folded)
+
+
+def number_key(student_number: str) -> Tuple[int, str]:
+    """Chave numérica para números de estudante (valores não numéricos ficam no fim)."""
+    if student_number.isdigit():
+        return (int(student_number), student_number)
+    return (2 ** 63, student_number)
+
+
+class _SortedColumns:
+    """
+    Base para ordenações em cache por coluna.
+    Guarda as chaves pré-calculadas de cada registo e, para cada coluna já pedida,
+    uma lista ordenada de (chave, id) atualizada com bisect a cada alteração.
+    """
+    columns: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self._row_keys: Dict[str, tuple] = {}
+        self._orders: Dict[str, List[Tuple[Any, str]]] = {}
+
+    def _column_key(self, keys: tuple, column: str) -> Any:
+        """Chave de uma coluna a partir das chaves guardadas do registo."""
+        return keys[self.columns.index(column)]
+
+    def _set_row(self, row_id: str, keys: Optional[tuple]) -> None:
+        """Substitui as chaves de um registo nas ordenações já construídas."""
+        old = self._row_keys.pop(row_id, None)
+        for column, order in self._orders.items():
+            if old is not None:
+                entry = (self._column_key(old, column), row_id)
+                pos = bisect_left(order, entry)
+                if pos < len(order) and order[pos] == entry:
+                    del order[pos]
+            if keys is not None:
+                insort(order, (self._column_key(keys, column), row_id))
+        if keys is not None:
+            self._row_keys[row_id] = keys
+
+    def invalidate(self, column: Optional[str] = None) -> None:
+        """Descarta a ordenação em cache de uma coluna (ou de todas)."""
+        if column is None:
+            self._orders.clear()
+        else:
+            self._orders.pop(column, None)
+
+    def _order(self, column: str) -> List[Tuple[Any, str]]:
+        """Ordenação crescente de (chave, id) de uma coluna, construída na primeira chamada."""
+        if column not in self.columns:
+            raise ValueError(f"Coluna de ordenação desconhecida: {column}.")
+        order = self._orders.get(column)
+        if order is None:
+            order = sorted((self._column_key(keys, column), row_id) for row_id, keys in self._row_keys.items())
+            self._orders[column] = order
+        return order
+
+    def sorted_ids(self, column: str, descending: bool = False) -> List[str]:
+        """
+        IDs de todos os registos ordenados por uma coluna.
+        A primeira chamada ordena; as seguintes (e a inversão) reutilizam a cache.
+
+        Args:
+            column (str): Nome da coluna.
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+
+        Retorna:
+            List[str]: IDs ordenados.
+        """
+        order = self._order(column)
+        if descending:
+            return [row_id for _, row_id in reversed(order)]
+        return [row_id for _, row_id in order]
+
+    def page(self, column: str, descending: bool = False, offset: int = 0, limit: Optional[int] = None,
+             after: Optional[SortEntry] = None, row_ids: Optional[Set[str]] = None) -> List[SortEntry]:
+        """
+        Uma página de registos ordenados por uma coluna, sem ordenar nem copiar o resto.
+
+        Sem 'row_ids', recorta a ordenação em cache. Com um subconjunto grande (ex.: uma
+        pesquisa que devolve boa parte dos alunos), percorre a ordenação em cache saltando
+        os ids de fora; com um subconjunto pequeno, ordena apenas esse subconjunto.
+
+        Args:
+            column (str): Nome da coluna.
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+            offset (int, optional): Registos a saltar. Predefinição: 0.
+            limit (Optional[int], optional): Tamanho da página. Predefinição: sem limite.
+            after (Optional[SortEntry], optional): Última entrada da página anterior (cursor).
+            row_ids (Optional[Set[str]], optional): Ids admitidos (filtros). Predefinição: todos.
+
+        Retorna:
+            List[SortEntry]: (chave, id) dos registos da página, pela ordem pedida.
+        """
+        if row_ids is not None and len(row_ids) * _SUBSET_SORT_RATIO < len(self._row_keys):
+            if column not in self.columns:
+                raise ValueError(f"Coluna de ordenação desconhecida: {column}.")
+            keys = self._row_keys
+            subset = sorted((self._column_key(keys[rid], column), rid) for rid in row_ids if rid in keys)
+            return page_entries(subset, descending, offset, limit, after)
+        return page_entries(self._order(column), descending, offset, limit, after, row_ids)
+
+    def sort_ids(self, row_ids: Iterable[str], column: str, descending: bool = False) -> List[str]:
+        """
+        Ordena um subconjunto de IDs (ex.: resultados de pesquisa) com as chaves pré-calculadas.
+
+        Args:
+            row_ids (Iterable[str]): IDs a ordenar.
+            column (str): Nome da coluna.
+            descending (bool, optional): Ordem decrescente. Predefinição: False.
+
+        Retorna:
+            List[str]: IDs ordenados (os desconhecidos ficam no fim).
+        """
+        if column not in self.columns:
+            raise ValueError(f"Coluna de ordenação desconhecida: {column}.")
+        row_ids = list(row_ids)
+        known = [rid for rid in row_ids if rid in self._row_keys]
+        unknown = [rid for rid in row_ids if rid not in self._row_keys]
+        known.sort(key=lambda rid: (self._column_key(self._row_keys[rid], column), rid), reverse=descending)
+        return known + unknown
+
+
+class StudentSortIndex(_SortedColumns):
+    """
+    Ordenações em cache da tabela de alunos (colunas da StudentView).
+    A coluna "group" ordena pelo nome do grupo; renomear ou remover um grupo
+    descarta apenas a cache dessa coluna.
+    """
+    columns = ("number", "name", "email", "group", "creationDate")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._group_keys: Dict[str, Tuple[str, str]] = {}
+
+    def _column_key(self, keys: tuple, column: str) -> Any:
+        if column == "group":
+            # Alunos sem grupo ficam primeiro na ordem crescente
+            return self._group_keys.get(keys[3], ("", "")) if keys[3] else ("", "")
+        return super()._column_key(keys, column)
+
+    def _student_keys(self, student: Student) -> tuple:
+        """Pré-calcula as chaves de ordenação de um aluno."""
+        return (
+            number_key(student.student_number),
+            collation_key(student.name),
+            student.email.casefold(),
+            student.group_id,
+            student.created_at,
+        )
+
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Recalcula todas as chaves e descarta as ordenações em cache."""
+        self._group_keys = {group_id: collation_key(g.name) for group_id, g in groups.items()}
+        self._row_keys = {number: self._student_keys(s) for number, s in students.items()}
+        self._orders.clear()
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Atualiza as chaves de um aluno alterado (ou removido)."""
+        self._set_row(student_number, self._student_keys(student) if student is not None else None)
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Atualiza o nome do grupo usado na coluna "group"."""
+        new_key = collation_key(group.name) if group is not None else None
+        if self._group_keys.get(group_id) == new_key:
+            return
+        if new_key is None:
+            self._group_keys.pop(group_id, None)
+        else:
+            self._group_keys[group_id] = new_key
+        self.invalidate("group")
+
+
+class GroupSortIndex(_SortedColumns):
+    """Ordenações em cache da tabela de grupos (colunas da GroupView)."""
+    columns = ("name", "capacity", "count")
+
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """Recalcula todas as chaves e descarta as ordenações em cache."""
+        self._row_keys = {group_id: self._group_keys(g) for group_id, g in groups.items()}
+        self._orders.clear()
+
+    def _group_keys(self, group: Group) -> tuple:
+        """Pré-calcula as chaves de ordenação de um grupo."""
+        return (collation_key(group.name), group.max_capacity, group.current_size())
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """Os alunos não afetam a ordenação de grupos (o tamanho chega via update_group)."""
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """Atualiza as chaves de um grupo alterado (ou removido)."""
+        self._set_row(group_id, self._group_keys(group) if group is not None else None)
+
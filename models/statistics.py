@@ -0,0 +1,161 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from models.student import Student
+from models.group import Group
+
+# Número de intervalos do histograma de ocupação (0-9%, ..., 90-99%) mais um para 100%
+FILL_RATE_BUCKETS = 10
+
+
+def fill_bucket(size: int, max_capacity: int) -> int:
+    """
+    Calcula o intervalo do histograma de ocupação de um grupo.
+
+    Args:
+        size (int): Número de membros.
+        max_capacity (int): Capacidade máxima.
+
+    Retorna:
+        int: Índice entre 0 e FILL_RATE_BUCKETS (este último significa grupo cheio).
+    """
+    if max_capacity <= 0:
+        return FILL_RATE_BUCKETS
+    return min(size * FILL_RATE_BUCKETS // max_capacity, FILL_RATE_BUCKETS)
+
+
+def email_domain(email: str) -> str:
+    """Extrai o domínio (em minúsculas) de um email."""
+    return email.rsplit("@", 1)[-1].lower() if "@" in email else ""
+
+
+class RosterStatistics:
+    """
+    Estatísticas dos alunos e grupos mantidas de forma incremental.
+    Cada alteração a um registo atualiza apenas a sua contribuição, pelo que
+    todas as consultas são O(1) e nunca percorrem a lista completa.
+
+    Atributos:
+        student_count (int): Número total de alunos.
+        unassigned_count (int): Alunos sem grupo.
+        full_groups (Set[str]): IDs dos grupos com a capacidade máxima atingida.
+        under_min_groups (Set[str]): IDs dos grupos abaixo da capacidade mínima.
+        size_distribution (Counter): Número de grupos por número de membros.
+        fill_histogram (List[int]): Número de grupos por intervalo de ocupação.
+        domain_counts (Counter): Número de alunos por domínio de email.
+    """
+    def __init__(self) -> None:
+        """Inicializa estatísticas vazias."""
+        self._reset()
+
+    def _reset(self) -> None:
+        """Repõe todos os contadores a zero."""
+        self.student_count: int = 0
+        self.unassigned_count: int = 0
+        self.full_groups: Set[str] = set()
+        self.under_min_groups: Set[str] = set()
+        self.size_distribution: Counter = Counter()
+        self.fill_histogram: List[int] = [0] * (FILL_RATE_BUCKETS + 1)
+        self.domain_counts: Counter = Counter()
+        # Contribuição atual de cada registo, para poder ser retirada numa alteração
+        self._student_state: Dict[str, Tuple[str, bool]] = {}
+        self._group_state: Dict[str, Tuple[int, int, int]] = {}
+
+    @property
+    def group_count(self) -> int:
+        """Número total de grupos."""
+        return len(self._group_state)
+
+    def rebuild(self, students: Dict[str, Student], groups: Dict[str, Group]) -> None:
+        """
+        Recalcula todas as estatísticas a partir dos dados completos.
+
+        Args:
+            students (Dict[str, Student]): Alunos por número.
+            groups (Dict[str, Group]): Grupos por ID.
+        """
+        self._reset()
+        for number, student in students.items():
+            self.update_student(number, student)
+        for group_id, group in groups.items():
+            self.update_group(group_id, group)
+
+    def update_student(self, student_number: str, student: Optional[Student]) -> None:
+        """
+        Atualiza a contribuição de um aluno.
+
+        Args:
+            student_number (str): Número do aluno.
+            student (Optional[Student]): Estado atual, ou None se foi removido.
+        """
+        old = self._student_state.pop(student_number, None)
+        if old is not None:
+            domain, grouped = old
+            self.student_count -= 1
+            if not grouped:
+                self.unassigned_count -= 1
+            self.domain_counts[domain] -= 1
+            if self.domain_counts[domain] <= 0:
+                del self.domain_counts[domain]
+
+        if student is not None:
+            domain = email_domain(student.email)
+            grouped = bool(student.group_id)
+            self._student_state[student_number] = (domain, grouped)
+            self.student_count += 1
+            if not grouped:
+                self.unassigned_count += 1
+            self.domain_counts[domain] += 1
+
+    def update_group(self, group_id: str, group: Optional[Group]) -> None:
+        """
+        Atualiza a contribuição de um grupo.
+
+        Args:
+            group_id (str): ID do grupo.
+            group (Optional[Group]): Estado atual, ou None se foi removido.
+        """
+        old = self._group_state.pop(group_id, None)
+        if old is not None:
+            size, max_cap, _ = old
+            self.size_distribution[size] -= 1
+            if self.size_distribution[size] <= 0:
+                del self.size_distribution[size]
+            self.fill_histogram[fill_bucket(size, max_cap)] -= 1
+            self.full_groups.discard(group_id)
+            self.under_min_groups.discard(group_id)
+
+        if group is not None:
+            size = group.current_size()
+            self._group_state[group_id] = (size, group.max_capacity, group.min_capacity)
+            self.size_distribution[size] += 1
+            self.fill_histogram[fill_bucket(size, group.max_capacity)] += 1
+            if size >= group.max_capacity:
+                self.full_groups.add(group_id)
+            if size < group.min_capacity:
+                self.under_min_groups.add(group_id)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resumo das estatísticas para apresentação.
+
+        Retorna:
+            Dict[str, Any]: Contagens, histograma e distribuições atuais.
+        """
+        return {
+            "students": self.student_count,
+            "groups": self.group_count,
+            "unassigned": self.unassigned_count,
+            "full_groups": len(self.full_groups),
+            "under_min_groups": len(self.under_min_groups),
+            "fill_histogram": list(self.fill_histogram),
+            "size_distribution": dict(self.size_distribution),
+            "domains": dict(self.domain_counts),
+        }
+
+
+def fill_bucket_labels() -> Iterable[str]:
+    """Etiquetas dos intervalos do histograma de ocupação."""
+    step = 100 // FILL_RATE_BUCKETS
+    for i in range(FILL_RATE_BUCKETS):
+        yield f"{i * step}-{(i + 1) * step - 1}%"
+    yield "100%"
@@ -0,0 +1,183 @@
+import gzip
+import json
+import lzma
+from typing import Any, Dict, List, Tuple
+
+# Formatos do ficheiro de dados:
+#   "json"    - JSON indentado (legível, o formato original)
+#   "compact" - JSON sem espaços, com cada registo numa lista de valores e os IDs
+#               de grupos e alunos guardados uma só vez (as referências são posições)
+#   "gzip"    - "compact" comprimido com gzip (rápido)
+#   "lzma"    - "compact" comprimido com lzma/xz (mais pequeno, mais lento a gravar)
+STORAGE_FORMATS = ("json", "compact", "gzip", "lzma")
+DEFAULT_FORMAT = "json"
+
+COMPACT_MARKER = "compact-1"
+
+# Assinaturas no início dos ficheiros comprimidos
+_GZIP_MAGIC = b"\x1f\x8b"
+_LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+
+def detect_format(head: bytes) -> str:
+    """
+    Identifica o formato de um ficheiro de dados pelos primeiros bytes.
+
+    Args:
+        head (bytes): Início do ficheiro (pelo menos 6 bytes, se existirem).
+
+    Retorna:
+        str: Um dos STORAGE_FORMATS.
+    """
+    if head.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(_LZMA_MAGIC):
+        return "lzma"
+    if COMPACT_MARKER.encode('ascii') in head:
+        return "compact"
+    return "json"
+
+
+def encode_compact(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte os dados no formato compacto.
+    Os campos são listados uma vez no cabeçalho e cada registo passa a ser uma lista de valores.
+    O ID de grupo e as preferências de cada aluno e os números dos membros de cada grupo são
+    substituídos pela posição do registo (IDs desconhecidos, ex.: referências quebradas, ficam como texto).
+    """
+    students: List[Dict[str, Any]] = data.get("students", [])
+    groups: List[Dict[str, Any]] = data.get("groups", [])
+    student_pos = {s["student_number"]: i for i, s in enumerate(students)}
+    group_pos = {g["group_id"]: i for i, g in enumerate(groups)}
+
+    student_fields = list(students[0]) if students else []
+    group_fields = list(groups[0]) if groups else []
+
+    def encode_student(s: Dict[str, Any]) -> List[Any]:
+        row = [s.get(k) for k in student_fields]
+        if "group_id" in s:
+            row[student_fields.index("group_id")] = group_pos.get(s["group_id"], s["group_id"])
+        if s.get("preferences"):
+            row[student_fields.index("preferences")] = [group_pos.get(g, g) for g in s["preferences"]]
+        return row
+
+    def encode_group(g: Dict[str, Any]) -> List[Any]:
+        row = [g.get(k) for k in group_fields]
+        if "student_ids" in g:
+            row[group_fields.index("student_ids")] = [student_pos.get(n, n) for n in g["student_ids"]]
+        return row
+
+    # A versão fica em primeiro lugar para poder ser lida sem interpretar o ficheiro
+    return {
+        "version": data.get("version", 0),
+        "format": COMPACT_MARKER,
+        "student_fields": student_fields,
+        "group_fields": group_fields,
+        "students": [encode_student(s) for s in students],
+        "groups": [encode_group(g) for g in groups],
+    }
+
+
+def decode_compact(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Operação inversa de encode_compact (devolve os dicionários de serialização originais)."""
+    student_fields: List[str] = data.get("student_fields", [])
+    group_fields: List[str] = data.get("group_fields", [])
+    student_rows: List[List[Any]] = data.get("students", [])
+    group_rows: List[List[Any]] = data.get("groups", [])
+
+    number_idx = student_fields.index("student_number") if "student_number" in student_fields else None
+    group_id_idx = group_fields.index("group_id") if "group_id" in group_fields else None
+    numbers = [row[number_idx] for row in student_rows] if number_idx is not None else []
+    group_ids = [row[group_id_idx] for row in group_rows] if group_id_idx is not None else []
+
+    # As linhas são resolvidas no próprio lugar (pertencem aos dados acabados de ler)
+    group_ref_idx = student_fields.index("group_id") if "group_id" in student_fields else None
+    if group_ref_idx is not None:
+        for row in student_rows:
+            ref = row[group_ref_idx]
+            if type(ref) is int:
+                row[group_ref_idx] = group_ids[ref]
+    preferences_idx = student_fields.index("preferences") if "preferences" in student_fields else None
+    if preferences_idx is not None:
+        for row in student_rows:
+            if row[preferences_idx]:
+                row[preferences_idx] = [group_ids[g] if type(g) is int else g for g in row[preferences_idx]]
+    members_idx = group_fields.index("student_ids") if "student_ids" in group_fields else None
+    if members_idx is not None:
+        for row in group_rows:
+            row[members_idx] = [numbers[n] if type(n) is int else n for n in row[members_idx]]
+
+    students = [dict(zip(student_fields, row)) for row in student_rows]
+    groups = [dict(zip(group_fields, row)) for row in group_rows]
+    return {"version": data.get("version", 0), "students": students, "groups": groups}
+
+
+def read_data(path: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Lê um ficheiro de dados em qualquer formato (detetado automaticamente).
+
+    Args:
+        path (str): Caminho do ficheiro.
+
+    Retorna:
+        Tuple[Dict[str, Any], str]: Dados (versão, alunos e grupos como dicionários) e formato detetado.
+
+    Lança:
+        IOError, json.JSONDecodeError, EOFError, lzma.LZMAError: Se o ficheiro não puder ser lido.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    fmt = detect_format(raw[:256])
+    if fmt == "gzip":
+        raw = gzip.decompress(raw)
+    elif fmt == "lzma":
+        raw = lzma.decompress(raw)
+
+    data = json.loads(raw)
+    if data.get("format") == COMPACT_MARKER:
+        data = decode_compact(data)
+    return data, fmt
+
+
+def read_head(path: str, size: int = 256) -> str:
+    """Lê (descomprimindo, se necessário) apenas o início do ficheiro, para obter a versão."""
+    with open(path, 'rb') as f:
+        head = f.read(8)
+    fmt = detect_format(head)
+    if fmt == "gzip":
+        with gzip.open(path, 'rb') as f:
+            return f.read(size).decode('utf-8', 'ignore')
+    if fmt == "lzma":
+        with lzma.open(path, 'rb') as f:
+            return f.read(size).decode('utf-8', 'ignore')
+    with open(path, 'rb') as f:
+        return f.read(size).decode('utf-8', 'ignore')
+
+
+def write_data(path: str, data: Dict[str, Any], fmt: str = DEFAULT_FORMAT) -> None:
+    """
+    Grava os dados no formato indicado.
+
+    Args:
+        path (str): Caminho do ficheiro.
+        data (Dict[str, Any]): Versão, alunos e grupos (dicionários de serialização).
+        fmt (str, optional): Um dos STORAGE_FORMATS. Predefinição: DEFAULT_FORMAT.
+
+    Lança:
+        ValueError: Se o formato for desconhecido.
+    """
+    if fmt not in STORAGE_FORMATS:
+        raise ValueError(f"Formato de dados desconhecido: {fmt}.")
+    if fmt == "json":
+        # Formato original, com indentação para legibilidade
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        return
+
+    raw = json.dumps(encode_compact(data), ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    if fmt == "gzip":
+        raw = gzip.compress(raw, compresslevel=6)
+    elif fmt == "lzma":
+        raw = lzma.compress(raw, preset=6)
+    with open(path, 'wb') as f:
+        f.write(raw)
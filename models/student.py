@@ -1,5 +1,5 @@
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, List
+from models.timestamps import SECONDS_PER_DAY, format_date, now, parse_date
 
 class Student:
     """
@@ -10,7 +10,9 @@ class Student:
         name (str): O nome do aluno.
         email (str): O email do aluno.
         group_id (Optional[str]): O ID do grupo ao qual o aluno pertence.
-        creation_date (str): A data de criação do registo do aluno.
+        created_at (int): Data de criação do registo, em segundos desde a época (início do dia).
+        creation_date (str): A mesma data no formato dd/mm/aaaa (usado nos ficheiros e na interface).
+        preferences (List[str]): IDs dos grupos preferidos, do mais para o menos desejado.
     """
     def __init__(self, student_number: str, name: str, email: str, creation_date: Optional[str] = None) -> None:
         """
@@ -27,8 +29,28 @@ class Student:
         self.email: str = email
         self.group_id: Optional[str] = None  # Referência ao grupo a que o aluno pertence
         
-        # Se nenhuma data for fornecida, usa a data atual formatada como dd/mm/aaaa
-        self.creation_date: str = creation_date if creation_date else datetime.now().strftime("%d/%m/%Y")
+        # Se nenhuma data for fornecida, usa a data atual (só o dia, como no formato dd/mm/aaaa)
+        self.created_at: int = 0
+        # Texto original de uma data que não foi possível interpretar (mantido tal como estava no ficheiro)
+        self._creation_text: Optional[str] = None
+        if creation_date:
+            self.creation_date = creation_date
+        else:
+            self.created_at = now() // SECONDS_PER_DAY * SECONDS_PER_DAY
+        self.preferences: List[str] = []
+
+    @property
+    def creation_date(self) -> str:
+        """Data de criação no formato dd/mm/aaaa."""
+        if self._creation_text is not None:
+            return self._creation_text
+        return format_date(self.created_at)
+
+    @creation_date.setter
+    def creation_date(self, value: str) -> None:
+        timestamp = parse_date(value)
+        self.created_at = timestamp if timestamp is not None else 0
+        self._creation_text = None if timestamp is not None else value
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -43,7 +65,8 @@ class Student:
             "name": self.name,
             "email": self.email,
             "group_id": self.group_id,
-            "creation_date": self.creation_date
+            "creation_date": self.creation_date,
+            "preferences": self.preferences
         }
 
     @classmethod
@@ -60,6 +83,7 @@ class Student:
         """
         student = cls(data["student_number"], data["name"], data["email"], data.get("creation_date"))
         student.group_id = data.get("group_id")
+        student.preferences = data.get("preferences") or []
         return student
 
     def __str__(self) -> str:
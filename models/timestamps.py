@@ -0,0 +1,74 @@
+import functools
+from datetime import date, datetime
+from typing import Optional
+
+# Os instantes são guardados como segundos desde 01/01/1970 na hora local (sem fuso horário),
+# tal como as datas em texto dos ficheiros de dados
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+SECONDS_PER_DAY = 86400
+
+
+def _timestamp(year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> int:
+    """Segundos desde a época de uma data/hora local (lança ValueError se a data não existir)."""
+    if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60):
+        raise ValueError("Hora inválida.")
+    days = date(year, month, day).toordinal() - _EPOCH_ORDINAL
+    return days * SECONDS_PER_DAY + hour * 3600 + minute * 60 + second
+
+
+# Muitos alunos partilham o mesmo dia de criação: as conversões de datas de alunos ficam em cache
+@functools.lru_cache(maxsize=4096)
+def parse_date(text: str) -> Optional[int]:
+    """
+    Converte uma data 'dd/mm/aaaa' (formato das datas dos alunos) num instante.
+
+    Retorna:
+        Optional[int]: Segundos desde a época (início do dia), ou None se o texto não for uma data válida.
+    """
+    try:
+        day, month, year = text.split("/")
+        return _timestamp(int(year), int(month), int(day))
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_datetime(text: str) -> Optional[int]:
+    """
+    Converte uma data/hora 'aaaa-mm-dd HH:MM:SS' (formato das datas dos grupos) num instante.
+
+    Retorna:
+        Optional[int]: Segundos desde a época, ou None se o texto não for uma data/hora válida.
+    """
+    try:
+        day_part, time_part = text.split(" ")
+        year, month, day = day_part.split("-")
+        hour, minute, second = time_part.split(":")
+        return _timestamp(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _date_parts(timestamp: int):
+    days, seconds = divmod(timestamp, SECONDS_PER_DAY)
+    return date.fromordinal(days + _EPOCH_ORDINAL), seconds
+
+
+@functools.lru_cache(maxsize=4096)
+def format_date(timestamp: int) -> str:
+    """Formata um instante como 'dd/mm/aaaa'."""
+    day, _ = _date_parts(timestamp)
+    return f"{day.day:02d}/{day.month:02d}/{day.year:04d}"
+
+
+def format_datetime(timestamp: int) -> str:
+    """Formata um instante como 'aaaa-mm-dd HH:MM:SS'."""
+    day, seconds = _date_parts(timestamp)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return f"{day.year:04d}-{day.month:02d}-{day.day:02d} {hour:02d}:{minute:02d}:{second:02d}"
+
+
+def now() -> int:
+    """Instante atual (hora local, arredondado ao segundo)."""
+    current = datetime.now()
+    return _timestamp(current.year, current.month, current.day, current.hour, current.minute, current.second)
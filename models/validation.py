@@ -0,0 +1,96 @@
+from typing import Optional, Tuple
+
+# Domínios aceites nos emails dos alunos
+STUDENT_EMAIL_DOMAINS: Tuple[str, ...] = ("@my.istec.pt", "@istec.pt")
+MIN_NAME_LENGTH = 3
+
+# Aluno lido de um ficheiro de importação: (linha, número, nome, email, data de criação ou None)
+ImportRow = Tuple[int, str, str, str, Optional[str]]
+# Linha rejeitada: (linha, mensagem)
+RowError = Tuple[int, str]
+# Erros de um aluno que dependem só dos seus valores: (campos/domínio do email, nome), None se cumprir a regra.
+# São calculados fora do bloqueio (ex.: nos processos da importação); a unicidade decide qual é reportado
+RowIssues = Tuple[Optional[str], Optional[str]]
+
+
+# As regras dependem apenas dos valores de um aluno (sem acesso aos dados carregados); a unicidade
+# de números e emails é verificada pelo controlador. A ordem das verificações faz parte do comportamento
+# (determina a mensagem quando há vários problemas): número, unicidade do número, campos e domínio do
+# email (check_student_contact), unicidade do email e, por fim, o nome (check_student_name).
+def check_student_number(student_number: str) -> None:
+    """
+    Valida o formato de um número de estudante.
+
+    Lança:
+        ValueError: Se o número não for composto apenas por dígitos.
+    """
+    if not student_number.isdigit():
+        raise ValueError("Número de estudante deve conter apenas dígitos.")
+
+
+def check_student_contact(name: str, email: str) -> None:
+    """
+    Valida os campos obrigatórios e o domínio do email de um aluno.
+
+    Lança:
+        ValueError: Se algum campo estiver vazio ou o email não for institucional.
+    """
+    if not name or not email:
+        raise ValueError("Todos os campos são obrigatórios.")
+    if not email.endswith(STUDENT_EMAIL_DOMAINS):
+        raise ValueError("O email do aluno deve ser do domínio @my.istec.pt ou @istec.pt")
+
+
+def check_student_name(name: str) -> None:
+    """
+    Valida o nome de um aluno.
+
+    Lança:
+        ValueError: Se o nome for curto demais ou tiver dígitos.
+    """
+    if len(name) < MIN_NAME_LENGTH:
+        raise ValueError("O nome deve ter pelo menos 3 caracteres.")
+    if any(char.isdigit() for char in name):
+        raise ValueError("O nome não pode conter números.")
+
+
+def student_row_issues(name: str, email: str) -> Optional[RowIssues]:
+    """
+    Verifica as regras de check_student_contact e check_student_name sem lançar exceções,
+    para que a mensagem a reportar possa ser escolhida depois, pela ordem de create_student.
+
+    Retorna:
+        Optional[RowIssues]: (erro dos campos/email, erro do nome), ou None se o aluno cumprir ambas.
+    """
+    contact_error = name_error = None
+    try:
+        check_student_contact(name, email)
+    except ValueError as e:
+        contact_error = str(e)
+    try:
+        check_student_name(name)
+    except ValueError as e:
+        name_error = str(e)
+    if contact_error is None and name_error is None:
+        return None
+    return contact_error, name_error
+
+
+def normalize_student_row(student_number: str, name: str, email: str) -> Tuple[str, str, str]:
+    """
+    Normaliza os campos de um aluno lido de um ficheiro: retira os espaços nas pontas e junta
+    os espaços repetidos no nome. Só o formato do número é validado aqui (é a primeira regra);
+    as restantes são calculadas com student_row_issues e reportadas pelo controlador depois
+    das verificações de unicidade que as precedem (ver import_students).
+
+    Retorna:
+        Tuple[str, str, str]: (número, nome, email) normalizados.
+
+    Lança:
+        ValueError: Se o número não respeitar check_student_number.
+    """
+    student_number = student_number.strip()
+    name = " ".join(name.split())
+    email = email.strip()
+    check_student_number(student_number)
+    return student_number, name, email
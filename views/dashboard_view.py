@@ -0,0 +1,112 @@
+import customtkinter as ctk
+import tkinter as tk
+from typing import TYPE_CHECKING
+from models.statistics import fill_bucket_labels
+
+if TYPE_CHECKING:
+    from controllers.main_controller import MainController
+
+class DashboardView(ctk.CTkFrame):
+    """
+    Painel com as estatísticas dos alunos e grupos.
+    Lê os valores já calculados pelo controlador (RosterStatistics), sem percorrer os dados.
+    """
+    def __init__(self, parent, controller: 'MainController') -> None:
+        super().__init__(parent)
+        self.controller: 'MainController' = controller
+
+        self.create_widgets()
+        self.refresh_list()
+
+    def create_widgets(self) -> None:
+        """Cria os cartões de contagem, o histograma e as distribuições."""
+
+        # --- Cartões de Contagem ---
+        cards_frame = ctk.CTkFrame(self)
+        cards_frame.pack(side="top", fill="x", padx=10, pady=(10, 5))
+
+        self.card_labels = {}
+        cards = [
+            ("students", "Alunos"),
+            ("unassigned", "Sem Grupo"),
+            ("groups", "Grupos"),
+            ("full_groups", "Grupos Cheios"),
+            ("under_min_groups", "Abaixo do Mínimo"),
+        ]
+        for column, (key, title) in enumerate(cards):
+            cards_frame.grid_columnconfigure(column, weight=1)
+            ctk.CTkLabel(cards_frame, text=title).grid(row=0, column=column, padx=10, pady=(10, 0))
+            value = ctk.CTkLabel(cards_frame, text="0", font=("Roboto", 24, "bold"))
+            value.grid(row=1, column=column, padx=10, pady=(0, 10))
+            self.card_labels[key] = value
+
+        # --- Histograma de Ocupação ---
+        chart_frame = ctk.CTkFrame(self)
+        chart_frame.pack(side="top", fill="both", expand=True, padx=10, pady=5)
+        ctk.CTkLabel(chart_frame, text="Ocupação dos Grupos", font=("Roboto", 16, "bold")).pack(anchor="w", padx=15, pady=(10, 5))
+
+        self.canvas = tk.Canvas(chart_frame, bg="#2b2b2b", highlightthickness=0, height=220)
+        self.canvas.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.canvas.bind("<Configure>", lambda e: self.draw_histogram())
+
+        # --- Distribuições ---
+        details_frame = ctk.CTkFrame(self, fg_color="transparent")
+        details_frame.pack(side="top", fill="both", expand=True, padx=10, pady=(5, 10))
+
+        left_frame = ctk.CTkFrame(details_frame)
+        left_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
+        ctk.CTkLabel(left_frame, text="Grupos por Nº de Alunos").pack(pady=5)
+        self.text_sizes = ctk.CTkTextbox(left_frame, height=120)
+        self.text_sizes.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        right_frame = ctk.CTkFrame(details_frame)
+        right_frame.pack(side="right", fill="both", expand=True, padx=(5, 0))
+        ctk.CTkLabel(right_frame, text="Alunos por Domínio de Email").pack(pady=5)
+        self.text_domains = ctk.CTkTextbox(right_frame, height=120)
+        self.text_domains.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+    def refresh_list(self) -> None:
+        """Atualiza o painel com as estatísticas atuais."""
+        self.summary = self.controller.statistics.summary()
+
+        for key, label in self.card_labels.items():
+            label.configure(text=str(self.summary[key]))
+
+        self.draw_histogram()
+
+        sizes = self.summary["size_distribution"]
+        self.set_text(self.text_sizes, [f"{size} alunos: {count} grupo(s)" for size, count in sorted(sizes.items())])
+
+        domains = self.summary["domains"]
+        self.set_text(self.text_domains, [f"@{domain}: {count}" for domain, count in sorted(domains.items(), key=lambda item: -item[1])])
+
+    def set_text(self, textbox: ctk.CTkTextbox, lines) -> None:
+        """Substitui o conteúdo de uma caixa de texto só de leitura."""
+        textbox.configure(state="normal")
+        textbox.delete("1.0", tk.END)
+        textbox.insert("1.0", "\n".join(lines) if lines else "Sem dados.")
+        textbox.configure(state="disabled")
+
+    def draw_histogram(self) -> None:
+        """Desenha o histograma de ocupação (percentagem da capacidade máxima)."""
+        if not hasattr(self, "summary"):
+            return
+        self.canvas.delete("all")
+        histogram = self.summary["fill_histogram"]
+        labels = list(fill_bucket_labels())
+
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        margin_bottom = 25
+        margin_top = 20
+        bar_space = width / len(histogram)
+        highest = max(histogram) or 1
+
+        for i, count in enumerate(histogram):
+            x0 = i * bar_space + bar_space * 0.15
+            x1 = (i + 1) * bar_space - bar_space * 0.15
+            bar_height = (height - margin_bottom - margin_top) * count / highest
+            y1 = height - margin_bottom
+            self.canvas.create_rectangle(x0, y1 - bar_height, x1, y1, fill="#1f538d", outline="")
+            self.canvas.create_text((x0 + x1) / 2, y1 - bar_height - 8, text=str(count), fill="white", font=("Roboto", 9))
+            self.canvas.create_text((x0 + x1) / 2, height - margin_bottom / 2, text=labels[i], fill="white", font=("Roboto", 8))
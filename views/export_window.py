@@ -0,0 +1,83 @@
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+from typing import TYPE_CHECKING
+from controllers.export_controller import ExportController, EXPORT_KINDS
+
+if TYPE_CHECKING:
+    from controllers.main_controller import MainController
+    from views.task_runner import TaskRunner
+
+REPORTS_LABEL = "Relatórios por grupo (pasta)"
+FORMAT_LABELS = {"CSV": "csv", "JSONL": "jsonl"}
+
+
+class ExportWindow(ctk.CTkToplevel):
+    """Janela modal para exportar listas de alunos e grupos."""
+    def __init__(self, parent, controller: 'MainController', tasks: 'TaskRunner') -> None:
+        super().__init__(parent)
+        self.controller = controller
+        self.tasks = tasks
+        self.exporter = ExportController(controller)
+
+        self.title("Exportar Dados")
+        self.geometry("420x280")
+        self.grab_set()
+
+        self.create_widgets()
+
+    def create_widgets(self) -> None:
+        """Cria as opções de tipo e formato de exportação."""
+        content_frame = ctk.CTkFrame(self)
+        content_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        # Mapa descrição -> tipo de exportação
+        self.kind_map = {label: kind for kind, label in EXPORT_KINDS.items()}
+        kind_labels = list(self.kind_map.keys()) + [REPORTS_LABEL]
+
+        ctk.CTkLabel(content_frame, text="O que exportar:").pack(pady=(10, 5))
+        self.combo_kind = ctk.CTkComboBox(content_frame, values=kind_labels, width=260)
+        self.combo_kind.set(kind_labels[0])
+        self.combo_kind.pack(pady=5)
+
+        ctk.CTkLabel(content_frame, text="Formato:").pack(pady=(10, 5))
+        self.combo_format = ctk.CTkComboBox(content_frame, values=list(FORMAT_LABELS.keys()), width=260)
+        self.combo_format.set("CSV")
+        self.combo_format.pack(pady=5)
+
+        ctk.CTkButton(content_frame, text="Exportar...", command=self.export).pack(pady=20)
+
+    def export(self) -> None:
+        """Pede o destino e executa a exportação escolhida, em segundo plano."""
+        kind_label = self.combo_kind.get()
+        fmt = FORMAT_LABELS.get(self.combo_format.get(), "csv")
+
+        if kind_label == REPORTS_LABEL:
+            directory = filedialog.askdirectory(parent=self, title="Pasta para os relatórios")
+            if not directory:
+                return
+            work = lambda task: self.exporter.export_group_reports(directory, task.update)
+            message = "{} relatórios criados."
+        else:
+            if kind_label not in self.kind_map:
+                messagebox.showerror("Erro", "Selecione um tipo de exportação válido.")
+                return
+            path = filedialog.asksaveasfilename(
+                parent=self,
+                defaultextension=f".{fmt}",
+                filetypes=[(fmt.upper(), f"*.{fmt}")],
+            )
+            if not path:
+                return
+            kind = self.kind_map[kind_label]
+            work = lambda task: self.exporter.export(kind, path, fmt, task.update)
+            message = "{} registos exportados."
+
+        try:
+            self.tasks.submit("A exportar...", work, lambda count: self.finish(message.format(count)), parent=self)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def finish(self, message: str) -> None:
+        """Conclui uma exportação bem-sucedida."""
+        messagebox.showinfo("Sucesso", message)
+        self.destroy()
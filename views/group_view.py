@@ -1,19 +1,40 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from views.export_window import ExportWindow
+from views.snapshot_window import SnapshotWindow
+from views.preferences_window import AssignmentWindow
+from views.widget_utils import set_children_state
 
 if TYPE_CHECKING:
     from controllers.main_controller import MainController
     from models.group import Group
+    from models.query import Page
+    from views.task_runner import TaskRunner
+
+# Linhas pedidas ao controlador de cada vez (o resto chega com "Mostrar mais")
+PAGE_SIZE = 200
 
 class GroupView(ctk.CTkFrame):
     """
     Interface gráfica para gestão de grupos.
     """
-    def __init__(self, parent, controller: 'MainController') -> None:
+    def __init__(self, parent, controller: 'MainController', tasks: 'TaskRunner') -> None:
         super().__init__(parent)
         self.controller: 'MainController' = controller
+        # Operações demoradas (exportação, atribuição) correm em segundo plano
+        self.tasks: 'TaskRunner' = tasks
+
+        # Ordenação atual da tabela (coluna clicada e sentido)
+        self.sort_column: Optional[str] = None
+        self.sort_descending: bool = False
+        # Filtros da consulta paginada, cursor da página seguinte e linhas já pedidas
+        self.filters: Dict[str, Any] = {}
+        self.next_cursor: Optional[str] = None
+        self.page_rows: int = 0
+        # Enquanto os dados são carregados, a tabela é preenchida por blocos e a edição fica bloqueada
+        self.loading: bool = False
         
         self.create_widgets()
         self.refresh_list()
@@ -80,9 +101,14 @@ class GroupView(ctk.CTkFrame):
 
         columns = ("name", "capacity", "count", "id")
         self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="browse")
-        self.tree.heading("name", text="Nome")
-        self.tree.heading("capacity", text="Capacidade")
-        self.tree.heading("count", text="Nº Alunos")
+        self.column_titles = {
+            "name": "Nome",
+            "capacity": "Capacidade",
+            "count": "Nº Alunos",
+        }
+        # Clicar no cabeçalho ordena pela coluna
+        for column, title in self.column_titles.items():
+            self.tree.heading(column, text=title, command=lambda c=column: self.sort_by(c))
         self.tree.heading("id", text="ID")
         self.tree.column("id", width=0, stretch=tk.NO) # Esconde a coluna ID
         
@@ -94,11 +120,24 @@ class GroupView(ctk.CTkFrame):
         
         self.tree.bind("<Double-1>", self.edit_group)
 
+        # --- Paginação ---
+        page_frame = ctk.CTkFrame(self, fg_color="transparent")
+        page_frame.pack(side="top", fill="x", padx=10)
+        self.label_page = ctk.CTkLabel(page_frame, text="")
+        self.label_page.pack(side="left", padx=5)
+        self.button_more = ctk.CTkButton(page_frame, text="Mostrar mais", command=self.load_more, width=120, fg_color="transparent", border_width=1)
+        self.button_more.pack(side="right", padx=5)
+
         # --- Ações ---
         action_frame = ctk.CTkFrame(self, fg_color="transparent")
         action_frame.pack(side="top", fill="x", padx=10, pady=5)
         ctk.CTkButton(action_frame, text="Gerir Membros", command=self.manage_group).pack(side="left", padx=5)
         ctk.CTkButton(action_frame, text="Editar Grupo", command=self.edit_group).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Exportar", command=self.export_data).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Instantâneos", command=self.open_snapshots).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Atribuir por Preferências", command=self.open_assignment).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Anular", command=self.undo, width=80, fg_color="transparent", border_width=1).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Refazer", command=self.redo, width=80, fg_color="transparent", border_width=1).pack(side="left", padx=5)
         ctk.CTkButton(action_frame, text="Eliminar Grupo", command=self.delete_group, fg_color="#c42b1c", hover_color="#961e14").pack(side="right", padx=5)
 
         self.setup_focus_behavior(self.entry_name)
@@ -139,29 +178,107 @@ class GroupView(ctk.CTkFrame):
     def perform_search(self) -> None:
         """Executa a pesquisa de grupos."""
         query = self.entry_search.get().strip()
-        if query:
-            results = self.controller.search_groups(query)
-            self.refresh_list(groups=results)
-        else:
-            self.refresh_list()
+        self.filters = {"text": query} if query else {}
+        self.page_rows = 0
+        self.refresh_list()
 
     def clear_search(self) -> None:
         """Limpa a pesquisa."""
         self.entry_search.delete(0, tk.END)
+        self.filters = {}
+        self.page_rows = 0
         self.refresh_list()
 
-    def refresh_list(self, groups: Optional[List['Group']] = None) -> None:
+    def sort_by(self, column: str) -> None:
+        """Ordena a tabela pela coluna clicada (clicar novamente inverte a ordem)."""
+        if self.loading:
+            return
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+
+        for col, title in self.column_titles.items():
+            arrow = (" ▼" if self.sort_descending else " ▲") if col == self.sort_column else ""
+            self.tree.heading(col, text=title + arrow)
+
+        self.page_rows = 0
+        self.refresh_list()
+
+    def refresh_list(self) -> None:
         """
-        Atualiza a lista de grupos na interface.
+        Atualiza a lista de grupos na interface: pede ao controlador apenas a primeira
+        página da consulta (pesquisa e ordenação escolhidas).
         """
         for item in self.tree.get_children():
             self.tree.delete(item)
-        
-        if groups is None:
-            groups = self.controller.get_all_groups()
-            
-        for g in groups:
+
+        # Mantém visíveis as linhas já pedidas com "Mostrar mais" (ex.: depois de uma edição)
+        self.page_rows = max(PAGE_SIZE, self.page_rows)
+        self.show_page(self.query_page(self.page_rows))
+
+    def query_page(self, limit: int, cursor: Optional[str] = None) -> 'Page':
+        """Pede ao controlador uma página de grupos com os filtros e a ordenação atuais."""
+        return self.controller.query_groups(self.filters, self.sort_column or "name", self.sort_descending,
+                                            limit=limit, cursor=cursor)
+
+    def load_more(self) -> None:
+        """Acrescenta à tabela a página seguinte de grupos."""
+        if self.next_cursor is None or self.loading:
+            return
+        self.page_rows += PAGE_SIZE
+        self.show_page(self.query_page(PAGE_SIZE, self.next_cursor))
+
+    def show_page(self, page: 'Page') -> None:
+        """Acrescenta as linhas de uma página e atualiza o cursor e a contagem."""
+        for g in page:
             self.tree.insert("", "end", values=(g.name, g.max_capacity, g.current_size(), g.group_id))
+        self.next_cursor = page.next_cursor
+        self.label_page.configure(text=f"A mostrar {len(self.tree.get_children())} de {page.total} grupos")
+        self.button_more.configure(state="normal" if self.next_cursor else "disabled")
+
+    def undo(self, event=None) -> None:
+        """Anula a última alteração (Ctrl+Z)."""
+        if self.loading:
+            return
+        # Ctrl+Z/Ctrl+Y chegam mesmo com a janela de progresso aberta; as tarefas só de leitura
+        # (exportar, verificar) percorrem os dados sem o bloqueio, pelo que também têm de terminar
+        if self.tasks.busy:
+            messagebox.showwarning("Aviso", "Aguarde que a operação em curso termine.")
+            return
+        try:
+            self.controller.undo()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def redo(self, event=None) -> None:
+        """Refaz a última alteração anulada (Ctrl+Y)."""
+        if self.loading:
+            return
+        # Ctrl+Z/Ctrl+Y chegam mesmo com a janela de progresso aberta; as tarefas só de leitura
+        # (exportar, verificar) percorrem os dados sem o bloqueio, pelo que também têm de terminar
+        if self.tasks.busy:
+            messagebox.showwarning("Aviso", "Aguarde que a operação em curso termine.")
+            return
+        try:
+            self.controller.redo()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def open_snapshots(self) -> None:
+        """Abre a janela de instantâneos (criar e comparar)."""
+        SnapshotWindow(self, self.controller)
+
+    def open_assignment(self) -> None:
+        """Abre a janela de atribuição dos alunos sem grupo segundo as suas preferências."""
+        if self.loading:
+            return
+        AssignmentWindow(self, self.controller, self.tasks)
+
+    def export_data(self) -> None:
+        """Abre a janela de exportação de listas."""
+        ExportWindow(self, self.controller, self.tasks)
 
     def delete_group(self) -> None:
         """Remove o grupo selecionado após confirmação."""
@@ -179,8 +296,23 @@ class GroupView(ctk.CTkFrame):
             except ValueError as e:
                 messagebox.showerror("Erro", str(e))
 
+    def set_loading(self, loading: bool) -> None:
+        """Bloqueia (ou desbloqueia) a edição enquanto os dados são carregados."""
+        self.loading = loading
+        set_children_state(self, not loading)
+        if loading:
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+
+    def append_rows(self, groups: List['Group']) -> None:
+        """Acrescenta à tabela um bloco de grupos acabados de carregar (até encher a primeira página)."""
+        for g in groups[:max(PAGE_SIZE - len(self.tree.get_children()), 0)]:
+            self.tree.insert("", "end", values=(g.name, g.max_capacity, g.current_size(), g.group_id))
+
     def edit_group(self, event=None) -> None:
         """Abre a janela de edição para o grupo selecionado."""
+        if self.loading:
+            return
         selected = self.tree.selection()
         if not selected:
             if event is None:
@@ -267,7 +399,7 @@ class EditGroupWindow(ctk.CTkToplevel):
             messagebox.showerror("Erro", str(e))
 
 class GroupDetailsWindow(ctk.CTkToplevel):
-    """Janela modal para gestão de membros de um grupo (adicionar/remover)."""
+    """Janela modal para gestão de membros e da lista de espera de um grupo."""
     def __init__(self, parent, controller: 'MainController', group_id: str) -> None:
         super().__init__(parent)
         self.controller: 'MainController' = controller
@@ -279,7 +411,7 @@ class GroupDetailsWindow(ctk.CTkToplevel):
              return
 
         self.title(f"Gerir Grupo: {self.group.name}")
-        self.geometry("700x500")
+        self.geometry("700x650")
         
         self.grab_set()
         
@@ -316,6 +448,10 @@ class GroupDetailsWindow(ctk.CTkToplevel):
         btn_frame.pack(side="left", padx=5)
         ctk.CTkButton(btn_frame, text="Adicionar ->", command=self.add_student).pack(pady=10)
         ctk.CTkButton(btn_frame, text="<- Remover", command=self.remove_student, fg_color="#c42b1c", hover_color="#961e14").pack(pady=10)
+        self.entry_priority = ctk.CTkEntry(btn_frame, placeholder_text="Prioridade (0)", width=120)
+        self.entry_priority.pack(pady=(30, 5))
+        ctk.CTkButton(btn_frame, text="Lista de Espera ->", command=self.join_waitlist).pack(pady=5)
+        ctk.CTkButton(btn_frame, text="<- Sair da Espera", command=self.leave_waitlist, fg_color="transparent", border_width=1).pack(pady=5)
 
         # --- Lado Direito: Membros Atuais ---
         right_frame = ctk.CTkFrame(content_frame)
@@ -333,10 +469,24 @@ class GroupDetailsWindow(ctk.CTkToplevel):
         scroll_members.pack(side="right", fill="y")
         self.list_members.configure(yscrollcommand=scroll_members.set)
 
+        # Lista de espera, pela ordem em que os alunos entram quando abrir uma vaga
+        ctk.CTkLabel(right_frame, text="Lista de Espera").pack(pady=5)
+
+        waitlist_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
+        waitlist_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.list_waiting = tk.Listbox(waitlist_frame, bg="#2b2b2b", fg="white", borderwidth=0, highlightthickness=0, height=6)
+        self.list_waiting.pack(side="left", fill="both", expand=True)
+
+        scroll_waiting = ctk.CTkScrollbar(waitlist_frame, orientation="vertical", command=self.list_waiting.yview)
+        scroll_waiting.pack(side="right", fill="y")
+        self.list_waiting.configure(yscrollcommand=scroll_waiting.set)
+
     def refresh_lists(self) -> None:
         """Atualiza o conteúdo das listas."""
         self.list_available.delete(0, tk.END)
         self.list_members.delete(0, tk.END)
+        self.list_waiting.delete(0, tk.END)
 
         # Preenche alunos disponíveis (sem grupo)
         available = self.controller.get_students_without_group()
@@ -351,6 +501,10 @@ class GroupDetailsWindow(ctk.CTkToplevel):
                 if student:
                     self.list_members.insert(tk.END, f"{student.student_number} - {student.name}")
 
+        # Preenche a lista de espera
+        for position, s in enumerate(self.controller.get_waitlist(self.group_id), start=1):
+            self.list_waiting.insert(tk.END, f"{s.student_number} - {s.name} ({position}.º)")
+
     def add_student(self) -> None:
         """Move o aluno da lista de disponíveis para o grupo."""
         selection = self.list_available.curselection()
@@ -360,12 +514,45 @@ class GroupDetailsWindow(ctk.CTkToplevel):
         text = self.list_available.get(selection[0])
         student_number = text.split(" - ")[0]
 
+        # Com o grupo cheio, propõe a inscrição na lista de espera
+        if self.group and not self.group.has_vacancy():
+            if messagebox.askyesno("Grupo cheio", "O grupo está cheio. Deseja inscrever o aluno na lista de espera?"):
+                self.join_waitlist()
+            return
+
         try:
             self.controller.add_student_to_group(student_number, self.group_id)
             self.refresh_lists()
         except ValueError as e:
             messagebox.showerror("Erro", str(e))
 
+    def join_waitlist(self) -> None:
+        """Inscreve o aluno selecionado (disponível) na lista de espera do grupo."""
+        selection = self.list_available.curselection()
+        if not selection:
+            return
+
+        student_number = self.list_available.get(selection[0]).split(" - ")[0]
+        try:
+            self.controller.join_waitlist(student_number, self.group_id, self.entry_priority.get().strip() or "0")
+            self.entry_priority.delete(0, "end")
+            self.refresh_lists()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def leave_waitlist(self) -> None:
+        """Retira o aluno selecionado da lista de espera."""
+        selection = self.list_waiting.curselection()
+        if not selection:
+            return
+
+        student_number = self.list_waiting.get(selection[0]).split(" - ")[0]
+        try:
+            self.controller.leave_waitlist(student_number)
+            self.refresh_lists()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
     def remove_student(self) -> None:
         """Remove o aluno do grupo e devolve à lista de disponíveis."""
         selection = self.list_members.curselection()
@@ -0,0 +1,176 @@
+import random
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import messagebox
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from controllers.main_controller import MainController
+    from models.matching import MatchingResult
+    from models.student import Student
+    from views.task_runner import TaskRunner
+
+
+class PreferencesWindow(ctk.CTkToplevel):
+    """Janela para ordenar os grupos preferidos de um aluno."""
+    def __init__(self, parent, controller: 'MainController', student: 'Student') -> None:
+        super().__init__(parent)
+        self.controller = controller
+        self.student_number: str = student.student_number
+        # IDs dos grupos escolhidos, por ordem de preferência
+        self.chosen: List[str] = [g.group_id for g in controller.get_student_preferences(student.student_number)]
+
+        self.title(f"Preferências: {student.name}")
+        self.geometry("650x450")
+        self.grab_set()
+
+        self.create_widgets()
+        self.refresh_lists()
+
+    def create_widgets(self) -> None:
+        """Cria a lista de grupos, a lista ordenada de preferências e os botões."""
+        content_frame = ctk.CTkFrame(self, fg_color="transparent")
+        content_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        left_frame = ctk.CTkFrame(content_frame)
+        left_frame.pack(side="left", fill="both", expand=True, padx=(0, 10))
+        ctk.CTkLabel(left_frame, text="Grupos").pack(pady=5)
+        self.list_groups = tk.Listbox(left_frame, bg="#2b2b2b", fg="white", borderwidth=0, highlightthickness=0)
+        self.list_groups.pack(fill="both", expand=True, padx=10, pady=10)
+
+        btn_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        btn_frame.pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Adicionar ->", command=self.add_group).pack(pady=5)
+        ctk.CTkButton(btn_frame, text="<- Remover", command=self.remove_group, fg_color="#c42b1c", hover_color="#961e14").pack(pady=5)
+        ctk.CTkButton(btn_frame, text="Subir", command=lambda: self.move(-1), fg_color="transparent", border_width=1).pack(pady=(20, 5))
+        ctk.CTkButton(btn_frame, text="Descer", command=lambda: self.move(1), fg_color="transparent", border_width=1).pack(pady=5)
+
+        right_frame = ctk.CTkFrame(content_frame)
+        right_frame.pack(side="right", fill="both", expand=True, padx=(10, 0))
+        ctk.CTkLabel(right_frame, text="Preferências (1.ª primeiro)").pack(pady=5)
+        self.list_chosen = tk.Listbox(right_frame, bg="#2b2b2b", fg="white", borderwidth=0, highlightthickness=0)
+        self.list_chosen.pack(fill="both", expand=True, padx=10, pady=10)
+
+        ctk.CTkButton(self, text="Guardar", command=self.save).pack(pady=(0, 20))
+
+    def refresh_lists(self) -> None:
+        """Atualiza as duas listas (os grupos já escolhidos não aparecem à esquerda)."""
+        self.list_groups.delete(0, tk.END)
+        self.list_chosen.delete(0, tk.END)
+        self.available = [g for g in self.controller.get_sorted_groups("name") if g.group_id not in self.chosen]
+        for group in self.available:
+            self.list_groups.insert(tk.END, str(group))
+        for position, group_id in enumerate(self.chosen, start=1):
+            group = self.controller.get_group(group_id)
+            self.list_chosen.insert(tk.END, f"{position}. {group.name if group else group_id}")
+
+    def add_group(self) -> None:
+        """Acrescenta o grupo selecionado ao fim das preferências."""
+        selection = self.list_groups.curselection()
+        if selection:
+            self.chosen.append(self.available[selection[0]].group_id)
+            self.refresh_lists()
+
+    def remove_group(self) -> None:
+        """Retira o grupo selecionado das preferências."""
+        selection = self.list_chosen.curselection()
+        if selection:
+            del self.chosen[selection[0]]
+            self.refresh_lists()
+
+    def move(self, offset: int) -> None:
+        """Sobe ou desce o grupo selecionado na ordem de preferência."""
+        selection = self.list_chosen.curselection()
+        if not selection:
+            return
+        i, j = selection[0], selection[0] + offset
+        if 0 <= j < len(self.chosen):
+            self.chosen[i], self.chosen[j] = self.chosen[j], self.chosen[i]
+            self.refresh_lists()
+            self.list_chosen.selection_set(j)
+
+    def save(self) -> None:
+        """Grava as preferências do aluno."""
+        try:
+            self.controller.set_student_preferences(self.student_number, self.chosen)
+            self.destroy()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e), parent=self)
+
+
+class AssignmentWindow(ctk.CTkToplevel):
+    """
+    Janela da atribuição por preferências: mostra a simulação (estatísticas de satisfação)
+    e aplica exatamente essa atribuição, usando o mesmo sorteio de desempate.
+    Ambos os cálculos correm em segundo plano (ver TaskRunner).
+    """
+    def __init__(self, parent, controller: 'MainController', tasks: 'TaskRunner') -> None:
+        super().__init__(parent)
+        self.controller = controller
+        self.tasks = tasks
+        self.seed: int = random.randrange(2 ** 31)
+
+        self.title("Atribuição por Preferências")
+        self.geometry("500x450")
+        self.grab_set()
+
+        self.create_widgets()
+        self.preview()
+
+    def create_widgets(self) -> None:
+        """Cria a área de resumo e os botões."""
+        self.check_fill = ctk.CTkCheckBox(self, text="Completar grupos abaixo da capacidade mínima", command=self.preview)
+        self.check_fill.select()
+        self.check_fill.pack(side="top", anchor="w", padx=20, pady=(20, 5))
+
+        self.text_summary = ctk.CTkTextbox(self)
+        self.text_summary.pack(side="top", fill="both", expand=True, padx=20, pady=5)
+        self.text_summary.configure(state="disabled")
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(side="top", pady=(5, 20))
+        ctk.CTkButton(btn_frame, text="Novo Sorteio", command=self.redraw, fg_color="transparent", border_width=1).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Aplicar", command=self.apply).pack(side="left", padx=5)
+
+    def show(self, lines: List[str]) -> None:
+        """Substitui o texto do resumo."""
+        self.text_summary.configure(state="normal")
+        self.text_summary.delete("1.0", tk.END)
+        self.text_summary.insert("1.0", "\n".join(lines))
+        self.text_summary.configure(state="disabled")
+
+    def preview(self) -> None:
+        """Calcula a atribuição sem a aplicar e mostra as estatísticas."""
+        seed, fill_minimum = self.seed, bool(self.check_fill.get())
+        self.show(["A calcular..."])
+        self.tasks.submit("A simular a atribuição...",
+                          lambda task: self.controller.preview_preference_assignment(seed, fill_minimum),
+                          self.show_preview, parent=self)
+
+    def show_preview(self, result: 'MatchingResult') -> None:
+        """Mostra as estatísticas de uma simulação concluída."""
+        if not self.winfo_exists():
+            return
+        lines = result.describe() if result.participants else ["Nenhum aluno sem grupo indicou preferências."]
+        self.show(lines)
+
+    def redraw(self) -> None:
+        """Repete a simulação com outro sorteio de desempate."""
+        self.seed = random.randrange(2 ** 31)
+        self.preview()
+
+    def apply(self) -> None:
+        """Aplica a atribuição simulada, como uma única alteração (sem cancelamento)."""
+        seed, fill_minimum = self.seed, bool(self.check_fill.get())
+        try:
+            self.tasks.submit("A aplicar a atribuição...",
+                              lambda task: self.controller.assign_by_preferences(seed, fill_minimum),
+                              self.applied, on_error=lambda message: messagebox.showerror("Erro", message, parent=self),
+                              mutating=True, cancellable=False, parent=self)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e), parent=self)
+
+    def applied(self, result: 'MatchingResult') -> None:
+        """Conclui a aplicação da atribuição."""
+        messagebox.showinfo("Sucesso", f"{len(result.assignments)} alunos colocados.", parent=self)
+        self.destroy()
@@ -0,0 +1,86 @@
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import messagebox
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from controllers.main_controller import MainController
+
+CURRENT_LABEL = "(Estado atual)"
+
+
+class SnapshotWindow(ctk.CTkToplevel):
+    """Janela para criar instantâneos dos grupos e comparar dois deles."""
+    def __init__(self, parent, controller: 'MainController') -> None:
+        super().__init__(parent)
+        self.controller = controller
+
+        self.title("Instantâneos")
+        self.geometry("650x500")
+        self.grab_set()
+
+        self.create_widgets()
+        self.refresh_options()
+
+    def create_widgets(self) -> None:
+        """Cria o formulário de criação e a área de comparação."""
+        create_frame = ctk.CTkFrame(self)
+        create_frame.pack(side="top", fill="x", padx=20, pady=(20, 10))
+
+        ctk.CTkLabel(create_frame, text="Nome:").pack(side="left", padx=10, pady=10)
+        self.entry_label = ctk.CTkEntry(create_frame, placeholder_text="Ex: Início do projeto")
+        self.entry_label.pack(side="left", fill="x", expand=True, padx=5, pady=10)
+        ctk.CTkButton(create_frame, text="Criar Instantâneo", command=self.take_snapshot).pack(side="left", padx=10, pady=10)
+
+        compare_frame = ctk.CTkFrame(self)
+        compare_frame.pack(side="top", fill="x", padx=20, pady=5)
+
+        ctk.CTkLabel(compare_frame, text="Comparar:").pack(side="left", padx=10, pady=10)
+        self.combo_old = ctk.CTkComboBox(compare_frame, values=[CURRENT_LABEL], width=180)
+        self.combo_old.pack(side="left", padx=5, pady=10)
+        ctk.CTkLabel(compare_frame, text="com").pack(side="left", padx=5, pady=10)
+        self.combo_new = ctk.CTkComboBox(compare_frame, values=[CURRENT_LABEL], width=180)
+        self.combo_new.pack(side="left", padx=5, pady=10)
+        ctk.CTkButton(compare_frame, text="Comparar", command=self.compare, width=100).pack(side="left", padx=10, pady=10)
+
+        self.text_diff = ctk.CTkTextbox(self)
+        self.text_diff.pack(side="top", fill="both", expand=True, padx=20, pady=(5, 20))
+        self.text_diff.configure(state="disabled")
+
+    def refresh_options(self) -> None:
+        """Atualiza a lista de instantâneos disponíveis para comparação."""
+        labels = [s.label for s in self.controller.list_snapshots()]
+        options = labels + [CURRENT_LABEL]
+        self.combo_old.configure(values=options)
+        self.combo_new.configure(values=options)
+        self.combo_old.set(labels[-1] if labels else CURRENT_LABEL)
+        self.combo_new.set(CURRENT_LABEL)
+
+    def selected_label(self, combo: ctk.CTkComboBox) -> Optional[str]:
+        """Converte a opção escolhida no nome do instantâneo (None = estado atual)."""
+        value = combo.get()
+        return None if value == CURRENT_LABEL else value
+
+    def take_snapshot(self) -> None:
+        """Cria um instantâneo com o nome indicado."""
+        try:
+            self.controller.take_snapshot(self.entry_label.get())
+            self.entry_label.delete(0, tk.END)
+            self.refresh_options()
+            messagebox.showinfo("Sucesso", "Instantâneo criado.", parent=self)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e), parent=self)
+
+    def compare(self) -> None:
+        """Mostra as diferenças entre os dois instantâneos escolhidos."""
+        try:
+            diff = self.controller.diff_snapshots(self.selected_label(self.combo_old), self.selected_label(self.combo_new))
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e), parent=self)
+            return
+
+        lines = diff.describe() if not diff.is_empty() else ["Sem diferenças."]
+        self.text_diff.configure(state="normal")
+        self.text_diff.delete("1.0", tk.END)
+        self.text_diff.insert("1.0", "\n".join(lines))
+        self.text_diff.configure(state="disabled")
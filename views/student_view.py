@@ -1,27 +1,58 @@
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import ttk, messagebox
-from typing import List, Optional, TYPE_CHECKING
+from tkinter import ttk, messagebox, filedialog
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from controllers.import_controller import ImportController
+from views.export_window import ExportWindow
+from views.preferences_window import PreferencesWindow
+from views.widget_utils import set_children_state
 
 if TYPE_CHECKING:
     from controllers.main_controller import MainController
     from models.student import Student
+    from models.query import Page
+    from controllers.import_controller import ImportReport
+    from views.task_runner import TaskRunner
+
+# Número máximo de linhas rejeitadas mostradas no fim de uma importação
+MAX_IMPORT_ERRORS_SHOWN = 10
+
+# Opções do filtro de situação -> valor do filtro "without_group" de query_students
+ASSIGNMENT_FILTERS = {"Todos": None, "Sem grupo": True, "Com grupo": False}
+ALL_DOMAINS = "Todos"
+
+# Linhas pedidas ao controlador de cada vez (o resto chega com "Mostrar mais")
+PAGE_SIZE = 200
 
 class StudentView(ctk.CTkFrame):
     """
     Interface gráfica para gestão de alunos.
     Herda de ctk.CTkFrame para ser usada numa aba.
     """
-    def __init__(self, parent, controller: 'MainController') -> None:
+    def __init__(self, parent, controller: 'MainController', tasks: 'TaskRunner') -> None:
         """
         Inicializa a vista de alunos.
 
         Args:
             parent: Widget pai.
             controller (MainController): Controlador principal para operações lógicas.
+            tasks (TaskRunner): Executor das operações demoradas (importação, exportação).
         """
         super().__init__(parent)
         self.controller: 'MainController' = controller
+        self.tasks: 'TaskRunner' = tasks
+
+        # Ordenação atual da tabela (coluna clicada e sentido)
+        self.sort_column: Optional[str] = None
+        self.sort_descending: bool = False
+        # Resultados da última pesquisa aproximada (None = consulta paginada com self.filters)
+        self.filtered_students: Optional[List['Student']] = None
+        # Filtros da consulta paginada, cursor da página seguinte e linhas já pedidas
+        self.filters: Dict[str, Any] = {}
+        self.next_cursor: Optional[str] = None
+        self.page_rows: int = 0
+        # Enquanto os dados são carregados, a tabela é preenchida por blocos e a edição fica bloqueada
+        self.loading: bool = False
         
         # Configuração da grelha (grid) para responsividade
         self.grid_columnconfigure(0, weight=1)
@@ -69,8 +100,32 @@ class StudentView(ctk.CTkFrame):
         ctk.CTkLabel(search_frame, text="Pesquisar:").pack(side="left", padx=15, pady=10)
         self.entry_search = ctk.CTkEntry(search_frame, placeholder_text="Buscar por nome, número...")
         self.entry_search.pack(side="left", fill="x", expand=True, padx=5, pady=10)
+        # Alterna entre pesquisa exata (texto contido) e aproximada (tolerante a erros)
+        self.fuzzy_search_var = tk.BooleanVar(value=False)
+        ctk.CTkSwitch(search_frame, text="Aproximada", variable=self.fuzzy_search_var, width=60).pack(side="left", padx=5, pady=10)
         ctk.CTkButton(search_frame, text="Buscar", command=self.perform_search, width=100).pack(side="left", padx=5, pady=10)
-        ctk.CTkButton(search_frame, text="Limpar", command=self.clear_search, fg_color="transparent", border_width=1, width=100).pack(side="left", padx=(5, 15), pady=10)
+        ctk.CTkButton(search_frame, text="Limpar", command=self.clear_search, fg_color="transparent", border_width=1, width=100).pack(side="left", padx=5, pady=10)
+        ctk.CTkButton(search_frame, text="Filtros", command=self.toggle_filters, fg_color="transparent", border_width=1, width=100).pack(side="left", padx=(5, 15), pady=10)
+
+        # --- Filtros Avançados (escondidos até clicar em "Filtros") ---
+        self.search_frame = search_frame
+        self.filter_frame = ctk.CTkFrame(self)
+        ctk.CTkLabel(self.filter_frame, text="Situação:").pack(side="left", padx=(15, 5), pady=10)
+        self.combo_assignment = ctk.CTkComboBox(self.filter_frame, values=list(ASSIGNMENT_FILTERS), state="readonly", width=120)
+        self.combo_assignment.set("Todos")
+        self.combo_assignment.pack(side="left", padx=5, pady=10)
+        ctk.CTkLabel(self.filter_frame, text="Domínio:").pack(side="left", padx=(15, 5), pady=10)
+        self.combo_domain = ctk.CTkComboBox(self.filter_frame, values=[ALL_DOMAINS], state="readonly", width=140)
+        self.combo_domain.set(ALL_DOMAINS)
+        self.combo_domain.pack(side="left", padx=5, pady=10)
+        ctk.CTkLabel(self.filter_frame, text="Criado de:").pack(side="left", padx=(15, 5), pady=10)
+        self.entry_created_from = ctk.CTkEntry(self.filter_frame, placeholder_text="dd/mm/aaaa", width=100)
+        self.entry_created_from.pack(side="left", padx=5, pady=10)
+        ctk.CTkLabel(self.filter_frame, text="até:").pack(side="left", padx=5, pady=10)
+        self.entry_created_to = ctk.CTkEntry(self.filter_frame, placeholder_text="dd/mm/aaaa", width=100)
+        self.entry_created_to.pack(side="left", padx=5, pady=10)
+        ctk.CTkButton(self.filter_frame, text="Aplicar", command=self.perform_search, width=80).pack(side="left", padx=(15, 5), pady=10)
+        ctk.CTkButton(self.filter_frame, text="Limpar Filtros", command=self.clear_filters, fg_color="transparent", border_width=1, width=100).pack(side="left", padx=5, pady=10)
 
         # --- Lista de Alunos (Treeview) ---
         list_frame = ctk.CTkFrame(self)
@@ -96,11 +151,16 @@ class StudentView(ctk.CTkFrame):
         # Definição das colunas
         columns = ("number", "name", "email", "group", "creationDate")
         self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="browse")
-        self.tree.heading("number", text="Número")
-        self.tree.heading("name", text="Nome")
-        self.tree.heading("email", text="Email")
-        self.tree.heading("group", text="Grupo")
-        self.tree.heading("creationDate", text="Data de Criação")
+        self.column_titles = {
+            "number": "Número",
+            "name": "Nome",
+            "email": "Email",
+            "group": "Grupo",
+            "creationDate": "Data de Criação",
+        }
+        # Clicar no cabeçalho ordena pela coluna
+        for column, title in self.column_titles.items():
+            self.tree.heading(column, text=title, command=lambda c=column: self.sort_by(c))
         
         # Larguras das colunas
         self.tree.column("number", width=100)
@@ -119,11 +179,24 @@ class StudentView(ctk.CTkFrame):
         # Evento de duplo clique para editar
         self.tree.bind("<Double-1>", self.edit_student)
 
+        # --- Paginação ---
+        page_frame = ctk.CTkFrame(self, fg_color="transparent")
+        page_frame.pack(side="top", fill="x", padx=10)
+        self.label_page = ctk.CTkLabel(page_frame, text="")
+        self.label_page.pack(side="left", padx=5)
+        self.button_more = ctk.CTkButton(page_frame, text="Mostrar mais", command=self.load_more, width=120, fg_color="transparent", border_width=1)
+        self.button_more.pack(side="right", padx=5)
+
         # --- Botões de Ação Inferiores ---
         action_frame = ctk.CTkFrame(self, fg_color="transparent")
         action_frame.pack(side="top", fill="x", padx=10, pady=5)
         ctk.CTkButton(action_frame, text="Editar Aluno", command=self.edit_student).pack(side="left", padx=5)
         ctk.CTkButton(action_frame, text="Transferir", command=self.transfer_student).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Preferências", command=self.edit_preferences).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Importar", command=self.import_data).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Exportar", command=self.export_data).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Anular", command=self.undo, width=80, fg_color="transparent", border_width=1).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Refazer", command=self.redo, width=80, fg_color="transparent", border_width=1).pack(side="left", padx=5)
         ctk.CTkButton(action_frame, text="Remover Aluno Selecionado", command=self.delete_student, fg_color="#c42b1c", hover_color="#961e14").pack(side="right")
 
         # Configura o efeito visual de foco nos campos
@@ -131,6 +204,8 @@ class StudentView(ctk.CTkFrame):
         self.setup_focus_behavior(self.entry_name)
         self.setup_focus_behavior(self.entry_email)
         self.setup_focus_behavior(self.entry_search)
+        self.setup_focus_behavior(self.entry_created_from)
+        self.setup_focus_behavior(self.entry_created_to)
 
     def setup_focus_behavior(self, entry):
         """Altera a cor da borda do campo quando ganha/perde foco."""
@@ -154,8 +229,31 @@ class StudentView(ctk.CTkFrame):
         except ValueError as e:
             messagebox.showerror("Erro", str(e))
 
+    def set_loading(self, loading: bool) -> None:
+        """Bloqueia (ou desbloqueia) a edição enquanto os dados são carregados."""
+        self.loading = loading
+        set_children_state(self, not loading)
+        if loading:
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+
+    def append_rows(self, students: List['Student'], group_names: Dict[str, str]) -> None:
+        """
+        Acrescenta à tabela um bloco de alunos acabados de carregar.
+
+        Args:
+            students (List[Student]): Alunos do bloco.
+            group_names (Dict[str, str]): Nomes dos grupos já carregados (ID -> nome).
+        """
+        # Só a primeira página é mostrada; o resto fica para a consulta no fim do carregamento
+        for s in students[:max(PAGE_SIZE - len(self.tree.get_children()), 0)]:
+            group_name = group_names.get(s.group_id, "Sem Grupo") if s.group_id else "Sem Grupo"
+            self.tree.insert("", "end", values=(s.student_number, s.name, s.email, group_name, s.creation_date))
+
     def edit_student(self, event=None) -> None:
         """Abre a janela de edição se um aluno estiver selecionado."""
+        if self.loading:
+            return
         selected = self.tree.selection()
         if not selected:
             if event is None:
@@ -201,6 +299,80 @@ class StudentView(ctk.CTkFrame):
         if student:
             TransferStudentWindow(self, self.controller, student)
 
+    def edit_preferences(self) -> None:
+        """Abre a janela de preferências de grupo do aluno selecionado."""
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Aviso", "Selecione um aluno para indicar as preferências.")
+            return
+
+        item = self.tree.item(selected[0])
+        number = item['values'][0]
+
+        student = self.controller.get_student(str(number))
+        if student:
+            PreferencesWindow(self, self.controller, student)
+
+    def undo(self, event=None) -> None:
+        """Anula a última alteração (Ctrl+Z)."""
+        if self.loading:
+            return
+        # Ctrl+Z/Ctrl+Y chegam mesmo com a janela de progresso aberta; as tarefas só de leitura
+        # (exportar, verificar) percorrem os dados sem o bloqueio, pelo que também têm de terminar
+        if self.tasks.busy:
+            messagebox.showwarning("Aviso", "Aguarde que a operação em curso termine.")
+            return
+        try:
+            self.controller.undo()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def redo(self, event=None) -> None:
+        """Refaz a última alteração anulada (Ctrl+Y)."""
+        if self.loading:
+            return
+        # Ctrl+Z/Ctrl+Y chegam mesmo com a janela de progresso aberta; as tarefas só de leitura
+        # (exportar, verificar) percorrem os dados sem o bloqueio, pelo que também têm de terminar
+        if self.tasks.busy:
+            messagebox.showwarning("Aviso", "Aguarde que a operação em curso termine.")
+            return
+        try:
+            self.controller.redo()
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def import_data(self) -> None:
+        """Importa alunos de um ficheiro CSV ou JSONL, em segundo plano."""
+        if self.loading:
+            return
+        path = filedialog.askopenfilename(
+            title="Importar alunos",
+            filetypes=[("CSV", "*.csv"), ("JSONL", "*.jsonl")],
+        )
+        if not path:
+            return
+        importer = ImportController(self.controller)
+        try:
+            self.tasks.submit("A importar alunos...", lambda task: importer.import_file(path, progress=task.update),
+                              self.show_import_report, mutating=True)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+
+    def show_import_report(self, report: 'ImportReport') -> None:
+        """Mostra o resultado de uma importação."""
+        message = f"{report.imported} de {report.rows} alunos importados."
+        if not report.errors:
+            messagebox.showinfo("Sucesso", message)
+            return
+        lines = [f"Linha {line}: {error}" for line, error in report.errors[:MAX_IMPORT_ERRORS_SHOWN]]
+        if len(report.errors) > MAX_IMPORT_ERRORS_SHOWN:
+            lines.append(f"... e mais {len(report.errors) - MAX_IMPORT_ERRORS_SHOWN} linhas rejeitadas.")
+        messagebox.showwarning("Importação", message + "\n\n" + "\n".join(lines))
+
+    def export_data(self) -> None:
+        """Abre a janela de exportação de listas."""
+        ExportWindow(self, self.controller, self.tasks)
+
     def clear_form(self) -> None:
         """Limpa os campos de texto do formulário."""
         self.entry_number.delete(0, tk.END)
@@ -208,40 +380,146 @@ class StudentView(ctk.CTkFrame):
         self.entry_email.delete(0, tk.END)
 
     def perform_search(self) -> None:
-        """Filtra a lista de alunos com base no texto de pesquisa."""
+        """Filtra a lista de alunos com base no texto de pesquisa e nos filtros avançados."""
         query = self.entry_search.get().strip()
+        self.page_rows = 0
+        if query and self.fuzzy_search_var.get():
+            self.filters = {}
+            self.refresh_list(students=self.controller.search_students_fuzzy(query))
+            return
+
+        filters = self.advanced_filters()
         if query:
-            results = self.controller.search_students(query)
-            self.refresh_list(students=results)
+            filters["text"] = query
+        try:
+            # Valida os filtros (ex.: datas) antes de os guardar para as atualizações seguintes
+            self.controller.query_students(filters, limit=1)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        self.filters = filters
+        self.refresh_list()
+
+    def advanced_filters(self) -> Dict[str, Any]:
+        """Filtros escolhidos no painel de filtros avançados (vazio se estiver escondido)."""
+        if not self.filter_frame.winfo_ismapped():
+            return {}
+        filters: Dict[str, Any] = {
+            "without_group": ASSIGNMENT_FILTERS.get(self.combo_assignment.get()),
+            "created_from": self.entry_created_from.get().strip(),
+            "created_to": self.entry_created_to.get().strip(),
+        }
+        if self.combo_domain.get() != ALL_DOMAINS:
+            filters["domain"] = self.combo_domain.get()
+        return filters
+
+    def toggle_filters(self) -> None:
+        """Mostra ou esconde o painel de filtros avançados (esconder deixa de os aplicar)."""
+        if self.filter_frame.winfo_ismapped():
+            self.filter_frame.pack_forget()
+            self.perform_search()
         else:
-            self.refresh_list()
+            domains = sorted(d for d in self.controller.statistics.domain_counts if d)
+            self.combo_domain.configure(values=[ALL_DOMAINS] + domains)
+            self.filter_frame.pack(side="top", fill="x", padx=10, pady=5, after=self.search_frame)
+
+    def reset_filter_panel(self) -> None:
+        """Repõe os valores do painel de filtros avançados."""
+        self.combo_assignment.set("Todos")
+        self.combo_domain.set(ALL_DOMAINS)
+        self.entry_created_from.delete(0, tk.END)
+        self.entry_created_to.delete(0, tk.END)
+
+    def clear_filters(self) -> None:
+        """Repõe os filtros avançados e mostra de novo os resultados só da pesquisa."""
+        self.reset_filter_panel()
+        self.perform_search()
 
     def clear_search(self) -> None:
-        """Limpa o campo de pesquisa e mostra todos os alunos."""
+        """Limpa a pesquisa e os filtros avançados e mostra todos os alunos."""
         self.entry_search.delete(0, tk.END)
+        self.reset_filter_panel()
+        self.filters = {}
+        self.page_rows = 0
         self.refresh_list()
 
+    def sort_by(self, column: str) -> None:
+        """Ordena a tabela pela coluna clicada (clicar novamente inverte a ordem)."""
+        if self.loading:
+            return
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+
+        # Indica a coluna e o sentido da ordenação no cabeçalho
+        for col, title in self.column_titles.items():
+            arrow = (" ▼" if self.sort_descending else " ▲") if col == self.sort_column else ""
+            self.tree.heading(col, text=title + arrow)
+
+        self.page_rows = 0
+        self.refresh_list(students=self.filtered_students)
+
     def refresh_list(self, students: Optional[List['Student']] = None) -> None:
         """
         Atualiza os dados visíveis na tabela (Treeview).
-        Se 'students' for None, busca todos do controlador.
+        Se 'students' for None, pede ao controlador apenas a primeira página da consulta
+        (filtros da pesquisa e ordenação escolhida); caso contrário mostra essa lista
+        (ex.: pesquisa aproximada), ordenada com as ordens em cache do controlador.
         """
         # Limpa tabela atual
         for item in self.tree.get_children():
             self.tree.delete(item)
-        
-        if students is None:
-            students = self.controller.get_all_students()
-        
-        # Preenche com novos dados
-        for s in students:
-            group_name = "Sem Grupo"
-            if s.group_id:
-                group = self.controller.get_group(s.group_id)
-                if group:
-                    group_name = group.name
-            
-            self.tree.insert("", "end", values=(s.student_number, s.name, s.email, group_name, s.creation_date))
+
+        self.filtered_students = students
+        if students is not None:
+            if self.sort_column:
+                students = self.controller.get_sorted_students(self.sort_column, self.sort_descending, students)
+            for s in students:
+                self.insert_row(s)
+            self.next_cursor = None
+            self.page_rows = 0
+            self.update_page_info(len(students))
+            return
+
+        # Mantém visíveis as linhas já pedidas com "Mostrar mais" (ex.: depois de uma edição)
+        self.page_rows = max(PAGE_SIZE, self.page_rows)
+        self.show_page(self.query_page(self.page_rows))
+
+    def query_page(self, limit: int, cursor: Optional[str] = None) -> 'Page':
+        """Pede ao controlador uma página de alunos com os filtros e a ordenação atuais."""
+        return self.controller.query_students(self.filters, self.sort_column or "number", self.sort_descending,
+                                              limit=limit, cursor=cursor)
+
+    def load_more(self) -> None:
+        """Acrescenta à tabela a página seguinte de alunos."""
+        if self.next_cursor is None or self.loading:
+            return
+        self.page_rows += PAGE_SIZE
+        self.show_page(self.query_page(PAGE_SIZE, self.next_cursor))
+
+    def show_page(self, page: 'Page') -> None:
+        """Acrescenta as linhas de uma página e atualiza o cursor e a contagem."""
+        for s in page:
+            self.insert_row(s)
+        self.next_cursor = page.next_cursor
+        self.update_page_info(page.total)
+
+    def update_page_info(self, total: int) -> None:
+        """Mostra quantos alunos estão na tabela e ativa "Mostrar mais" se houver mais."""
+        self.label_page.configure(text=f"A mostrar {len(self.tree.get_children())} de {total} alunos")
+        self.button_more.configure(state="normal" if self.next_cursor else "disabled")
+
+    def insert_row(self, s: 'Student') -> None:
+        """Insere um aluno no fim da tabela."""
+        group_name = "Sem Grupo"
+        if s.group_id:
+            group = self.controller.get_group(s.group_id)
+            if group:
+                group_name = group.name
+
+        self.tree.insert("", "end", values=(s.student_number, s.name, s.email, group_name, s.creation_date))
 
 class EditStudentWindow(ctk.CTkToplevel):
     """Janela modal (pop-up) para editar dados de um aluno."""
@@ -0,0 +1,232 @@
+import threading
+import customtkinter as ctk
+from tkinter import messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+# Intervalo (ms) entre leituras do progresso das tarefas em curso
+TASK_POLL_MS = 100
+# Threads de trabalho (as tarefas que alteram dados correm uma de cada vez, ver TaskRunner.submit)
+TASK_WORKERS = 2
+
+
+class TaskCancelled(Exception):
+    """Lançada dentro de uma tarefa (por Task.update/check_cancelled) quando o utilizador a cancela."""
+
+
+class Task:
+    """
+    Uma operação em segundo plano. O estado é partilhado entre a thread de trabalho
+    (que chama update) e a interface (que lê progress e chama cancel).
+
+    Atributos:
+        title (str): Descrição mostrada na janela de progresso.
+        mutating (bool): Se a operação altera os dados.
+        cancellable (bool): Se a operação pode ser cancelada pelo utilizador.
+        progress (Tuple[int, int, str]): Último progresso comunicado: (feito, total, texto);
+            total 0 significa progresso desconhecido.
+    """
+    def __init__(self, title: str, mutating: bool = False, cancellable: bool = True) -> None:
+        self.title: str = title
+        self.mutating: bool = mutating
+        self.cancellable: bool = cancellable
+        self.progress: Tuple[int, int, str] = (0, 0, "")
+        self.future: Optional[Future] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """True se o utilizador pediu o cancelamento."""
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Pede o cancelamento (a tarefa pára no próximo update ou check_cancelled)."""
+        if self.cancellable:
+            self._cancel_event.set()
+
+    def check_cancelled(self) -> None:
+        """
+        Ponto de cancelamento da tarefa.
+
+        Lança:
+            TaskCancelled: Se o utilizador pediu o cancelamento.
+        """
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def update(self, done: int, total: int = 0, text: Optional[str] = None) -> None:
+        """
+        Comunica o progresso (chamado pela thread de trabalho; pode servir diretamente de
+        callback de progresso dos controladores) e serve de ponto de cancelamento.
+
+        Args:
+            done (int): Unidades concluídas.
+            total (int, optional): Total de unidades (0 = desconhecido).
+            text (Optional[str], optional): Fase atual. Predefinição: mantém o texto anterior.
+
+        Lança:
+            TaskCancelled: Se o utilizador pediu o cancelamento.
+        """
+        # Um único tuplo atribuído de uma vez: a interface lê sempre um estado coerente
+        self.progress = (done, total, self.progress[2] if text is None else text)
+        self.check_cancelled()
+
+
+class ProgressDialog(ctk.CTkToplevel):
+    """Janela modal com o progresso de uma tarefa e o botão para a cancelar."""
+    def __init__(self, parent, task: Task) -> None:
+        super().__init__(parent)
+        self.task: Task = task
+
+        self.title(task.title)
+        self.geometry("400x160")
+        self.resizable(False, False)
+        # Fechar a janela equivale a cancelar (a janela só desaparece quando a tarefa termina)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.label_status = ctk.CTkLabel(self, text=task.title)
+        self.label_status.pack(padx=20, pady=(20, 10))
+        self.progress_bar = ctk.CTkProgressBar(self, width=340, mode="indeterminate")
+        self.progress_bar.pack(padx=20, pady=5)
+        self.progress_bar.start()
+        self.determinate: bool = False
+        self.button_cancel = ctk.CTkButton(self, text="Cancelar", command=self.cancel,
+                                           state="normal" if task.cancellable else "disabled")
+        self.button_cancel.pack(pady=15)
+
+        # Modal: enquanto a tarefa decorre, o resto da aplicação não aceita alterações
+        self.previous_grab = self.grab_current()
+        self.transient(parent)
+        self.grab_set()
+
+    def refresh(self) -> None:
+        """Mostra o último progresso comunicado pela tarefa."""
+        done, total, text = self.task.progress
+        if self.task.cancelled:
+            text = "A cancelar..."
+        elif total:
+            text = f"{text} {done}/{total}".strip()
+        self.label_status.configure(text=text or self.task.title)
+        # A barra passa a determinada quando o total é conhecido (e volta atrás numa fase sem total)
+        if bool(total) != self.determinate:
+            self.determinate = bool(total)
+            if self.determinate:
+                self.progress_bar.stop()
+                self.progress_bar.configure(mode="determinate")
+            else:
+                self.progress_bar.configure(mode="indeterminate")
+                self.progress_bar.start()
+        if self.determinate:
+            self.progress_bar.set(min(done / total, 1))
+
+    def cancel(self) -> None:
+        """Pede o cancelamento da tarefa."""
+        if self.task.cancellable:
+            self.task.cancel()
+            self.button_cancel.configure(state="disabled")
+            self.refresh()
+
+    def close(self) -> None:
+        """Fecha a janela e devolve o controlo modal à janela que o tinha (ex.: a janela de exportação)."""
+        self.grab_release()
+        self.destroy()
+        if self.previous_grab is not None and self.previous_grab.winfo_exists():
+            self.previous_grab.grab_set()
+
+
+class TaskRunner:
+    """
+    Executa operações demoradas (importações, exportações, atribuições) num conjunto de threads,
+    para a janela não bloquear. O progresso é lido periodicamente com after() e mostrado numa
+    janela modal com botão de cancelar; o resultado é entregue na thread da interface.
+
+    Só pode decorrer uma tarefa que altere dados de cada vez: as alterações do controlador
+    não podem correr em simultâneo entre si.
+
+    Atributos:
+        root: Janela principal (usada para after()).
+        on_mutation_done (Optional[Callable[[], None]]): Chamado na thread da interface no fim de cada
+            tarefa que altera dados (ex.: para atualizar as vistas, que não são notificadas fora dela).
+    """
+    def __init__(self, root, on_mutation_done: Optional[Callable[[], None]] = None) -> None:
+        self.root = root
+        self.on_mutation_done: Optional[Callable[[], None]] = on_mutation_done
+        self._executor = ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix="task")
+        # Tarefas em curso: (tarefa, janela de progresso, ao concluir, em caso de erro)
+        self._running: List[Tuple[Task, ProgressDialog, Callable[[Any], None], Optional[Callable[[str], None]]]] = []
+
+    @property
+    def busy(self) -> bool:
+        """True se houver alguma tarefa em curso."""
+        return bool(self._running)
+
+    @property
+    def mutating(self) -> bool:
+        """True se estiver em curso uma tarefa que altera dados."""
+        return any(task.mutating for task, _, _, _ in self._running)
+
+    def submit(self, title: str, work: Callable[[Task], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[str], None]] = None, mutating: bool = False,
+               cancellable: bool = True, parent=None) -> Task:
+        """
+        Inicia uma tarefa em segundo plano.
+
+        Args:
+            title (str): Descrição da tarefa.
+            work (Callable[[Task], Any]): Trabalho a executar; recebe a tarefa para comunicar o
+                progresso (Task.update) e verificar o cancelamento. Não deve tocar na interface.
+            on_done (Callable[[Any], None]): Chamado na thread da interface com o resultado de work.
+            on_error (Optional[Callable[[str], None]], optional): Chamado com a mensagem se work lançar
+                ValueError. Predefinição: caixa de erro.
+            mutating (bool, optional): A tarefa altera dados. Predefinição: False.
+            cancellable (bool, optional): O utilizador pode cancelar. Predefinição: True.
+            parent (optional): Janela sobre a qual mostrar o progresso. Predefinição: janela principal.
+
+        Retorna:
+            Task: A tarefa iniciada.
+
+        Lança:
+            ValueError: Se for uma tarefa que altera dados e já estiver outra em curso.
+        """
+        if mutating and self.mutating:
+            raise ValueError("Já está em curso uma operação que altera os dados. Aguarde que termine.")
+        task = Task(title, mutating, cancellable)
+        dialog = ProgressDialog(parent or self.root, task)
+        task.future = self._executor.submit(work, task)
+        if not self._running:
+            self.root.after(TASK_POLL_MS, self._poll)
+        self._running.append((task, dialog, on_done, on_error))
+        return task
+
+    def _poll(self) -> None:
+        """Atualiza as janelas de progresso e entrega os resultados das tarefas concluídas."""
+        for entry in list(self._running):
+            task, dialog, on_done, on_error = entry
+            if not task.future.done():
+                dialog.refresh()
+                continue
+            self._running.remove(entry)
+            dialog.close()
+            self._finish(task, on_done, on_error)
+        if self._running:
+            self.root.after(TASK_POLL_MS, self._poll)
+
+    def _finish(self, task: Task, on_done: Callable[[Any], None], on_error: Optional[Callable[[str], None]]) -> None:
+        """Entrega o resultado (ou o erro) de uma tarefa concluída, na thread da interface."""
+        if task.mutating and self.on_mutation_done is not None:
+            self.on_mutation_done()
+        error = task.future.exception()
+        if error is None:
+            on_done(task.future.result())
+        elif isinstance(error, TaskCancelled):
+            pass
+        elif isinstance(error, ValueError):
+            (on_error or (lambda message: messagebox.showerror("Erro", message)))(str(error))
+        else:
+            messagebox.showerror("Erro", f"Erro inesperado em '{task.title}': {error}")
+
+    def shutdown(self) -> None:
+        """Cancela as tarefas em curso e espera que terminem (ex.: ao fechar a aplicação)."""
+        for task, _, _, _ in self._running:
+            task.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,20 @@
+import customtkinter as ctk
+
+# Widgets de introdução de dados ou de ação (as etiquetas e molduras não são afetadas)
+_INTERACTIVE_WIDGETS = (ctk.CTkButton, ctk.CTkEntry, ctk.CTkComboBox, ctk.CTkSwitch)
+
+
+def set_children_state(widget, enabled: bool) -> None:
+    """
+    Ativa ou desativa todos os botões e campos dentro de um widget (recursivamente).
+
+    Args:
+        widget: Widget pai (ex.: uma vista).
+        enabled (bool): True para ativar, False para desativar.
+    """
+    state = "normal" if enabled else "disabled"
+    for child in widget.winfo_children():
+        if isinstance(child, _INTERACTIVE_WIDGETS):
+            child.configure(state=state)
+        else:
+            set_children_state(child, enabled)